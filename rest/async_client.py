@@ -0,0 +1,158 @@
+import json
+import os
+import aiohttp
+import helpers
+from typing import Any, AsyncIterator
+
+
+def check_response(response: aiohttp.ClientResponse, body: str) -> None:
+    """
+    Raise a helpful exception if the HTTP response was not 200.
+    """
+    if response.status != 200:
+        raise Exception(f"{response.url} returned HTTP {response.status} {body}")
+
+
+def encode_params(params: dict) -> list:
+    """
+    Flatten query parameters for aiohttp, list values are repeated and
+    booleans are sent as true/false like the data node expects.
+    """
+    encoded = []
+    for name, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for v in values:
+            if isinstance(v, bool):
+                v = "true" if v else "false"
+            encoded.append((name, str(v)))
+    return encoded
+
+
+class AsyncDataNodeClient:
+    """
+    asyncio client for the data node v2 REST API, with the same semantics as
+    helpers.py: non-200 responses raise, list endpoints return the nested
+    `edges` and paginate() walks cursors lazily.
+
+    Requests share one aiohttp connection pool, sized by
+    DATA_NODE_ASYNC_POOL_SIZE (default 100) unless given. Any number of
+    requests may be awaited at once, those over the pool size wait for a
+    free connection.
+
+        async with AsyncDataNodeClient() as client:
+            positions = await asyncio.gather(
+                *(client.positions({"partyId": p}) for p in party_ids)
+            )
+    """
+
+    def __init__(self, data_node_url_rest: str = "", pool_size: int = 0):
+        if data_node_url_rest == "":
+            data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+        if pool_size <= 0:
+            pool_size = int(os.getenv("DATA_NODE_ASYNC_POOL_SIZE", "100"))
+        self.data_node_url_rest = data_node_url_rest
+        self.pool_size = pool_size
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncDataNodeClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Return the client session, created on first use inside the event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, path: str, params: dict = None) -> Any:
+        """
+        GET a data node path (e.g. "/vega/time") and return the decoded JSON.
+        """
+        url = self.data_node_url_rest + path
+        async with self.session().get(url, params=encode_params(params)) as response:
+            body = await response.text()
+            check_response(response, body)
+            return json.loads(body)
+
+    async def get_nested(self, path: str, key: str, params: dict = None) -> list:
+        """
+        GET a list endpoint and return the edges nested under key.
+        """
+        return (await self.get(path, params))[key]["edges"] or []
+
+    async def paginate(
+        self,
+        path: str,
+        key: str,
+        filters: dict = None,
+        page_size: int = 1000,
+        backward: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Lazily yield every `node` from a paginated list endpoint, see
+        helpers.paginate() for the meaning of the arguments.
+        """
+        params = dict(filters or {})
+        if backward:
+            params["pagination.last"] = page_size
+        else:
+            params["pagination.first"] = page_size
+
+        more = True
+        while more:
+            connection = (await self.get(path, params))[key]
+            page_info = connection["pageInfo"]
+            if backward:
+                more = page_info["hasPreviousPage"]
+                params["pagination.before"] = page_info["startCursor"]
+            else:
+                more = page_info["hasNextPage"]
+                params["pagination.after"] = page_info["endCursor"]
+            for edge in connection["edges"] or []:
+                yield edge["node"]
+
+    async def vega_time(self) -> int:
+        return int((await self.get("/vega/time"))["timestamp"])
+
+    async def markets(self, filters: dict = None) -> list:
+        return await self.get_nested("/markets", "markets", filters)
+
+    async def assets(self, filters: dict = None) -> list:
+        return await self.get_nested("/assets", "assets", filters)
+
+    async def parties(self, filters: dict = None) -> list:
+        return await self.get_nested("/parties", "parties", filters)
+
+    async def orders(self, filters: dict = None) -> list:
+        return await self.get_nested("/orders", "orders", filters)
+
+    async def order(self, order_id: str) -> dict:
+        return (await self.get(f"/order/{order_id}"))["order"]
+
+    async def trades(self, filters: dict = None) -> list:
+        return await self.get_nested("/trades", "trades", filters)
+
+    async def accounts(self, filters: dict = None) -> list:
+        return await self.get_nested("/accounts", "accounts", filters)
+
+    async def positions(self, filters: dict = None) -> list:
+        return await self.get_nested("/positions", "positions", filters)
+
+    async def margin_levels(self, filters: dict = None) -> list:
+        return await self.get_nested("/margin/levels", "marginLevels", filters)
+
+    async def markets_data(self) -> list:
+        return (await self.get("/markets/data"))["marketsData"]
+
+    async def market_data(self, market_id: str) -> dict:
+        return (await self.get(f"/market/data/{market_id}/latest"))["marketData"]
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+
+###############################################################################
+#             B A T C H   M A R K E T   I N S T R U C T I O N S               #
+###############################################################################
+
+#  How to refresh quotes with one batchMarketInstructions transaction:
+#  ----------------------------------------------------------------------
+#  BatchBuilder (see batch_builder.py) collects order cancellations,
+#  amendments and submissions, across any markets, and sends them together
+#  when the batch is full or shortly after the first one was added. Here all
+#  orders of the party on the market are cancelled and replaced with a few
+#  bids and asks, which Vega applies in that order within the batch.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import json
+import helpers
+from batch_builder import BatchBuilder
+
+# Vega wallet interaction helper, see login.py for detail
+from login import wallet, pubkey
+
+# Load Vega node API v2 URL, this is set using 'source vega-config'
+# located in the root folder of the sample-api-scripts repository
+data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
+# Load Vega market id
+market_id = helpers.env_market_id()
+assert market_id != ""
+
+# __get_expiry_time:
+# Request the current blockchain time, calculate an expiry time
+response = session.get(f"{data_node_url_rest}/vega/time")
+helpers.check_response(response)
+blockchain_time = int(response.json()["timestamp"])
+expiresAt = str(int(blockchain_time + 120 * 1e9))  # expire in 2 minutes
+# :get_expiry_time__
+
+
+def quote(side, price, size):
+    return {
+        "marketId": market_id,
+        "price": str(price),  # Hint: price is an integer. For example 123456
+        "size": str(size),  # is a price of 1.23456, assuming 5 decimal places.
+        "side": side,
+        "timeInForce": "TIME_IN_FORCE_GTT",
+        "expiresAt": expiresAt,
+        "type": "TYPE_LIMIT",
+        "reference": f"{pubkey}-{helpers.generate_id(30)}",
+    }
+
+
+# __batch_market_instructions:
+# Replace all orders on the market with 5 bids and 5 asks in one transaction
+with BatchBuilder(wallet, pubkey, max_delay=0.5) as batch:
+    batch.cancel({"marketId": market_id})
+    for level in range(5):
+        batch.submit(quote("SIDE_BUY", 100 - level, 10))
+        batch.submit(quote("SIDE_SELL", 110 + level, 10))
+# :batch_market_instructions__
+
+print(f"Sent {batch.instructions} instruction(s) in {batch.batches} batch transaction(s)")
+print(json.dumps(wallet.latency_stats(), indent=2))
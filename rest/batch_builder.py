@@ -0,0 +1,186 @@
+import json
+import threading
+import time
+import helpers
+from typing import Callable
+
+# Network parameter limiting the number of instructions in one batch
+MAX_BATCH_SIZE_PARAMETER = "spam.protection.max.batchSize"
+
+# batchMarketInstructions field for each kind of instruction
+_FIELDS = {
+    "cancellation": "cancellations",
+    "amendment": "amendments",
+    "submission": "submissions",
+}
+
+
+class BatchBuilder:
+    """
+    Collect order submissions, amendments and cancellations, for any number
+    of markets, and send them as batchMarketInstructions transactions.
+
+    Instructions are flushed when max_size of them are pending, or max_delay
+    seconds after the first one was added, whichever comes first, so a
+    refresh of many quotes goes out as one transaction. A flush that does
+    not fit in one batch, by count or by max_bytes of encoded instructions,
+    is split into as few batches as possible. Vega applies the cancellations
+    of a batch first, then the amendments, then the submissions.
+
+    max_size defaults to the spam.protection.max.batchSize network
+    parameter. Flushes on the timer call on_flush(instructions, responses,
+    error) if given. Other flushes raise wallet errors to the caller of
+    flush(), or of the submit(), amend() or cancel() that filled the batch.
+
+        with BatchBuilder(wallet, pubkey) as batch:
+            batch.cancel({"marketId": market_id})
+            for order in quotes:
+                batch.submit(order)
+    """
+
+    def __init__(
+        self,
+        wallet: helpers.WalletClient,
+        pubkey: str,
+        max_size: int = 0,
+        max_delay: float = 0.1,
+        max_bytes: int = 0,
+        on_flush: Callable = None,
+    ):
+        if max_size <= 0:
+            max_size = int(helpers.get_network_parameter(MAX_BATCH_SIZE_PARAMETER))
+        self.wallet = wallet
+        self.pubkey = pubkey
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes
+        self.on_flush = on_flush
+        self.batches = 0
+        self.instructions = 0
+        self._pending = []
+        self._deadline = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._timer = threading.Thread(target=self._run_timer, daemon=True)
+        self._timer.start()
+
+    def submit(self, submission: dict) -> None:
+        """
+        Add an orderSubmission, e.g. {"marketId": ..., "price": ..., ...}.
+        """
+        self._add("submission", submission)
+
+    def amend(self, amendment: dict) -> None:
+        """
+        Add an orderAmendment, e.g. {"orderId": ..., "marketId": ..., ...}.
+        """
+        self._add("amendment", amendment)
+
+    def cancel(self, cancellation: dict) -> None:
+        """
+        Add an orderCancellation, with a marketId and orderId to cancel one
+        order or only a marketId to cancel all orders on the market.
+        """
+        self._add("cancellation", cancellation)
+
+    def _add(self, kind: str, instruction: dict) -> None:
+        with self._lock:
+            if self._closed:
+                raise Exception("BatchBuilder is closed")
+            self._pending.append((kind, instruction))
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.max_delay
+                self._wakeup.notify()
+            full = len(self._pending) >= self.max_size
+        if full:
+            self.flush()
+
+    def flush(self) -> list:
+        """
+        Send every pending instruction now, returning the wallet responses.
+        """
+        # Taken and sent under one lock, so batches go out in the order their
+        # instructions were added when the timer and a caller flush at once
+        with self._send_lock:
+            return self._send(self._take())
+
+    def _take(self) -> list:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._deadline = None
+            return pending
+
+    def _send(self, pending: list) -> list:
+        # Called with _send_lock held
+        responses = []
+        for batch in self._split(pending):
+            transaction = {
+                "batchMarketInstructions": batch,
+                "pubKey": self.pubkey,
+                "propagate": True,
+            }
+            responses.append(self.wallet.send_transaction(self.pubkey, transaction))
+            self.batches += 1
+            self.instructions += sum(len(v) for v in batch.values())
+        return responses
+
+    def close(self) -> None:
+        """
+        Flush what is pending and stop the timer.
+        """
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._timer.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _split(self, pending: list) -> list:
+        batches = []
+        batch, count, size = None, 0, 0
+        for kind, instruction in pending:
+            encoded = len(json.dumps(instruction)) if self.max_bytes > 0 else 0
+            if batch is None or count == self.max_size or (
+                self.max_bytes > 0 and count > 0 and size + encoded > self.max_bytes
+            ):
+                batch = {field: [] for field in _FIELDS.values()}
+                batches.append(batch)
+                count, size = 0, 0
+            batch[_FIELDS[kind]].append(instruction)
+            count += 1
+            size += encoded
+        # Leave out the instruction lists that are not used
+        return [{field: v for field, v in b.items() if v} for b in batches]
+
+    def _run_timer(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and (
+                    self._deadline is None or time.monotonic() < self._deadline
+                ):
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._wakeup.wait(timeout)
+                if self._closed:
+                    return
+            responses, error = [], None
+            with self._send_lock:
+                pending = self._take()
+                if len(pending) == 0:
+                    # Already flushed when the batch filled up
+                    continue
+                try:
+                    responses = self._send(pending)
+                except Exception as e:
+                    error = e
+            # Outside the lock, on_flush may add instructions and flush
+            if self.on_flush is not None:
+                self.on_flush(pending, responses, error)
+            elif error is not None:
+                print(f"Batch of {len(pending)} instruction(s) failed: {error}")
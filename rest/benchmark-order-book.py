@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                   B E N C H M A R K   O R D E R   B O O K                   #
+###############################################################################
+
+#  Measure how many market depth updates per second the local OrderBook from
+#  order_book.py can apply, and how fast it answers queries:
+#  ----------------------------------------------------------------------
+#  The book is loaded with a generated snapshot and then fed generated
+#  updates in the stream/markets/depth/updates format, each changing or
+#  removing a few levels around the spread. No data node is needed.
+#  ----------------------------------------------------------------------
+#  Optional environment variables:
+#   BENCHMARK_LEVELS:    Levels per side in the snapshot, default 1000
+#   BENCHMARK_UPDATES:   Number of updates to apply, default 100000
+
+import os
+import random
+import time
+from order_book import OrderBook
+
+levels = int(os.getenv("BENCHMARK_LEVELS", "1000"))
+total = int(os.getenv("BENCHMARK_UPDATES", "100000"))
+mid = 1000000
+
+
+def level(price):
+    # One in ten changes removes the level
+    volume = 0 if random.random() < 0.1 else random.randint(1, 1000)
+    return {"price": str(price), "numberOfOrders": str(random.randint(1, 5)), "volume": str(volume)}
+
+
+snapshot = {
+    "marketId": "benchmark",
+    "buy": [{"price": str(mid - 1 - i), "numberOfOrders": "1", "volume": "10"} for i in range(levels)],
+    "sell": [{"price": str(mid + 1 + i), "numberOfOrders": "1", "volume": "10"} for i in range(levels)],
+    "sequenceNumber": "1",
+}
+updates = [
+    {
+        "marketId": "benchmark",
+        "buy": [level(mid - 1 - random.randint(0, levels)) for _ in range(random.randint(1, 4))],
+        "sell": [level(mid + 1 + random.randint(0, levels)) for _ in range(random.randint(1, 4))],
+        "sequenceNumber": str(seq + 1),
+        "previousSequenceNumber": str(seq),
+    }
+    for seq in range(1, total + 1)
+]
+
+book = OrderBook("benchmark", data_node_url_rest="http://127.0.0.1")
+book.load(snapshot)
+print(f"Snapshot of {levels} levels per side, {total} updates\n")
+
+start = time.perf_counter()
+for update in updates:
+    book.apply(update)
+elapsed = time.perf_counter() - start
+print(f"{'apply':<24} {total / elapsed:>12.0f} updates/sec")
+
+queries = [
+    ("best bid/ask", lambda: (book.best_bid(), book.best_ask())),
+    ("top 10 levels", lambda: book.top(10)),
+    ("cumulative volume", lambda: book.buy.cumulative_volume(mid - levels // 2)),
+    ("update + cumulative", lambda: (
+        book.buy.set_level(mid - random.randint(1, levels), random.randint(1, 1000), 1),
+        book.buy.cumulative_volume(mid - levels // 2),
+    )),
+]
+for label, query in queries:
+    start = time.perf_counter()
+    for _ in range(10000):
+        query()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {10000 / elapsed:>12.0f} queries/sec")
+
+print(f"\nBest bid: {book.best_bid()}, best ask: {book.best_ask()}, "
+      f"{len(book.buy)} buy and {len(book.sell)} sell levels")
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+
+###############################################################################
+#           B E N C H M A R K   O R D E R   C O N F I R M A T I O N           #
+###############################################################################
+
+#  Compare how long it takes to learn that an order was included in a block
+#  by polling /orders, as the order scripts used to, and from the orders
+#  stream with OrderWatcher from order_watcher.py:
+#  ----------------------------------------------------------------------
+#  A local stand-in data node is started on a free port. Transactions sent
+#  to it are included at the next block, BENCHMARK_BLOCK_TIME seconds apart,
+#  then served by /orders and pushed on /stream/orders. Latency is measured
+#  from sending the transaction, at a random point in a block, until the
+#  order is seen.
+#   polling:     GET /orders?reference=... every 0.5s until it is found
+#   fixed sleep: sleep 3s then GET /orders (amendments and cancellations)
+#   stream:      OrderWatcher future resolved by the stream update
+#  ----------------------------------------------------------------------
+#  Optional environment variables:
+#   BENCHMARK_ORDERS:      Number of orders per method, default 20
+#   BENCHMARK_BLOCK_TIME:  Seconds between blocks, default 1.0
+
+import asyncio
+import json
+import os
+import random
+import statistics
+import threading
+import time
+import requests
+from aiohttp import web
+import helpers
+from order_watcher import OrderWatcher
+
+total = int(os.getenv("BENCHMARK_ORDERS", "20"))
+block_time = float(os.getenv("BENCHMARK_BLOCK_TIME", "1.0"))
+party_id = "benchmark"
+
+
+class StandInDataNode:
+    def __init__(self):
+        self.orders = {}
+        self.streams = set()
+
+    async def transaction(self, request):
+        order = await request.json()
+        # Included at the next block boundary
+        delay = block_time - time.time() % block_time
+        asyncio.get_running_loop().call_later(delay, self.include, order)
+        return web.json_response({"received": True})
+
+    def include(self, order):
+        order.update({"partyId": party_id, "status": "STATUS_ACTIVE", "version": "1"})
+        self.orders[order["reference"]] = order
+        message = json.dumps({"result": {"updates": {"orders": [order]}}})
+        for ws in self.streams:
+            asyncio.ensure_future(ws.send_str(message))
+
+    async def list_orders(self, request):
+        order = self.orders.get(request.query["reference"])
+        edges = [] if order is None else [{"node": order, "cursor": "1"}]
+        return web.json_response({"orders": {"edges": edges}})
+
+    async def stream_orders(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.streams.add(ws)
+        async for _ in ws:
+            pass
+        self.streams.discard(ws)
+        return ws
+
+
+def serve(node, ready):
+    async def main():
+        app = web.Application()
+        app.router.add_post("/transaction", node.transaction)
+        app.router.add_get("/api/v2/orders", node.list_orders)
+        app.router.add_get("/api/v2/stream/orders", node.stream_orders)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        ready.append(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+node = StandInDataNode()
+ready = []
+threading.Thread(target=serve, args=(node, ready), daemon=True).start()
+while not ready:
+    time.sleep(0.01)
+base_url = f"http://127.0.0.1:{ready[0]}"
+data_node_url_rest = f"{base_url}/api/v2"
+session = helpers.get_session()
+
+
+def send(reference):
+    requests.post(f"{base_url}/transaction", json={"id": reference, "reference": reference})
+
+
+def confirm_by_polling(reference):
+    url = f"{data_node_url_rest}/orders?partyId={party_id}&reference={reference}"
+    response = session.get(url)
+    while helpers.check_nested_response(response, "orders") is not True:
+        time.sleep(0.5)
+        response = session.get(url)
+
+
+def confirm_by_sleeping(reference):
+    time.sleep(3)
+    session.get(f"{data_node_url_rest}/orders?partyId={party_id}&reference={reference}")
+
+
+watcher = OrderWatcher(party_id, data_node_url_rest=data_node_url_rest)
+watcher.start()
+
+
+def confirm_by_stream(reference, confirmed):
+    assert watcher.wait(confirmed) is not None
+
+
+def measure(label, confirm, use_watcher=False):
+    latencies = []
+    for i in range(total):
+        reference = f"{label}-{i}"
+        confirmed = watcher.expect(reference=reference) if use_watcher else None
+        # Send at a random point in the block, not just after the last one
+        time.sleep(random.uniform(0, block_time))
+        start = time.perf_counter()
+        send(reference)
+        if use_watcher:
+            confirm(reference, confirmed)
+        else:
+            confirm(reference)
+        latencies.append(time.perf_counter() - start)
+    print(f"{label:<14} mean {statistics.mean(latencies) * 1000:>7.0f} ms, "
+          f"max {max(latencies) * 1000:>7.0f} ms")
+    return statistics.mean(latencies)
+
+
+print(f"{total} orders per method, blocks every {block_time}s\n")
+stream = measure("stream", confirm_by_stream, use_watcher=True)
+polling = measure("polling", confirm_by_polling)
+sleeping = measure("fixed sleep", confirm_by_sleeping)
+watcher.stop()
+
+print(f"\nStream confirmation saves {(polling - stream) * 1000:.0f} ms per order over polling "
+      f"and {(sleeping - stream) * 1000:.0f} ms over the fixed sleep")
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+
+###############################################################################
+#              B E N C H M A R K   R E S P O N S E   P A R S I N G            #
+###############################################################################
+
+#  Compare reading a large page of orders from a plain requests.Response,
+#  which decodes the JSON body on every json() call, with a DataNodeResponse
+#  from helpers.get_session(), which decodes it once:
+#  ----------------------------------------------------------------------
+#  Each iteration follows the pattern of the order wait loops, a
+#  check_nested_response() and then one get_nested_response() per field read.
+#  No data node is needed, the page is generated locally.
+#  ----------------------------------------------------------------------
+#  Optional environment variables:
+#   BENCHMARK_EDGES:       Number of edges in the page, default 1000
+#   BENCHMARK_ITERATIONS:  Number of iterations per run, default 50
+
+import json
+import os
+import time
+import requests
+import helpers
+
+fields = ["id", "status", "version", "price", "size", "timeInForce"]
+edges = int(os.getenv("BENCHMARK_EDGES", "1000"))
+iterations = int(os.getenv("BENCHMARK_ITERATIONS", "50"))
+
+page = {
+    "orders": {
+        "edges": [
+            {
+                "cursor": helpers.random_string(60),
+                "node": {
+                    "id": helpers.generate_id(64),
+                    "marketId": helpers.generate_id(64),
+                    "partyId": helpers.generate_id(64),
+                    "side": "SIDE_BUY",
+                    "price": str(100000 + i),
+                    "size": "100",
+                    "remaining": "100",
+                    "timeInForce": "TIME_IN_FORCE_GTC",
+                    "type": "TYPE_LIMIT",
+                    "createdAt": str(1668172800000000000 + i),
+                    "status": "STATUS_ACTIVE",
+                    "reference": helpers.random_string(30),
+                    "version": "1",
+                },
+            }
+            for i in range(edges)
+        ],
+        "pageInfo": {"hasNextPage": False, "hasPreviousPage": False},
+    }
+}
+body = json.dumps(page).encode()
+
+
+def make_response(cls):
+    response = cls()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response._content = body
+    return response
+
+
+def run(label, cls):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = make_response(cls)
+        assert helpers.check_nested_response(response, "orders")
+        for field in fields:
+            helpers.get_nested_response(response, "orders")[0]["node"][field]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / iterations * 1000:>8.2f} ms/page")
+
+
+print(f"Page of {edges} orders, {len(body)} bytes, {iterations} iterations\n")
+
+run("requests.Response", requests.Response)
+run("helpers.DataNodeResponse", helpers.DataNodeResponse)
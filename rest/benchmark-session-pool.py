@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                  B E N C H M A R K   S E S S I O N   P O O L                #
+###############################################################################
+
+#  Compare requests/sec against a data node with and without the shared,
+#  keep-alive HTTP session from helpers.get_session():
+#  ----------------------------------------------------------------------
+#  A local stand-in data node is started on a free port and serves a fixed
+#  /vega/time response, so no network or Vega credentials are needed.
+#  Bare `requests.get(url)` opens a new connection for every call, the shared
+#  session reuses pooled connections.
+#  ----------------------------------------------------------------------
+#  Optional environment variables:
+#   BENCHMARK_REQUESTS:    Number of requests per run, default 2000
+#   DATA_NODE_POOL_SIZE:   Size of the shared connection pool, default 10
+#  ----------------------------------------------------------------------
+#  Note: against a remote HTTPS data node the gap is much larger than shown
+#  here, as every new connection also pays a network round trip and TLS.
+
+import json
+import os
+import threading
+import time
+import requests
+import helpers
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInDataNode(BaseHTTPRequestHandler):
+    # HTTP/1.1 is required for the server to honour keep-alive
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, avoid delayed-ACK stalls
+    disable_nagle_algorithm = True
+    body = json.dumps({"timestamp": "1668172800000000000"}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(label, get, url, total):
+    start = time.perf_counter()
+    for _ in range(total):
+        response = get(url)
+        helpers.check_response(response)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {total / elapsed:>10.0f} requests/sec")
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandInDataNode)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_address[1]}/api/v2/vega/time"
+
+total = int(os.getenv("BENCHMARK_REQUESTS", "2000"))
+print(f"Stand-in data node: {url}, {total} requests per run\n")
+
+run("requests.get (no pool)", requests.get, url, total)
+run("helpers.get_session().get", helpers.get_session().get, url, total)
+
+server.shutdown()
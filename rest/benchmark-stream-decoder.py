@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+
+###############################################################################
+#               B E N C H M A R K   S T R E A M   D E C O D E R               #
+###############################################################################
+
+#  Compare the throughput of decoding market depth update traffic with the
+#  StreamDecoder from stream_decoder.py against the line joining approach the
+#  stream scripts used before:
+#  ----------------------------------------------------------------------
+#  Frames are replayed from a recording, one websocket frame per line, e.g.
+#  captured by appending each `line` from on_message in
+#  stream-market-depth-updates.py to a file. Without a recording, traffic in
+#  the same line by line format is generated locally.
+#  The same messages are then replayed with several whole messages per frame,
+#  which the line joining approach cannot decode at all.
+#  ----------------------------------------------------------------------
+#  Optional environment variables:
+#   BENCHMARK_RECORDING:   Path to a recording of frames, one per line
+#   BENCHMARK_MESSAGES:    Number of generated messages, default 5000
+
+import json
+import os
+import random
+import time
+import helpers
+from stream_decoder import StreamDecoder
+
+
+def generate_frames(messages):
+    frames = []
+    market_id = helpers.generate_id(64)
+    for seq in range(messages):
+        update = {
+            "result": {
+                "update": [
+                    {
+                        "marketId": market_id,
+                        "buy": [
+                            {"price": str(100000 - i), "numberOfOrders": "1",
+                             "volume": str(random.randint(0, 500))}
+                            for i in range(random.randint(1, 5))
+                        ],
+                        "sell": [
+                            {"price": str(100001 + i), "numberOfOrders": "2",
+                             "volume": str(random.randint(0, 500))}
+                            for i in range(random.randint(1, 5))
+                        ],
+                        "sequenceNumber": str(seq + 1),
+                        "previousSequenceNumber": str(seq),
+                    }
+                ]
+            }
+        }
+        frames.extend(json.dumps(update, indent=2).split("\n"))
+    return frames
+
+
+def batch_frames(frames, messages_per_frame=10):
+    # Re-frame line by line traffic as several compact messages per frame
+    decoder = StreamDecoder()
+    messages = [json.dumps(m) for line in frames for m in decoder.feed(line)]
+    return [
+        "".join(messages[i:i + messages_per_frame])
+        for i in range(0, len(messages), messages_per_frame)
+    ]
+
+
+def legacy_decode(frames):
+    res = []
+    decoded = 0
+    for line in frames:
+        if line == "{":
+            del res[:]
+            res.append(line)
+        elif line == "}":
+            res.append(line)
+            json.loads("".join(res))
+            decoded += 1
+        else:
+            res.append(line)
+    return decoded
+
+
+def stream_decode(frames):
+    decoder = StreamDecoder()
+    decoded = 0
+    for line in frames:
+        decoded += len(decoder.feed(line))
+    return decoded
+
+
+def run(label, decode, frames, size):
+    start = time.perf_counter()
+    decoded = decode(frames)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {decoded / elapsed:>10.0f} messages/sec "
+          f"{size / elapsed / 1e6:>8.1f} MB/sec")
+
+
+recording = os.getenv("BENCHMARK_RECORDING", "")
+if recording != "":
+    with open(recording) as f:
+        frames = f.read().splitlines()
+else:
+    frames = generate_frames(int(os.getenv("BENCHMARK_MESSAGES", "5000")))
+size = sum(len(frame) for frame in frames)
+print(f"One line per frame: {len(frames)} frames, {size} bytes")
+run("line joining (legacy)", legacy_decode, frames, size)
+run("StreamDecoder", stream_decode, frames, size)
+
+frames = batch_frames(frames)
+size = sum(len(frame) for frame in frames)
+print(f"\nSeveral messages per frame: {len(frames)} frames, {size} bytes")
+run("line joining (legacy)", legacy_decode, frames, size)
+run("StreamDecoder", stream_decode, frames, size)
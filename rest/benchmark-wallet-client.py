@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                B E N C H M A R K   W A L L E T   C L I E N T                #
+###############################################################################
+
+#  Compare transactions/sec sent to a wallet the way the scripts used to,
+#  with a new connection per client.send_transaction, against
+#  helpers.WalletClient one at a time and with many in flight:
+#  ----------------------------------------------------------------------
+#  A local stand-in wallet is started on a free port. It accepts any token
+#  and answers client.send_transaction after BENCHMARK_WALLET_DELAY seconds,
+#  standing in for signing and proof of work, so no wallet is needed.
+#  ----------------------------------------------------------------------
+#  Optional environment variables:
+#   BENCHMARK_TRANSACTIONS:  Number of transactions per run, default 500
+#   BENCHMARK_WALLET_DELAY:  Seconds the wallet takes per transaction,
+#                            default 0.005
+#   WALLET_POOL_SIZE:        Transactions in flight at once, default 10
+
+import json
+import os
+import threading
+import time
+import requests
+import helpers
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wallet_session import WalletSession
+
+total = int(os.getenv("BENCHMARK_TRANSACTIONS", "500"))
+delay = float(os.getenv("BENCHMARK_WALLET_DELAY", "0.005"))
+
+
+class StandInWallet(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        headers = {}
+        if request["method"] == "client.connect_wallet":
+            headers["Authorization"] = "VWT benchmark"
+            result = {}
+        elif request["method"] == "client.list_keys":
+            result = {"keys": [{"name": "benchmark", "publicKey": "benchmark"}]}
+        else:
+            time.sleep(delay)
+            result = {"transactionHash": request["id"], "receivedAt": "", "sentAt": ""}
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}).encode()
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json-rpc")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandInWallet)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+wallet_url = f"http://127.0.0.1:{server.server_address[1]}/api/v2/requests"
+
+session = WalletSession(wallet_url, session_file="")
+wallet = helpers.WalletClient(session)
+pubkey = session.pubkey
+transaction = {"orderCancellation": {}, "pubKey": pubkey, "propagate": True}
+
+
+def send_per_connection():
+    # As the scripts did before helpers.WalletClient
+    payload = json.dumps({
+        "id": "1",
+        "jsonrpc": "2.0",
+        "method": "client.send_transaction",
+        "params": {"publicKey": pubkey, "sendingMode": "TYPE_SYNC", "transaction": transaction},
+    })
+    headers = {
+        "Content-Type": "application/json-rpc",
+        "Accept": "application/json-rpc",
+        "Origin": "application/json-rpc",
+        "Authorization": session.token,
+    }
+    response = requests.request("POST", wallet_url, headers=headers, data=payload)
+    response.raise_for_status()
+
+
+def run(label, send_all):
+    start = time.perf_counter()
+    send_all()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {total / elapsed:>10.0f} transactions/sec")
+
+
+print(f"{total} transactions, {delay * 1000:.1f} ms wallet time each, "
+      f"{wallet.pool_size} in flight\n")
+run("new connection each", lambda: [send_per_connection() for _ in range(total)])
+run("WalletClient, one by one", lambda: [wallet.send_transaction(pubkey, transaction) for _ in range(total)])
+wallet.latencies.clear()
+run("WalletClient, concurrent", lambda: wallet.send_transactions(pubkey, [transaction] * total))
+
+stats = wallet.latency_stats()
+print(f"\nConcurrent round trips: mean {stats['mean']:.1f} ms, p50 {stats['p50']:.1f} ms, "
+      f"p99 {stats['p99']:.1f} ms")
+wallet.close()
@@ -0,0 +1,249 @@
+import numpy as np
+import helpers
+
+NANOS = 1000000000
+
+# Interval suffixes accepted by parse_interval, in seconds
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+FIELDS = ("start", "open", "high", "low", "close", "volume", "trades")
+
+
+def parse_interval(interval) -> int:
+    """
+    Return an interval in nanoseconds from seconds or a string such as
+    "1s", "15s", "1m", "5m", "4h" or "1d".
+    """
+    if isinstance(interval, str):
+        value, unit = interval[:-1], interval[-1:]
+        if unit not in _UNITS or not value.isdigit():
+            raise Exception(f"Invalid candle interval: {interval}")
+        seconds = int(value) * _UNITS[unit]
+    else:
+        seconds = int(interval)
+    if seconds <= 0:
+        raise Exception(f"Invalid candle interval: {interval}")
+    return seconds * NANOS
+
+
+class CandleSeries:
+    """
+    OHLCV candles for one market and interval in fixed size NumPy ring
+    buffers, one int64 array per field.
+
+    Candles are only created for intervals that have trades. Once the buffer
+    is full the oldest candle is overwritten. Trades for a candle older than
+    the latest one are merged into it while it is still held, otherwise they
+    are counted in `late` and dropped.
+    """
+
+    def __init__(self, interval_ns: int, capacity: int):
+        self.interval = interval_ns
+        self.capacity = capacity
+        self.start = np.zeros(capacity, dtype=np.int64)
+        self.open = np.zeros(capacity, dtype=np.int64)
+        self.high = np.zeros(capacity, dtype=np.int64)
+        self.low = np.zeros(capacity, dtype=np.int64)
+        self.close = np.zeros(capacity, dtype=np.int64)
+        self.volume = np.zeros(capacity, dtype=np.int64)
+        self.trades = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self.late = 0
+        self._last = -1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, ts: int, price: int, size: int) -> None:
+        """
+        Add one trade, timestamp in nanoseconds past epoch.
+        """
+        self.merge(ts - ts % self.interval, price, price, price, price, size, 1)
+
+    def merge(
+        self, start: int, o: int, h: int, l: int, c: int, volume: int, trades: int
+    ) -> None:
+        """
+        Merge a partial candle, e.g. trades aggregated elsewhere, into the
+        candle starting at start.
+        """
+        i = self._last
+        if self.count == 0 or start > self.start[i]:
+            i = (i + 1) % self.capacity
+            self._last = i
+            self.count = min(self.count + 1, self.capacity)
+            self.start[i] = start
+            self.open[i] = o
+            self.high[i] = h
+            self.low[i] = l
+            self.close[i] = c
+            self.volume[i] = volume
+            self.trades[i] = trades
+            return
+        if start != self.start[i]:
+            held = np.flatnonzero(self.start[self._order()] == start)
+            if len(held) == 0:
+                self.late += trades
+                return
+            # An older candle: its close is already final, keep it
+            i = self._order()[held[0]]
+            c = self.close[i]
+        self.high[i] = max(self.high[i], h)
+        self.low[i] = min(self.low[i], l)
+        self.close[i] = c
+        self.volume[i] += volume
+        self.trades[i] += trades
+
+    def _order(self) -> np.ndarray:
+        # Buffer indices of the held candles, oldest first
+        return (np.arange(self.count) + self._last + 1 - self.count) % self.capacity
+
+    def latest(self) -> dict:
+        """
+        Return the most recent candle as a dict, or None if there are none.
+        """
+        if self.count == 0:
+            return None
+        return {field: int(getattr(self, field)[self._last]) for field in FIELDS}
+
+    def arrays(self) -> dict:
+        """
+        Return copies of the held candles as one array per field, oldest first.
+        """
+        order = self._order()
+        return {field: getattr(self, field)[order] for field in FIELDS}
+
+
+class CandleBuilder:
+    """
+    Local OHLCV candles for any number of markets and intervals, built from
+    trades instead of one candle subscription per market and interval.
+
+    Feed it stream/trades messages with on_message() (e.g. as a StreamManager
+    handler) and, to start with history, backfill() each market from /trades
+    first. Trades already counted, by timestamp and id, are skipped so the
+    stream and a backfill may overlap.
+
+        builder = CandleBuilder(["1s", "1m", "5m", 900])
+        builder.backfill(market_id, start_ts, end_ts)
+        manager.subscribe("/stream/trades", {"marketId": market_id}, builder.on_message)
+    """
+
+    def __init__(self, intervals: list, capacity: int = 1440):
+        self.intervals = {interval: parse_interval(interval) for interval in intervals}
+        self.capacity = capacity
+        self.series = {}
+        self.skipped = 0
+        # Per market: (latest trade timestamp, ids of trades at that timestamp)
+        self._seen = {}
+
+    def markets(self) -> list:
+        return list(self.series)
+
+    def _market(self, market_id: str) -> dict:
+        series = self.series.get(market_id)
+        if series is None:
+            series = {
+                interval: CandleSeries(interval_ns, self.capacity)
+                for interval, interval_ns in self.intervals.items()
+            }
+            self.series[market_id] = series
+        return series
+
+    def _is_new(self, trade: dict, ts: int) -> bool:
+        latest, ids = self._seen.get(trade["marketId"], (0, ()))
+        if ts < latest or (ts == latest and trade["id"] in ids):
+            return False
+        if ts > latest:
+            ids = set()
+            self._seen[trade["marketId"]] = (ts, ids)
+        ids.add(trade["id"])
+        return True
+
+    def add_trade(self, trade: dict) -> bool:
+        """
+        Add one trade node, returning False if it was already counted.
+        """
+        ts = int(trade["timestamp"])
+        if not self._is_new(trade, ts):
+            self.skipped += 1
+            return False
+        price = int(trade["price"])
+        size = int(trade["size"])
+        for series in self._market(trade["marketId"]).values():
+            series.add(ts, price, size)
+        return True
+
+    def add_trades(self, trades: list) -> int:
+        """
+        Add many trade nodes at once, returning how many were counted.
+
+        Trades are aggregated per market and interval with NumPy before they
+        are merged into the ring buffers, which makes this the fast path for
+        backfills and large stream updates.
+        """
+        by_market = {}
+        for trade in trades:
+            ts = int(trade["timestamp"])
+            if self._is_new(trade, ts):
+                by_market.setdefault(trade["marketId"], []).append(
+                    (ts, int(trade["price"]), int(trade["size"]))
+                )
+            else:
+                self.skipped += 1
+        added = 0
+        for market_id, rows in by_market.items():
+            rows = np.array(rows, dtype=np.int64)
+            rows = rows[np.argsort(rows[:, 0], kind="stable")]
+            ts, price, size = rows[:, 0], rows[:, 1], rows[:, 2]
+            for series in self._market(market_id).values():
+                buckets = ts - ts % series.interval
+                first = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+                last = np.concatenate((first[1:], [len(ts)])) - 1
+                candles = zip(
+                    buckets[first].tolist(),
+                    price[first].tolist(),
+                    np.maximum.reduceat(price, first).tolist(),
+                    np.minimum.reduceat(price, first).tolist(),
+                    price[last].tolist(),
+                    np.add.reduceat(size, first).tolist(),
+                    (last - first + 1).tolist(),
+                )
+                for candle in candles:
+                    series.merge(*candle)
+            added += len(rows)
+        return added
+
+    def on_message(self, topic: str, obj: dict) -> None:
+        """
+        StreamManager handler for stream/trades messages.
+        """
+        trades = obj["result"].get("trades", [])
+        if len(trades) == 1:
+            self.add_trade(trades[0])
+        elif len(trades) > 1:
+            self.add_trades(trades)
+
+    def backfill(self, market_id: str, start_ts: int, end_ts: int, **kwargs) -> int:
+        """
+        Build candles for a market from /trades in [start_ts, end_ts),
+        nanoseconds past epoch. Extra keyword arguments are passed on to
+        helpers.paginate_date_range(). Returns the number of trades added.
+        """
+        trades = helpers.paginate_date_range(
+            "/trades", "trades", start_ts, end_ts,
+            filters={"marketId": market_id}, **kwargs,
+        )
+        return self.add_trades(list(trades))
+
+    def candles(self, market_id: str, interval) -> dict:
+        """
+        Return the candles of a market and interval as arrays, oldest first.
+        """
+        return self._market(market_id)[interval].arrays()
+
+    def latest(self, market_id: str, interval) -> dict:
+        """
+        Return the current candle of a market and interval, or None.
+        """
+        return self._market(market_id)[interval].latest()
@@ -0,0 +1,196 @@
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+import helpers
+
+# Column types. Vega sends integers as strings; they are stored natively:
+# prices and sizes in market decimals as uint64, asset amounts, which may not
+# fit 64 bits, as decimal128 with no fractional digits, and timestamps in
+# nanoseconds past epoch as UTC timestamps (int64 underneath).
+STRING = pa.string()
+INT = pa.int64()
+UINT = pa.uint64()
+AMOUNT = pa.decimal128(38, 0)
+TIMESTAMP = pa.timestamp("ns", tz="UTC")
+
+# Export datasets: endpoint relative to DATA_NODE_URL_REST, connection key in
+# the response and (column, dotted path in the node, type) for each column
+DATASETS = {
+    "trades": {
+        "endpoint": "/trades",
+        "key": "trades",
+        "columns": [
+            ("id", "id", STRING),
+            ("market_id", "marketId", STRING),
+            ("price", "price", UINT),
+            ("size", "size", UINT),
+            ("buyer", "buyer", STRING),
+            ("seller", "seller", STRING),
+            ("aggressor", "aggressor", STRING),
+            ("buy_order", "buyOrder", STRING),
+            ("sell_order", "sellOrder", STRING),
+            ("type", "type", STRING),
+            ("timestamp", "timestamp", TIMESTAMP),
+        ],
+    },
+    "orders": {
+        "endpoint": "/orders",
+        "key": "orders",
+        "columns": [
+            ("id", "id", STRING),
+            ("market_id", "marketId", STRING),
+            ("party_id", "partyId", STRING),
+            ("side", "side", STRING),
+            ("price", "price", UINT),
+            ("size", "size", UINT),
+            ("remaining", "remaining", UINT),
+            ("time_in_force", "timeInForce", STRING),
+            ("type", "type", STRING),
+            ("status", "status", STRING),
+            ("reference", "reference", STRING),
+            ("version", "version", INT),
+            ("created_at", "createdAt", TIMESTAMP),
+            ("updated_at", "updatedAt", TIMESTAMP),
+            ("expires_at", "expiresAt", TIMESTAMP),
+        ],
+    },
+    "ledger_entries": {
+        "endpoint": "/ledgerentry/history",
+        "key": "ledgerEntries",
+        "columns": [
+            ("timestamp", "timestamp", TIMESTAMP),
+            ("asset_id", "assetId", STRING),
+            ("transfer_type", "transferType", STRING),
+            ("quantity", "quantity", AMOUNT),
+            ("from_account_type", "fromAccountType", STRING),
+            ("from_party_id", "fromAccountPartyId", STRING),
+            ("from_market_id", "fromAccountMarketId", STRING),
+            ("from_account_balance", "fromAccountBalance", AMOUNT),
+            ("to_account_type", "toAccountType", STRING),
+            ("to_party_id", "toAccountPartyId", STRING),
+            ("to_market_id", "toAccountMarketId", STRING),
+            ("to_account_balance", "toAccountBalance", AMOUNT),
+        ],
+    },
+    "balances": {
+        "endpoint": "/balance/changes",
+        "key": "balances",
+        "columns": [
+            ("timestamp", "timestamp", TIMESTAMP),
+            ("party_id", "partyId", STRING),
+            ("market_id", "marketId", STRING),
+            ("asset_id", "assetId", STRING),
+            ("account_type", "accountType", STRING),
+            ("balance", "balance", AMOUNT),
+        ],
+    },
+    "deposits": {
+        "endpoint": "/deposits",
+        "key": "deposits",
+        "columns": [
+            ("id", "id", STRING),
+            ("status", "status", STRING),
+            ("party_id", "partyId", STRING),
+            ("asset", "asset", STRING),
+            ("amount", "amount", AMOUNT),
+            ("tx_hash", "txHash", STRING),
+            ("created_timestamp", "createdTimestamp", TIMESTAMP),
+            ("credited_timestamp", "creditedTimestamp", TIMESTAMP),
+        ],
+    },
+}
+
+
+def schema(columns: list) -> pa.Schema:
+    return pa.schema([(name, arrow_type) for name, _, arrow_type in columns])
+
+
+def to_record_batch(nodes: list, columns: list) -> pa.RecordBatch:
+    """
+    Convert a list of nodes to a RecordBatch with the given columns. Missing
+    and empty values, and timestamps of 0 (not set), are stored as nulls.
+    """
+    arrays = []
+    for _, path, arrow_type in columns:
+        keys = path.split(".")
+        nulls = (None, "", "0", 0) if arrow_type == TIMESTAMP else (None, "")
+        values = []
+        for node in nodes:
+            for key in keys:
+                node = node.get(key) if isinstance(node, dict) else None
+            values.append(None if node in nulls else str(node))
+        array = pa.array(values, STRING)
+        if arrow_type == TIMESTAMP:
+            array = array.cast(INT).cast(TIMESTAMP)
+        elif arrow_type != STRING:
+            array = array.cast(arrow_type)
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, schema=schema(columns))
+
+
+def write_nodes(
+    nodes, columns: list, path: str, batch_rows: int = 50000, compression: str = "zstd"
+) -> int:
+    """
+    Write nodes from any iterable to a columnar file, converting and writing
+    batch_rows nodes at a time so memory use does not grow with the export.
+    Returns the number of rows written.
+
+    Files ending in .arrow or .feather are written in the Arrow IPC file
+    format, anything else as Parquet with one row group per batch. The file
+    is written under a temporary name and only moved into place once
+    complete, so an interrupted export never leaves a truncated file at path.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if path.endswith((".arrow", ".feather")):
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = pa.ipc.new_file(tmp, schema(columns), options=options)
+    else:
+        writer = pq.ParquetWriter(tmp, schema(columns), compression=compression)
+    rows = 0
+    try:
+        batch = []
+        for node in nodes:
+            batch.append(node)
+            if len(batch) >= batch_rows:
+                writer.write_batch(to_record_batch(batch, columns))
+                rows += len(batch)
+                batch = []
+        if batch or rows == 0:
+            writer.write_batch(to_record_batch(batch, columns))
+            rows += len(batch)
+        writer.close()
+    except BaseException:
+        writer.close()
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return rows
+
+
+def export(
+    dataset: str,
+    path: str,
+    filters: dict = None,
+    batch_rows: int = 50000,
+    page_size: int = 1000,
+    prefetch: int = 2,
+) -> int:
+    """
+    Export every node of a dataset in DATASETS matching filters, e.g.
+    {"marketId": market_id} for trades, to a Parquet or Arrow file.
+
+    Pages are read with helpers.paginate(), with `prefetch` pages requested
+    ahead while the current batch is converted. Returns the number of rows
+    written.
+
+        export("trades", "trades.parquet", {"marketId": market_id})
+        table = pyarrow.parquet.read_table("trades.parquet")
+    """
+    if dataset not in DATASETS:
+        raise Exception(f"Unknown export dataset: {dataset}, expected one of {list(DATASETS)}")
+    spec = DATASETS[dataset]
+    nodes = helpers.paginate(
+        spec["endpoint"], spec["key"], filters, page_size=page_size, prefetch=prefetch
+    )
+    return write_nodes(nodes, spec["columns"], path, batch_rows=batch_rows)
@@ -30,7 +30,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 import datetime
 
@@ -38,6 +37,9 @@ import datetime
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega market ID
 market_id = helpers.env_market_id()
 assert market_id != ""
@@ -85,10 +87,33 @@ url = f"{data_node_url_rest}/trades?marketId={market_id}" \
       f"&dateRange.startTimestamp={ns_ts_from}" \
       f"&dateRange.endTimestamp={ns_ts_to}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Trades filtered by market (date/time range):\n{}".format(
     json.dumps(response_json, indent=2, sort_keys=True)
 ))
 # :get_trades_by_market_trades_date_range__
+
+###############################################################################
+#             S H A R D E D   D A T E / T I M E   R A N G E                   #
+###############################################################################
+
+# Large windows can be split into time shards that are paged concurrently with
+# helpers.paginate_date_range(). Results are merged back into timestamp order
+# (oldest first) and records on a shard edge are returned exactly once.
+
+# __get_trades_by_market_trades_date_range_sharded:
+# Fetch all trades for a market in the window above using 8 concurrent shards
+total = 0
+for trade in helpers.paginate_date_range(
+    "/trades",
+    "trades",
+    int(ns_ts_from),
+    int(ns_ts_to),
+    filters={"marketId": market_id},
+    shards=8,
+):
+    total += 1
+print(f"Trades fetched for market {market_id} (sharded date/time range): {total}")
+# :get_trades_by_market_trades_date_range_sharded__
@@ -0,0 +1,170 @@
+import json
+import sqlite3
+import helpers
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS epoch_records (
+    kind TEXT NOT NULL,
+    filters TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    nodes TEXT NOT NULL,
+    PRIMARY KEY (kind, filters, epoch)
+);
+"""
+
+
+class EpochCache:
+    """
+    Rewards, delegations and epoch details keyed by epoch in a local SQLite
+    file, so repeated analytics only request epochs they have not seen.
+
+    Records of completed epochs never change, so once read they are stored
+    for good. The current epoch is still running and is requested again on
+    every call. Rewards of all missing epochs in a range are requested with
+    one fromEpoch/toEpoch query and split by epoch; delegations are
+    requested with one epochId query per missing epoch.
+
+        with EpochCache("epochs.db") as cache:
+            rewards = cache.rewards(first_epoch, party_id=pubkey)
+            rewards[epoch]  # list of reward nodes of that epoch
+
+    `requests` counts the pages requested.
+    """
+
+    def __init__(self, path: str = "epochs.db"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        self.requests = 0
+        self._current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def current_epoch(self, refresh: bool = False) -> int:
+        """
+        Return the sequence number of the current epoch, read once per cache
+        unless refresh is set.
+        """
+        if self._current is None or refresh:
+            data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+            response = helpers.get_session().get(f"{data_node_url_rest}/epoch")
+            helpers.check_response(response)
+            self.requests += 1
+            self._current = int(response.json()["epoch"]["seq"])
+        return self._current
+
+    def epoch(self, seq: int) -> dict:
+        """
+        Return the details of an epoch, stored once it has completed.
+        """
+        def fetch(missing: list) -> dict:
+            data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+            out = {}
+            for missing_seq in missing:
+                response = helpers.get_session().get(
+                    f"{data_node_url_rest}/epoch", params={"id": missing_seq}
+                )
+                helpers.check_response(response)
+                self.requests += 1
+                out[missing_seq] = [response.json()["epoch"]]
+            return out
+
+        return self._get_range("epoch", {}, seq, seq, fetch)[seq][0]
+
+    def rewards(
+        self, from_epoch: int, to_epoch: int = 0, party_id: str = "", asset_id: str = ""
+    ) -> dict:
+        """
+        Return the rewards paid in each epoch from from_epoch to to_epoch
+        (the current epoch by default), optionally for one party and/or asset.
+        """
+        filters = _filters(partyId=party_id, assetId=asset_id)
+
+        def fetch(missing: list) -> dict:
+            out = {seq: [] for seq in missing}
+            params = {**filters, "fromEpoch": min(missing), "toEpoch": max(missing)}
+            for node in self._paginate("/rewards", "rewards", params):
+                seq = int(node["epoch"])
+                if seq in out:
+                    out[seq].append(node)
+            return out
+
+        return self._get("rewards", filters, from_epoch, to_epoch, fetch)
+
+    def delegations(
+        self, from_epoch: int, to_epoch: int = 0, party_id: str = "", node_id: str = ""
+    ) -> dict:
+        """
+        Return the delegations of each epoch from from_epoch to to_epoch (the
+        current epoch by default), optionally of one party and/or to one node.
+        """
+        filters = _filters(partyId=party_id, nodeId=node_id)
+
+        def fetch(missing: list) -> dict:
+            return {
+                seq: list(self._paginate("/delegations", "delegations", {**filters, "epochId": seq}))
+                for seq in missing
+            }
+
+        return self._get("delegations", filters, from_epoch, to_epoch, fetch)
+
+    def _get(self, kind: str, filters: dict, from_epoch: int, to_epoch: int, fetch) -> dict:
+        # As _get_range, up to the current epoch unless to_epoch is set
+        if to_epoch <= 0:
+            to_epoch = self.current_epoch()
+        return self._get_range(kind, filters, from_epoch, to_epoch, fetch)
+
+    def _get_range(self, kind: str, filters: dict, from_epoch: int, to_epoch: int, fetch) -> dict:
+        # Read the stored epochs of the range, fetch the rest with
+        # fetch(missing epochs) and store those that have completed
+        current = self.current_epoch()
+        filters_key = json.dumps(filters, sort_keys=True)
+        rows = self.db.execute(
+            "SELECT epoch, nodes FROM epoch_records"
+            " WHERE kind = ? AND filters = ? AND epoch BETWEEN ? AND ?",
+            (kind, filters_key, from_epoch, to_epoch),
+        )
+        out = {epoch: json.loads(nodes) for epoch, nodes in rows}
+        missing = [seq for seq in range(from_epoch, to_epoch + 1) if seq not in out]
+        if missing:
+            fetched = fetch(missing)
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO epoch_records VALUES (?, ?, ?, ?)",
+                    [
+                        (kind, filters_key, seq, json.dumps(nodes))
+                        for seq, nodes in fetched.items() if seq < current
+                    ],
+                )
+            out.update(fetched)
+        return {seq: out[seq] for seq in range(from_epoch, to_epoch + 1)}
+
+    def _paginate(self, endpoint: str, key: str, params: dict):
+        for edges in helpers.paginate_pages(endpoint, key, params):
+            self.requests += 1
+            for edge in edges:
+                yield edge["node"]
+
+    def forget(self, kind: str = "") -> None:
+        """
+        Drop every stored record, or those of one kind ("rewards",
+        "delegations" or "epoch").
+        """
+        with self.db:
+            if kind == "":
+                self.db.execute("DELETE FROM epoch_records")
+            else:
+                self.db.execute("DELETE FROM epoch_records WHERE kind = ?", (kind,))
+
+
+def _filters(**filters) -> dict:
+    # Query parameters that were set
+    return {name: value for name, value in filters.items() if value != ""}
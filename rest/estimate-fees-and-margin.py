@@ -18,7 +18,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
@@ -28,6 +27,9 @@ from login import pubkey
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 #####################################################################################
 #                           F E E   E S T I M A T I O N                             #
 #####################################################################################
@@ -40,7 +42,7 @@ assert market_id != ""
 order_price = "100000"
 order_size = "100"
 url = f"{data_node_url_rest}/estimate/fee?marketId={market_id}&price={order_price}&size={order_size}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 estimatedFees = response.json()
 print("Estimated fee for order:\n{}".format(
@@ -60,9 +62,33 @@ order_type = "TYPE_LIMIT"
 
 url = f"{data_node_url_rest}/estimate/margin?marketId={market_id}&partyId={pubkey}" \
       f"&price={order_price}&size={order_size}&side={order_side}&type={order_type}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 estimatedMargin = response.json()
 print("Estimated margin for order:\n{}".format(
     json.dumps(estimatedMargin, indent=2, sort_keys=True)))
 # :get_margins_estimate__
+
+#####################################################################################
+#                     E S T I M A T I O N   G R I D                                 #
+#####################################################################################
+
+# __get_estimates_grid:
+# Estimate fees and margins over a grid of prices and sizes at once, see
+# estimator.py. Distinct inputs are requested concurrently and memoised,
+# local=True answers from the cached market fee and risk factors instead
+import numpy as np
+from estimator import Estimator
+
+estimator = Estimator(party_id=pubkey)
+prices, sizes = np.meshgrid([590000, 600000, 610000], [1, 10, 100])
+fees = estimator.fees(market_id, prices, sizes)
+margins = estimator.margins(market_id, prices, sizes, "SIDE_BUY")
+local_fees = estimator.fees(market_id, prices, sizes, local=True)
+print("Estimated total fees (rows are sizes, columns are prices):")
+print(fees["total"])
+print("Estimated initial margin:")
+print(margins["initialMargin"])
+print("Approximated total fees from market fee factors:")
+print(local_fees["total"])
+# :get_estimates_grid__
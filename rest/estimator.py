@@ -0,0 +1,188 @@
+import collections
+import concurrent.futures
+import os
+import threading
+import numpy as np
+import helpers
+
+FEE_FIELDS = ("makerFee", "infrastructureFee", "liquidityFee")
+MARGIN_FIELDS = ("maintenanceMargin", "searchLevel", "initialMargin", "collateralReleaseLevel")
+
+
+class Estimator:
+    """
+    Fee and margin estimates for arrays of orders, e.g. a price x size grid
+    over many markets, returned as NumPy float64 arrays.
+
+    Arguments are broadcast against each other, so one market and side can
+    be given for a whole grid:
+
+        prices, sizes = np.meshgrid([99000, 100000, 101000], [1, 10, 100])
+        fees = estimator.fees(market_id, prices, sizes)
+        fees["total"]  # same shape as prices
+
+    Each distinct input is requested from /estimate/fee or /estimate/margin
+    once, concurrently on `workers` threads over the shared session, and
+    memoised for later calls. With local=True the answers are computed
+    instead from cached market data: fees exactly from the market fee
+    factors, margins approximately from the risk factors and margin scaling
+    factors, without the slippage the data node adds for the order book.
+    """
+
+    def __init__(
+        self,
+        party_id: str = "",
+        data_node_url_rest: str = "",
+        workers: int = 0,
+        max_entries: int = 100000,
+    ):
+        if data_node_url_rest == "":
+            data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+        if workers <= 0:
+            workers = int(os.getenv("DATA_NODE_POOL_SIZE", "10"))
+        self.party_id = party_id
+        self.data_node_url_rest = data_node_url_rest
+        self.workers = workers
+        self.max_entries = max_entries
+        self.requests = 0
+        self.hits = 0
+        self._memo = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def fees(self, market_ids, prices, sizes, local: bool = False) -> dict:
+        """
+        Estimate fees, returning arrays for each fee in FEE_FIELDS and their
+        "total", in asset decimals.
+        """
+        market_ids, prices, sizes = np.broadcast_arrays(
+            np.asarray(market_ids, dtype=object), np.asarray(prices), np.asarray(sizes)
+        )
+        if local:
+            out = {field: np.empty(prices.shape) for field in FEE_FIELDS}
+            for market_id in np.unique(market_ids):
+                mask = market_ids == market_id
+                model = self._market_model(market_id)
+                notional = self._notional(model, prices[mask], sizes[mask])
+                for field in FEE_FIELDS:
+                    out[field][mask] = notional * model["fees"][field]
+        else:
+            keys = [
+                ("fee", m, str(p), str(s))
+                for m, p, s in zip(market_ids.flat, prices.flat, sizes.flat)
+            ]
+            out = self._fetch(keys, FEE_FIELDS, prices.shape)
+        out["total"] = sum(out[field] for field in FEE_FIELDS)
+        return out
+
+    def margins(
+        self, market_ids, prices, sizes, sides, order_type: str = "TYPE_LIMIT", local: bool = False
+    ) -> dict:
+        """
+        Estimate margin levels for the party, returning arrays for each level
+        in MARGIN_FIELDS, in asset decimals. Sides are "SIDE_BUY" or "SIDE_SELL".
+        """
+        market_ids, prices, sizes, sides = np.broadcast_arrays(
+            np.asarray(market_ids, dtype=object), np.asarray(prices), np.asarray(sizes),
+            np.asarray(sides, dtype=object),
+        )
+        if local:
+            out = {field: np.empty(prices.shape) for field in MARGIN_FIELDS}
+            for market_id in np.unique(market_ids):
+                model = self._market_model(market_id)
+                if "risk" not in model:
+                    raise Exception(f"Market {market_id} has no margin model to estimate margins with")
+                for side, risk in (("SIDE_BUY", "long"), ("SIDE_SELL", "short")):
+                    mask = (market_ids == market_id) & (sides == side)
+                    if not mask.any():
+                        continue
+                    maintenance = self._notional(model, prices[mask], sizes[mask]) * model["risk"][risk]
+                    for field in MARGIN_FIELDS:
+                        out[field][mask] = maintenance * model["scaling"][field]
+            return out
+        if self.party_id == "":
+            raise Exception("A party id is needed to estimate margins from the data node")
+        keys = [
+            ("margin", m, str(p), str(s), side, order_type)
+            for m, p, s, side in zip(market_ids.flat, prices.flat, sizes.flat, sides.flat)
+        ]
+        return self._fetch(keys, MARGIN_FIELDS, prices.shape)
+
+    def _fetch(self, keys: list, fields: tuple, shape: tuple) -> dict:
+        # Rows for this call are read from a local dict, the memo may evict
+        # them, by this call or another thread, before they are returned
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key not in found and key in self._memo:
+                    found[key] = self._memo[key]
+                    self._memo.move_to_end(key)
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            self.hits += len(keys) - len(missing)
+        if missing:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+                found.update(zip(missing, pool.map(self._request, missing)))
+            with self._lock:
+                for key in missing:
+                    self._memo[key] = found[key]
+                while len(self._memo) > self.max_entries:
+                    self._memo.popitem(last=False)
+        rows = [found[key] for key in keys]
+        values = np.array(rows, dtype=np.float64).reshape(len(keys), len(fields))
+        return {field: values[:, i].reshape(shape) for i, field in enumerate(fields)}
+
+    def _request(self, key: tuple) -> tuple:
+        url = self.data_node_url_rest
+        if key[0] == "fee":
+            _, market_id, price, size = key
+            params = {"marketId": market_id, "price": price, "size": size}
+            response = helpers.get_session().get(f"{url}/estimate/fee", params=params)
+            helpers.check_response(response)
+            estimate = response.json()["fee"]
+            fields = FEE_FIELDS
+        else:
+            _, market_id, price, size, side, order_type = key
+            params = {
+                "marketId": market_id, "partyId": self.party_id, "price": price,
+                "size": size, "side": side, "type": order_type,
+            }
+            response = helpers.get_session().get(f"{url}/estimate/margin", params=params)
+            helpers.check_response(response)
+            estimate = response.json()["marginLevels"]
+            fields = MARGIN_FIELDS
+        with self._lock:
+            self.requests += 1
+        return tuple(float(estimate.get(field, 0)) for field in fields)
+
+    def _market_model(self, market_id: str) -> dict:
+        # Everything the local mode needs for a market, all read through the
+        # response cache
+        url = self.data_node_url_rest
+        market = helpers.get_cached(f"{url}/market/{market_id}")["market"]
+        asset_id = helpers.settlement_asset(market)
+        asset = helpers.get_cached(f"{url}/asset/{asset_id}")["asset"]
+        model = {
+            "price_scale": 10.0 ** (int(asset["details"]["decimals"]) - int(market["decimalPlaces"])),
+            "size_scale": 10.0 ** -int(market.get("positionDecimalPlaces", 0)),
+            "fees": {field: float(market["fees"]["factors"][field]) for field in FEE_FIELDS},
+        }
+        # Spot markets have no margin calculator or risk factors
+        calculator = market["tradableInstrument"].get("marginCalculator")
+        if calculator:
+            risk = helpers.get_cached(f"{url}/market/{market_id}/risk/factors")["riskFactor"]
+            scaling = calculator["scalingFactors"]
+            model["risk"] = {"long": float(risk["long"]), "short": float(risk["short"])}
+            model["scaling"] = {
+                "maintenanceMargin": 1.0,
+                "searchLevel": float(scaling["searchLevel"]),
+                "initialMargin": float(scaling["initialMargin"]),
+                "collateralReleaseLevel": float(scaling["collateralRelease"]),
+            }
+        return model
+
+    def _notional(self, model: dict, prices: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        # Price in market decimals and size in position decimals to a
+        # notional in asset decimals
+        return (
+            prices.astype(np.float64) * model["price_scale"]
+            * sizes.astype(np.float64) * model["size_scale"]
+        )
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                         E X P O R T   H I S T O R Y                         #
+###############################################################################
+
+#  How to export history from a Data Node to columnar files:
+#  ----------------------------------------------------------------------
+#  columnar_export.py streams every page of /trades, /orders,
+#  /ledgerentry/history, /balance/changes or /deposits into a Parquet (or
+#  Arrow IPC) file in bounded row batches. Prices and sizes are stored as
+#  uint64, asset amounts as decimal128 and timestamps as UTC timestamps in
+#  nanoseconds, instead of the strings in the JSON responses.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import datetime
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import helpers
+from columnar_export import export
+
+# Load Vega market id and party id
+market_id = helpers.env_market_id()
+assert market_id != ""
+party_id = helpers.env_party_id()
+assert party_id != ""
+
+# Export the last week of history
+now = datetime.datetime.now(datetime.timezone.utc)
+date_range = {
+    "dateRange.startTimestamp": helpers.get_nano_ts(now, 7 * 24 * 3600),
+    "dateRange.endTimestamp": helpers.get_nano_ts(now, 0),
+}
+
+###############################################################################
+#                      E X P O R T   T O   P A R Q U E T                      #
+###############################################################################
+
+# __export_history_parquet:
+# Write one Parquet file per dataset
+exports = {
+    "trades": {"marketId": market_id, **date_range},
+    "orders": {"partyId": party_id, **date_range},
+    "ledger_entries": {"filter.accountFromFilter.partyIds": party_id, **date_range},
+    "balances": {"filter.partyIds": party_id, **date_range},
+    "deposits": {"partyId": party_id, **date_range},
+}
+for dataset, filters in exports.items():
+    rows = export(dataset, f"{dataset}.parquet", filters)
+    print(f"Exported {rows} row(s) to {dataset}.parquet")
+# :export_history_parquet__
+
+###############################################################################
+#                   R E A D   T H E   E X P O R T   B A C K                   #
+###############################################################################
+
+# __read_history_parquet:
+# Load the trades back, with integer prices and sizes, and summarise them
+trades = pq.read_table("trades.parquet")
+if trades.num_rows > 0:
+    print(f"Trades: {trades.num_rows}")
+    print(f"Volume: {pc.sum(trades['size'])}")
+    print(f"Price range: {pc.min(trades['price'])} - {pc.max(trades['price'])}")
+    print(f"From {pc.min(trades['timestamp'])} to {pc.max(trades['timestamp'])}")
+# :read_history_parquet__
@@ -18,7 +18,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
@@ -28,6 +27,9 @@ from login import pubkey
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                  A C C O U N T S   B Y   M A R K E T  ( 1 )                 #
 ###############################################################################
@@ -38,7 +40,7 @@ assert market_id != ""
 # __get_accounts_by_market:
 # Request a list of accounts for a single market (repeat the filter for multiple markets)
 url = f"{data_node_url_rest}/accounts?filter.marketIds={market_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Accounts filtered by market:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -54,7 +56,7 @@ print("Accounts filtered by market:\n{}".format(
 # __get_accounts_by_party:
 # Request a list of accounts for a single party/pubkey (repeat the filter for multiple parties)
 url = f"{data_node_url_rest}/accounts?filter.partyIds={pubkey}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Accounts filtered by party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -69,7 +71,7 @@ print("Accounts filtered by party:\n{}".format(
 
 # Request a list of assets and select the first one
 url = f"{data_node_url_rest}/assets"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 asset_id = response.json()["assets"]["edges"][0]["node"]["id"]
 
@@ -79,7 +81,7 @@ print(f"Asset found: {asset_id}")
 # __get_accounts_by_asset:
 # Request a list of accounts for a single asset
 url = f"{data_node_url_rest}/accounts?filter.assetId={asset_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Accounts filtered by asset:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -96,7 +98,7 @@ url = f"{data_node_url_rest}/accounts?" \
       f"filter.marketIds={market_id}" \
       f"&filter.assetId={asset_id}" \
       f"&filter.accountTypes=ACCOUNT_TYPE_GENERAL"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Accounts filtered by market and account type:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -113,7 +115,7 @@ url = f"{data_node_url_rest}/accounts?" \
       f"filter.partyIds={pubkey}" \
       f"&filter.accountTypes=ACCOUNT_TYPE_GENERAL" \
       f"&filter.accountTypes=ACCOUNT_TYPE_MARGIN"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Accounts filtered by party and account type:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -15,7 +15,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 import sys
 
@@ -23,6 +22,9 @@ import sys
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                            L I S T   A S S E T S                            #
 ###############################################################################
@@ -30,7 +32,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_assets:
 # Request a list of assets available and select the first one
 url = f"{data_node_url_rest}/assets"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Assets:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
@@ -56,7 +58,7 @@ if asset_id is None:
 # __get_asset:
 # Request a specific asset using a pre-defined asset id
 url = f"{data_node_url_rest}/asset/{asset_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Asset:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
@@ -20,7 +20,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
@@ -30,6 +29,9 @@ from login import pubkey
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #        B A L A N C E S   B Y   P A R T Y   &   A C C O U N T  T Y P E       #
 ###############################################################################
@@ -42,7 +44,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 url = f"{data_node_url_rest}/balance/changes?filter.partyIds={pubkey}" \
       f"&filter.accountTypes=ACCOUNT_TYPE_GENERAL&filter.accountTypes=ACCOUNT_TYPE_MARGIN"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Historic balance changes filtered by party and account types:\n{}".format(
@@ -66,7 +68,7 @@ assert market_id != ""
 url = f"{data_node_url_rest}/balance/changes?filter.marketIds={market_id}" \
       f"&filter.accountTypes=ACCOUNT_TYPE_MARGIN"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Historic balance changes filtered by market and account types:\n{}".format(
@@ -19,12 +19,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega data node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 market_id = helpers.env_market_id()
 assert market_id != ""
 
@@ -38,15 +41,15 @@ assert market_id != ""
 
 # __get_candle_intervals:
 # Request a list of candle intervals available for a market and select a candle id
+# The intervals of a market rarely change, so they are read through the response cache
 url = f"{data_node_url_rest}/candle/intervals?marketId={market_id}"
-response = requests.get(url)
-helpers.check_response(response)
+intervals = helpers.get_cached(url)
 print("Candle intervals for market:\n{}".format(
-    json.dumps(response.json(), indent=2, sort_keys=True)))
+    json.dumps(intervals, indent=2, sort_keys=True)))
 # :get_candle_intervals__
 
 # Find the first candle id in the list e.g. trades_candle_5_minutes_<market_id> etc
-candle_id = response.json()["intervalToCandleId"][0]["candleId"]
+candle_id = intervals["intervalToCandleId"][0]["candleId"]
 assert candle_id != ""
 print(f"Candle found: {candle_id}")
 
@@ -65,7 +68,7 @@ url = f"{data_node_url_rest}/candle?candleId={candle_id}" \
   f"&fromTimestamp={fromTime}" \
   f"&toTimestamp={toTime}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Candles for id and ns timestamp window:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
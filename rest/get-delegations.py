@@ -17,13 +17,17 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
+import os
 import helpers
+from epoch_cache import EpochCache
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                       L I S T   D E L E G A T I O N S                       #
 ###############################################################################
@@ -31,7 +35,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_delegations:
 # Request a list of all delegations for a Vega network
 url = f"{data_node_url_rest}/delegations"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Delegations for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -55,7 +59,7 @@ partyId = first_delegation["node"]["party"]
 # __get_delegations_by_party:
 # Request a list of all delegations for a party (pubkey)
 url = f"{data_node_url_rest}/delegations?partyId={partyId}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Delegations filtered by party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -69,7 +73,7 @@ print("Delegations filtered by party:\n{}".format(
 # __get_delegations_by_epoch:
 # Request a list of all delegations for a specific epoch number
 url = f"{data_node_url_rest}/delegations?epochId={epochId}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Delegations filtered by epoch:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -83,9 +87,24 @@ print("Delegations filtered by epoch:\n{}".format(
 # __get_delegations_by_epoch:
 # Request a list of all delegations for a specific Vega node
 url = f"{data_node_url_rest}/delegations?nodeId={nodeId}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Delegations filtered by Vega node:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
 ))
 # :get_delegations_by_epoch__
+
+###############################################################################
+#          D E L E G A T I O N S   B Y   E P O C H   ( C A C H E D )          #
+###############################################################################
+
+# __get_delegations_by_epoch_cached:
+# Request the delegations of a party over the last 100 epochs through EpochCache
+with EpochCache(os.getenv("EPOCH_CACHE_DB", "epochs.db")) as cache:
+    current = cache.current_epoch()
+    delegations = cache.delegations(max(1, current - 100), party_id=partyId)
+    for epoch, epoch_delegations in delegations.items():
+        total = sum(int(delegation["amount"]) for delegation in epoch_delegations)
+        print(f"Epoch {epoch}: {len(epoch_delegations)} delegation(s), total {total}")
+    print(f"Requests made: {cache.requests}")
+# :get_delegations_by_epoch_cached__
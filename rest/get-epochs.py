@@ -14,13 +14,17 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
+import os
 import helpers
+from epoch_cache import EpochCache
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                            L I S T   E P O C H S                            #
 ###############################################################################
@@ -28,7 +32,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_epochs:
 # Request all epoch data for a Vega network
 url = f"{data_node_url_rest}/epoch"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Epoch data for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -46,9 +50,25 @@ epoch_id = first_delegation["epochSeq"]
 # __get_epochs_by_id:
 # Request epoch data for a specific epoch id
 url = f"{data_node_url_rest}/epoch?id={epoch_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Epoch data for epoch id:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
 ))
 # :get_epochs_by_id__
+
+###############################################################################
+#                  E P O C H S   B Y   I D   ( C A C H E D )                  #
+###############################################################################
+
+# __get_epochs_by_id_cached:
+# Request the details of the last 10 completed epochs through EpochCache
+with EpochCache(os.getenv("EPOCH_CACHE_DB", "epochs.db")) as cache:
+    current = cache.current_epoch()
+    for seq in range(max(1, current - 10), current):
+        epoch = cache.epoch(seq)
+        timestamps = epoch.get("timestamps", {})
+        print(f"Epoch {seq}: start {timestamps.get('startTime')}, end {timestamps.get('endTime')}, "
+              f"{len(epoch.get('delegations') or [])} delegation(s)")
+    print(f"Requests made: {cache.requests}")
+# :get_epochs_by_id_cached__
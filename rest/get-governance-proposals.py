@@ -18,13 +18,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                         L I S T   P R O P O S A L S                         #
 ###############################################################################
@@ -32,7 +34,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_proposals:
 # Request proposal data for a Vega network
 url = f"{data_node_url_rest}/governances"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Governance (proposals) data for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -52,7 +54,7 @@ print(f"Governance proposal for id: {proposal_id}")
 # __get_proposal_by_id:
 # Request proposal data for a specific proposal id
 url = f"{data_node_url_rest}/governance?proposalId={proposal_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Proposal:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -15,13 +15,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                             L I S T   V O T E S                             #
 ###############################################################################
@@ -34,7 +36,7 @@ assert party_id != ""
 # Request vote data for a Vega network
 url = f"{data_node_url_rest}/votes?partyId={party_id}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Governance (votes) data for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -15,8 +15,8 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
+from ledger_export import LedgerExporter
 
 # Vega wallet interaction helper, see login.py for detail
 # from login import pubkey
@@ -25,19 +25,21 @@ import helpers
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                    L I S T   L E D G E R   E N T R I E S                    #
 ###############################################################################
 
 party_id = helpers.env_party_id()
 assert party_id != ""
-party_id = "d8742dbe34198241b96381012be71615a48da2b1c60f76f25ae5ed87fea9c500"
 
 # __get_ledger_entries_from_account:
 # List ledger entries with filtering on the sending account (accountFrom...)
 url = f"{data_node_url_rest}/ledgerentry/history?filter.accountFromFilter.partyIds={party_id}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Ledger entries (sending account):\n{}".format(
@@ -50,7 +52,7 @@ print("Ledger entries (sending account):\n{}".format(
 # List ledger entries with filtering on the receiving account (accountFrom...)
 url = f"{data_node_url_rest}/ledgerentry/history?filter.accountToFilter.partyIds={party_id}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Ledger entries (receiving account):\n{}".format(
@@ -58,7 +60,22 @@ print("Ledger entries (receiving account):\n{}".format(
 ))
 # :get_ledger_entries_to_account__
 
-# todo: can also refine further with a particular asset id, market id or account type
+
+###############################################################################
+#        L E D G E R   E N T R I E S   F O R   M A N Y   P A R T I E S        #
+###############################################################################
+
+# __get_ledger_entries_merged:
+# Page every entry sent or received by a list of parties, both directions
+# and chunks of parties concurrently, merged into one time ordered stream
+# with transfers between the parties listed once (see ledger_export.py)
+party_ids = [party_id]
+exporter = LedgerExporter(party_ids)
+for entry in exporter.entries():
+    print(json.dumps(entry, sort_keys=True))
+print(f"Ledger entries: {exporter.fetched} fetched, {exporter.duplicates} duplicate(s) skipped")
+# :get_ledger_entries_merged__
+
 # todo: can also refine further with a particular asset id, market id or account type
 # todo: list ledger entries with filtering on the sending AND receiving account
 # todo: list ledger entries with filtering on the transfer type (on top of above or as a standalone)
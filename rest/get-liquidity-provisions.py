@@ -18,12 +18,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 market_id = helpers.env_market_id()
 
 ###############################################################################
@@ -33,7 +36,7 @@ market_id = helpers.env_market_id()
 # __get_lps_by_market:
 # Request liquidity provisions for a market on a Vega network
 url = f"{data_node_url_rest}/liquidity/provisions?marketId={market_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Liquidity Provisions for market:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -52,7 +55,7 @@ custom_ref = first_lp["reference"]
 # __get_lps_by_party:
 # Request liquidity provisions for a party on a Vega network
 url = f"{data_node_url_rest}/liquidity/provisions?partyId={party_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Liquidity Provisions for party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -67,7 +70,7 @@ print("Liquidity Provisions for party:\n{}".format(
 # Request liquidity provisions for a reference on a Vega network
 #  Note: A partyId or marketId must be supplied with the reference field
 url = f"{data_node_url_rest}/liquidity/provisions?marketId={market_id}&reference={custom_ref}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Liquidity Provisions for reference:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
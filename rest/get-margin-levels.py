@@ -16,12 +16,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 market_id = helpers.env_market_id()
 party_id = helpers.env_party_id()
 
@@ -32,7 +35,7 @@ party_id = helpers.env_party_id()
 # __get_margin_levels:
 # Request all margin level data for a Vega network
 url = f"{data_node_url_rest}/margin/levels"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Margin level data for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -53,7 +56,7 @@ if helpers.check_nested_response(response, "marginLevels"):
 # __get_margin_levels_by_party:
 # Request margin level data for a specific party id (pubkey)
 url = f"{data_node_url_rest}/margin/levels?partyId={party_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Margin level data for party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -67,7 +70,7 @@ print("Margin level data for party:\n{}".format(
 # __get_margin_levels_by_market:
 # Request margin level data for a specific market id
 url = f"{data_node_url_rest}/margin/levels?marketId={market_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Margin level data for market:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -81,7 +84,7 @@ print("Margin level data for market:\n{}".format(
 # __get_margin_levels_by_market_and_party:
 # Request margin level data for a specific market and party id
 url = f"{data_node_url_rest}/margin/levels?marketId={market_id}&partyId={party_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Margin level data for market and party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
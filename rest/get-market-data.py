@@ -18,13 +18,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega market id
 market_id = helpers.env_market_id()
 
@@ -42,7 +44,7 @@ toTime = helpers.get_nano_ts(time_now, 0)  # to now
 # Important! The startTimestamp and endTimestamp are REQUIRED fields
 url = f"{data_node_url_rest}/market/data/{market_id}?startTimestamp={fromTime}&endTimestamp={toTime}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Market data:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -56,7 +58,7 @@ print("Market data:\n{}".format(
 # __get_latest_market_data:
 # Request market data for a specific market using a market id
 url = f"{data_node_url_rest}/market/data/{market_id}/latest"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Market data for market:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -70,7 +72,7 @@ print("Market data for market:\n{}".format(
 # __get_markets_data:
 # Request latest market data for ALL markets on a Vega network
 url = f"{data_node_url_rest}/markets/data"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Markets data:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -17,13 +17,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega market id
 market_id = helpers.env_market_id()
 assert market_id != ""
@@ -31,7 +33,7 @@ assert market_id != ""
 # __get_market_depth:
 # Request market depth for a specific market using a pre-defined market id
 url = f"{data_node_url_rest}/market/depth/{market_id}/latest?maxDepth=50"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Market depth for market:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
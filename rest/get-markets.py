@@ -12,13 +12,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                           L I S T   M A R K E T S                           #
 ###############################################################################
@@ -27,7 +29,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # Request a list of markets on a Vega network
 url = f"{data_node_url_rest}/markets"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Markets:\n{}".format(
@@ -51,7 +53,7 @@ if helpers.check_nested_response(response, "markets"):
 # __get_market:
 # Request a specific market using a pre-defined market id
 url = f"{data_node_url_rest}/market/{market_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Market:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
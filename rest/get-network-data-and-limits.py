@@ -11,13 +11,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                           N E T W O R K   D A T A                           #
 ###############################################################################
@@ -25,7 +27,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_network_data:
 # Request all data for a Vega network
 url = f"{data_node_url_rest}/network/data"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Network data:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -39,7 +41,7 @@ print("Network data:\n{}".format(
 # __get_network_limits:
 # Request all limits for a Vega network
 url = f"{data_node_url_rest}/network/limits"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Network limits:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -11,13 +11,15 @@
 #  ----------------------------------------------------------------------
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
-import requests
 import helpers
 
 # Load Vega data node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                L I S T   N E T W O R K   P A R A M E T E R S                #
 ###############################################################################
@@ -25,7 +27,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_network_params:
 # Request a list of network parameters configured on a Vega network
 url = f"{data_node_url_rest}/network/parameters"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Network parameters:\n")
 for edge in response.json()['networkParameters']['edges']:
@@ -46,7 +48,7 @@ print()
 # __get_network_param:
 # Request a specific network parameter from those configured on a Vega network
 url = f"{data_node_url_rest}/network/parameters/{parameter_key}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print(f"Network parameter for key {parameter_key}:\n")
 print(response.json())
@@ -13,7 +13,6 @@
 #  ----------------------------------------------------------------------
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
-import requests
 import helpers
 import json
 
@@ -21,6 +20,9 @@ import json
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                        L I S T   N O D E S   D A T A                        #
 ###############################################################################
@@ -28,7 +30,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_nodes:
 # Request a list of information on the set of Vega nodes on a network
 url = f"{data_node_url_rest}/nodes"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Vega nodes:\n{}".format(
@@ -50,7 +52,7 @@ print()
 # __get_node_data:
 # Request the node data for an id on a Vega network
 url = f"{data_node_url_rest}/node/{node_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Node data:\n{}".format(
     json.dumps(response_json, indent=2, sort_keys=True)
@@ -64,7 +66,7 @@ print("Node data:\n{}".format(
 # __get_node_signatures:
 # Request a list of node signatures on a Vega network
 url = f"{data_node_url_rest}/node/signatures?id={node_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Vega node signatures:\n{}".format(
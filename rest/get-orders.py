@@ -21,13 +21,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Set to True to return only orders that are currently live on the market
 # for example, not filled, expired or cancelled
 # Set to False to return all orders of all status
@@ -43,7 +45,7 @@ assert market_id != ""
 # __get_orders_by_market:
 # Request a list of orders for a market
 url = f"{data_node_url_rest}/orders?marketId={market_id}&liveOnly={live_only}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Orders filtered by market:\n{}".format(
@@ -67,7 +69,7 @@ assert party_id != ""
 # __get_orders_by_party:
 # Request a list of accounts for a party (pubkey) on a Vega network
 url = f"{data_node_url_rest}/orders?partyId={party_id}&liveOnly={live_only}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Orders filtered by party:\n{}".format(
@@ -83,7 +85,7 @@ print("Orders filtered by party:\n{}".format(
 custom_ref = "traderbot"
 # Request a list of orders with a matching custom reference string
 url = f"{data_node_url_rest}/orders?partyId={party_id}&reference={custom_ref}&liveOnly={live_only}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Orders filtered by reference:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
@@ -99,7 +101,7 @@ print("Orders filtered by reference:\n{}".format(
 # __get_order:
 # Request specific order information for an order id
 url = f"{data_node_url_rest}/order/{order_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Order:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
@@ -116,7 +118,7 @@ print("Order:\n{}".format(
 # __get_order_history:
 # Request order revision history for an order id
 url = f"{data_node_url_rest}/order/versions/{order_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Order:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
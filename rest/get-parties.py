@@ -15,7 +15,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
@@ -25,6 +24,9 @@ from login import pubkey
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                      P A R T I E S   B Y   M A R K E T                      #
 ###############################################################################
@@ -37,7 +39,7 @@ assert market_id != ""
 # __get_parties_by_market:
 # Request a list of parties for a single market (repeat the filter for multiple markets)
 # url = f"{data_node_url_rest}/accounts?filter.marketIds={market_id}"
-# response = requests.get(url)
+# response = session.get(url)
 # helpers.check_response(response)
 # response_json = response.json()
 # print("Accounts filtered by market:\n{}".format(
@@ -51,7 +53,7 @@ assert market_id != ""
 
 # __get_parties:
 url = f"{data_node_url_rest}/parties"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Parties for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -68,7 +70,7 @@ assert party_id != ""
 # __get_party:
 # Request a specific party using a pre-defined party id (pubkey)
 url = f"{data_node_url_rest}/parties?partyId={party_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
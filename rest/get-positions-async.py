@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                    G E T   P O S I T I O N S   ( A S Y N C )                #
+###############################################################################
+
+#  How to query many parties concurrently from a Data Node using asyncio:
+#  ----------------------------------------------------------------------
+#  AsyncDataNodeClient (see async_client.py) keeps every request for all
+#  parties in flight on one event loop, sharing a single connection pool.
+#  The pool size defaults to 100 and can be set with DATA_NODE_ASYNC_POOL_SIZE.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import asyncio
+import helpers
+from async_client import AsyncDataNodeClient
+
+# Load Vega market id
+market_id = helpers.env_market_id()
+assert market_id != ""
+
+
+async def main():
+    async with AsyncDataNodeClient() as client:
+        # __get_vega_time_async:
+        # Request the current blockchain time
+        print(f"Vega time: {await client.vega_time()}")
+        # :get_vega_time_async__
+
+        # __get_parties_async:
+        # Iterate all parties on the network, page by page
+        party_ids = [
+            party["id"] async for party in client.paginate("/parties", "parties")
+        ]
+        print(f"Parties found: {len(party_ids)}")
+        # :get_parties_async__
+
+        # __get_positions_and_margins_async:
+        # Request positions and margin levels for every party at the same time
+        positions, margins = await asyncio.gather(
+            asyncio.gather(
+                *(client.positions({"partyId": p, "marketId": market_id}) for p in party_ids)
+            ),
+            asyncio.gather(
+                *(client.margin_levels({"partyId": p, "marketId": market_id}) for p in party_ids)
+            ),
+        )
+        # :get_positions_and_margins_async__
+
+        for party_id, party_positions, party_margins in zip(party_ids, positions, margins):
+            if party_positions or party_margins:
+                print(f"Party {party_id}:")
+                for edge in party_positions:
+                    print(f"  position: {edge['node']}")
+                for edge in party_margins:
+                    print(f"  margin levels: {edge['node']}")
+
+
+asyncio.run(main())
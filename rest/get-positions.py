@@ -16,13 +16,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega market and party ids
 party_id = helpers.env_party_id()
 market_id = helpers.env_market_id()
@@ -36,7 +38,7 @@ assert market_id != ""
 # __get_positions:
 # Request a list of trading positions for a Vega network
 url = f"{data_node_url_rest}/positions?partyId={party_id}&marketId={market_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Positions for party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -16,13 +16,17 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
+import os
 import helpers
+from epoch_cache import EpochCache
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                           L I S T   R E W A R D S                           #
 ###############################################################################
@@ -30,7 +34,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_rewards:
 # Request a list of rewards for a Vega network
 url = f"{data_node_url_rest}/rewards"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Rewards for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -52,8 +56,8 @@ assert party_id != ""
 
 # __get_rewards_by_party:
 # Request a list of rewards for a party on a Vega network
-url = f"{data_node_url_rest}/deposits?partyId={party_id}"
-response = requests.get(url)
+url = f"{data_node_url_rest}/rewards?partyId={party_id}"
+response = session.get(url)
 helpers.check_response(response)
 print("Rewards for a specific party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -68,8 +72,8 @@ print("Rewards for a specific party:\n{}".format(
 
 # __get_rewards_by_asset:
 # Request a list of all rewards for an asset on a Vega network
-url = f"{data_node_url_rest}/deposits?assetId={asset_id}"
-response = requests.get(url)
+url = f"{data_node_url_rest}/rewards?assetId={asset_id}"
+response = session.get(url)
 helpers.check_response(response)
 print("Rewards for a specific asset:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -86,7 +90,7 @@ print("Rewards for a specific asset:\n{}".format(
 # __get_reward_summaries:
 # Request a list of all rewards for a Vega network
 url = f"{data_node_url_rest}/rewards/summaries"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Rewards summaries for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -94,31 +98,47 @@ print("Rewards summaries for network:\n{}".format(
 # :get_reward_summaries__
 
 ###############################################################################
-#              R E W A R D   S U M M A R I E S   ( F I L T E R S )              #
+#              R E W A R D   S U M M A R I E S   B Y   P A R T Y              #
 ###############################################################################
 
 # __get_reward_summaries_by_party:
-# Request a list of all rewards for a party on a Vega network
-url = f"{data_node_url_rest}/deposits?partyId={party_id}"
-response = requests.get(url)
+# Request the rewards summaries for a party on a Vega network
+url = f"{data_node_url_rest}/rewards/summaries?partyId={party_id}"
+response = session.get(url)
 helpers.check_response(response)
 print("Rewards summaries for a specific party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
 ))
-# :get_rewards_by_party__
+# :get_reward_summaries_by_party__
 
 ###############################################################################
-#                       R E W A R D S   B Y   A S S E T                       #
+#              R E W A R D   S U M M A R I E S   B Y   A S S E T              #
 ###############################################################################
 
-# Hint: Combine both rewards by asset and party to refine the query and improve performance
+# Hint: Combine both summaries by asset and party to refine the query
 
-# __get_rewards_by_asset:
-# Request a list of all rewards for an asset on a Vega network
-url = f"{data_node_url_rest}/deposits?assetId={asset_id}"
-response = requests.get(url)
+# __get_reward_summaries_by_asset:
+# Request the rewards summaries for an asset on a Vega network
+url = f"{data_node_url_rest}/rewards/summaries?assetId={asset_id}"
+response = session.get(url)
 helpers.check_response(response)
 print("Rewards summaries for a specific asset:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
 ))
-# :get_rewards_by_asset__
+# :get_reward_summaries_by_asset__
+
+###############################################################################
+#              R E W A R D S   B Y   E P O C H   ( C A C H E D )              #
+###############################################################################
+
+# __get_rewards_by_epoch_cached:
+# Request the rewards of a party over the last 100 epochs through EpochCache
+with EpochCache(os.getenv("EPOCH_CACHE_DB", "epochs.db")) as cache:
+    current = cache.current_epoch()
+    rewards = cache.rewards(max(1, current - 100), party_id=party_id)
+    for epoch, epoch_rewards in rewards.items():
+        total = sum(int(reward["amount"]) for reward in epoch_rewards)
+        if total > 0:
+            print(f"Epoch {epoch}: {len(epoch_rewards)} reward(s), total {total}")
+    print(f"Requests made: {cache.requests}")
+# :get_rewards_by_epoch_cached__
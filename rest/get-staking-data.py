@@ -15,13 +15,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                      L I S T   S T A K I N G   D A T A                      #
 ###############################################################################
@@ -32,7 +34,7 @@ assert party_id != ""
 # __get_staking_data:
 # Request all staking data for a Vega network
 url = f"{data_node_url_rest}/parties/{party_id}/stake"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Staking data for party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -19,7 +19,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
@@ -29,6 +28,9 @@ from login import pubkey
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                        T R A D E S   B Y   M A R K E T                      #
 ###############################################################################
@@ -39,7 +41,7 @@ assert market_id != ""
 # __get_trades_by_market:
 # Request a list of trades for a market
 url = f"{data_node_url_rest}/trades?marketId={market_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Trades filtered by market:\n{}".format(
@@ -63,7 +65,7 @@ if helpers.check_nested_response(response, "trades"):
 # Request a list of trades for a party (pubkey) on a Vega network
 url = f"{data_node_url_rest}/trades?partyId={pubkey}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Trades filtered by party:\n{}".format(
@@ -79,7 +81,7 @@ print("Trades filtered by party:\n{}".format(
 # Request a list of orders with a matching custom reference string
 url = f"{data_node_url_rest}/trades?orderId={order_id}"
 print(url)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Trades by order:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
@@ -96,7 +98,7 @@ print("Trades by order:\n{}".format(
 # __get_trade_by_id:
 # Request a specific trade using a pre-defined trade id
 # url = f"{data_node_url_rest}/trade/{trade_id}"
-# response = requests.get(url)
+# response = session.get(url)
 # helpers.check_response(response)
 # print("Trade:\n{}".format(
 #     json.dumps(response.json(), indent=2, sort_keys=True)))
@@ -109,7 +111,7 @@ print("Trades by order:\n{}".format(
 # __get_latest_trade:
 # Request the latest trade on a given Vega market
 url = f"{data_node_url_rest}/market/{market_id}/trade/latest"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Latest trade:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
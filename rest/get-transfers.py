@@ -19,13 +19,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                         L I S T   T R A N S F E R S                         #
 ###############################################################################
@@ -33,7 +35,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_transfers:
 # Request a list of transfers for a Vega network
 url = f"{data_node_url_rest}/transfers"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Transfers for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -58,7 +60,7 @@ if helpers.check_nested_response(response, "transfers"):
 # __get_transfers_by_party:
 # Request a list of transfers for a party (and direction) on a Vega network
 url = f"{data_node_url_rest}/transfers?pubkey={from_pubkey}&direction=TRANSFER_DIRECTION_TRANSFER_TO"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Transfers for a specific party and direction (TRANSFER_DIRECTION_TRANSFER_TO):\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
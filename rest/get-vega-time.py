@@ -10,17 +10,19 @@
 #  ----------------------------------------------------------------------
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # __get_time:
 # Request the latest timestamp in nanoseconds since epoch from the Vega network
 url = f"{data_node_url_rest}/vega/time"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 
 # The "timestamp" field contains the resulting data we need.
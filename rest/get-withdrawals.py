@@ -15,7 +15,6 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
@@ -25,6 +24,9 @@ from login import pubkey
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                       L I S T   W I T H D R A W A L S                       #
 ###############################################################################
@@ -32,7 +34,7 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 # __get_withdrawals:
 # Request a list of withdrawals for a Vega network
 url = f"{data_node_url_rest}/withdrawals"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Withdrawals for network:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -52,7 +54,7 @@ if helpers.check_nested_response(response, "withdrawals"):
 # __get_withdrawals_by_party:
 # Request a list of withdrawals for a party on a Vega network
 url = f"{data_node_url_rest}/withdrawals?partyId={pubkey}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Withdrawals for a specific party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -66,7 +68,7 @@ print("Withdrawals for a specific party:\n{}".format(
 # __get_withdrawal_by_id:
 # Request a single withdrawal for withdrawal id
 url = f"{data_node_url_rest}/withdrawal/{withdrawal_id}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Withdrawal for id:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -1,10 +1,241 @@
+import collections
+import concurrent.futures
+import hashlib
+import itertools
 import json
 import datetime
 import random
 import os
+import queue
+import re
 import requests
 import string
-from typing import Any
+import threading
+import time
+import urllib.parse
+from requests.adapters import HTTPAdapter
+from typing import Any, Iterator
+from wallet_session import HEADERS as WALLET_HEADERS, WalletSession
+
+# Process-wide HTTP session, created on first use by get_session()
+_session = None
+
+# Marks a DataNodeResponse whose body has not been decoded yet
+_NOT_DECODED = object()
+
+
+class DataNodeResponse(requests.Response):
+    """
+    A requests.Response that decodes its JSON body only once.
+
+    Every call to json() returns the same decoded object, so callers must not
+    modify it. Accessors for v2 list responses read the nested connection.
+    """
+
+    _decoded = _NOT_DECODED
+
+    def json(self, **kwargs) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        if self._decoded is _NOT_DECODED:
+            self._decoded = super().json()
+        return self._decoded
+
+    def edges(self, key: str) -> list:
+        return self.json()[key]["edges"] or []
+
+    def nodes(self, key: str) -> list:
+        return [edge["node"] for edge in self.edges(key)]
+
+    def page_info(self, key: str) -> dict:
+        return self.json()[key]["pageInfo"]
+
+
+class _DataNodeAdapter(HTTPAdapter):
+    """
+    Pooled adapter that builds DataNodeResponse objects.
+    """
+
+    def build_response(self, req, resp) -> DataNodeResponse:
+        response = super().build_response(req, resp)
+        response.__class__ = DataNodeResponse
+        return response
+
+
+def get_session(pool_size: int = 0) -> requests.Session:
+    """
+    Return the process-wide HTTP session used for all data node requests.
+
+    Connections are kept alive and pooled, so repeated calls to the same host
+    reuse an open TCP/TLS connection instead of handshaking every time. The
+    pool size is read from DATA_NODE_POOL_SIZE (default 10) unless given.
+    Responses are DataNodeResponse objects, which decode JSON only once.
+    """
+    global _session
+    if _session is None:
+        if pool_size <= 0:
+            pool_size = int(os.getenv("DATA_NODE_POOL_SIZE", "10"))
+        adapter = _DataNodeAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        _session = requests.Session()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+
+# Seconds to cache responses from slow-changing endpoints, keyed by a regular
+# expression matching the whole path below DATA_NODE_URL_REST
+CACHE_TTLS = {
+    r"/assets": 3600,
+    r"/asset/[^/]+": 3600,
+    r"/markets": 300,
+    r"/market/[^/]+": 300,
+    r"/market/[^/]+/risk/factors": 300,
+    r"/network/parameters(/[^/]+)?": 300,
+    r"/candle/intervals": 3600,
+    r"/epoch": 10,
+}
+
+
+class ResponseCache:
+    """
+    Read-through cache of decoded data node responses.
+
+    Entries live in an in-memory LRU and, if cache_dir is set, in one JSON file
+    per URL under that directory so that separate script runs share them.
+    Each URL expires after the TTL of the first pattern in ttls matching its
+    path, URLs without a TTL are never cached.
+    """
+
+    def __init__(self, ttls: dict, max_entries: int = 256, cache_dir: str = ""):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.entries = collections.OrderedDict()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self.lock = threading.Lock()
+        if cache_dir != "":
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    def ttl_for(self, url: str) -> float:
+        path = urllib.parse.urlparse(url).path
+        root = urllib.parse.urlparse(os.getenv("DATA_NODE_URL_REST", "")).path
+        if root != "" and path.startswith(root):
+            path = path[len(root):]
+        for pattern, ttl in self.ttls.items():
+            if re.fullmatch(pattern, path):
+                return ttl
+        return 0
+
+    def get(self, url: str, ttl: float = None) -> Any:
+        """
+        Return the decoded JSON for url, only requesting it when not cached.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(url)
+        now = time.time()
+
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(url)
+                self.stats["memory_hits"] += 1
+                return entry[1]
+
+        entry = self._read_disk(url, now)
+        counter = "disk_hits"
+        if entry is None:
+            counter = "misses"
+            response = get_session().get(url)
+            check_response(response)
+            entry = (now + ttl, response.json())
+            if ttl > 0:
+                self._write_disk(url, entry)
+
+        with self.lock:
+            self.stats[counter] += 1
+            if ttl > 0:
+                self.entries[url] = entry
+                self.entries.move_to_end(url)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return entry[1]
+
+    def _file(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def _read_disk(self, url: str, now: float) -> tuple:
+        if self.cache_dir == "":
+            return None
+        try:
+            with open(self._file(url)) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored["url"] != url or stored["expires"] <= now:
+            return None
+        return stored["expires"], stored["data"]
+
+    def _write_disk(self, url: str, entry: tuple) -> None:
+        if self.cache_dir == "":
+            return
+        # Write to a private temporary file and rename it into place, so other
+        # processes never read a partially written entry
+        path = self._file(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"url": url, "expires": entry[0], "data": entry[1]}, f)
+        os.replace(tmp, path)
+
+
+# Process-wide response cache, created on first use by get_cached()
+_cache = None
+
+
+def get_cached(url: str, ttl: float = None) -> Any:
+    """
+    Return the decoded JSON for a data node URL through the shared cache.
+
+    The TTL defaults to the endpoint's entry in CACHE_TTLS. Entries are also
+    stored on disk, and shared between processes, when DATA_NODE_CACHE_DIR
+    is set.
+    """
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(CACHE_TTLS, cache_dir=os.getenv("DATA_NODE_CACHE_DIR", ""))
+    return _cache.get(url, ttl)
+
+
+def cache_stats() -> dict:
+    """
+    Return the hit and miss counters of the shared response cache.
+    """
+    if _cache is None:
+        return {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+    return dict(_cache.stats)
+
+
+def get_network_parameter(key: str, data_node_url_rest: str = "") -> str:
+    """
+    Return the value of a network parameter, e.g.
+    "spam.protection.max.batchSize", read through the shared cache.
+    """
+    if data_node_url_rest == "":
+        data_node_url_rest = get_from_env("DATA_NODE_URL_REST")
+    url = f"{data_node_url_rest}/network/parameters/{key}"
+    return get_cached(url)["networkParameter"]["value"]
+
+
+def settlement_asset(market: dict) -> str:
+    """
+    Return the id of the asset a market's prices are in: the settlement
+    asset of futures and perpetuals, the quote asset of spot markets.
+    """
+    instrument = market["tradableInstrument"]["instrument"]
+    products = (("future", "settlementAsset"), ("perpetual", "settlementAsset"), ("spot", "quoteAsset"))
+    for product, field in products:
+        if product in instrument:
+            return instrument[product][field]
+    raise Exception(f"Market {market.get('id')} has an unknown product {list(instrument)}")
 
 
 def check_response(r: requests.Response) -> None:
@@ -122,14 +353,13 @@ def env_market_id_from_api(reload: bool) -> str:
         # Request a list of markets and select the first one
         data_node_url_rest = get_from_env("DATA_NODE_URL_REST")
         url = f"{data_node_url_rest}/markets"
-        response = requests.get(url)
-        check_response(response)
-        if len(get_nested_response(response, "markets")) == 0:
+        markets = get_cached(url)["markets"]["edges"]
+        if len(markets) == 0:
             print(f"No markets found on {url}")
             print("Please check and try again...")
             exit(1)
         else:
-            market_id = get_nested_response(response, "markets")[0]["node"]["id"]
+            market_id = markets[0]["node"]["id"]
         assert market_id != ""
         print(f"MARKET_ID set: {market_id}")
         os.environ["MARKET_ID"] = market_id
@@ -160,7 +390,7 @@ def env_party_id_from_api(reload: bool) -> str:
         # Request a list of parties and select the first one
         data_node_url_rest = get_from_env("DATA_NODE_URL_REST")
         url = f"{data_node_url_rest}/parties"
-        response = requests.get(url)
+        response = get_session().get(url)
         check_response(response)
         if len(get_nested_response(response, "parties")) <= 1:
             print(f"No (non network) parties found on {url}")
@@ -189,6 +419,412 @@ def check_nested_response(response: json, key: str) -> bool:
     return len(get_nested_response(response, key)) > 0
 
 
+def paginate(
+    endpoint: str,
+    key: str,
+    filters: dict = None,
+    page_size: int = 1000,
+    backward: bool = False,
+    prefetch: int = 0,
+) -> Iterator[dict]:
+    """
+    Lazily yield every `node` from a paginated v2 list endpoint.
+
+    The endpoint is relative to DATA_NODE_URL_REST (e.g. "/trades") and key is
+    the connection name in the response (e.g. "trades"). Filters are passed as
+    query parameters, list values are repeated (e.g. {"filter.partyIds": [...]}).
+    Pages are walked with pagination.first/after, or pagination.last/before when
+    backward is set, and only one page is held in memory at a time.
+
+    With prefetch > 0 the next page is requested in a background thread as soon
+    as the cursor of the previous one is known, keeping up to `prefetch` pages
+    read ahead of the caller.
+    """
+    for edges in paginate_pages(endpoint, key, filters, page_size, backward, prefetch):
+        for edge in edges:
+            yield edge["node"]
+
+
+def paginate_pages(
+    endpoint: str,
+    key: str,
+    filters: dict = None,
+    page_size: int = 1000,
+    backward: bool = False,
+    prefetch: int = 0,
+) -> Iterator[list]:
+    """
+    Like paginate(), but yield the `edges` of each page, so callers can keep
+    the cursor of the last edge they processed, e.g. to resume later with
+    pagination.after.
+    """
+    pages = _fetch_pages(endpoint, key, filters, page_size, backward)
+    if prefetch > 0:
+        pages = _prefetch_pages(pages, prefetch)
+    return pages
+
+
+def _fetch_pages(
+    endpoint: str, key: str, filters: dict, page_size: int, backward: bool
+) -> Iterator[list]:
+    """
+    Yield the edges of each page, moving the cursor on before yielding.
+    """
+    url = get_from_env("DATA_NODE_URL_REST") + endpoint
+    params = dict(filters or {})
+    if backward:
+        params["pagination.last"] = page_size
+    else:
+        params["pagination.first"] = page_size
+
+    more = True
+    while more:
+        response = get_session().get(url, params=params)
+        check_response(response)
+        connection = response.json()[key]
+        page_info = connection["pageInfo"]
+        if backward:
+            more = page_info["hasPreviousPage"]
+            params["pagination.before"] = page_info["startCursor"]
+        else:
+            more = page_info["hasNextPage"]
+            params["pagination.after"] = page_info["endCursor"]
+        edges = connection["edges"] or []
+        # Release the response before the next page is requested
+        del response, connection
+        yield edges
+
+
+# Marks the end of the pages read ahead by _prefetch_pages()
+_END_OF_PAGES = object()
+
+
+def _prefetch_pages(pages: Iterator[list], depth: int) -> Iterator[list]:
+    """
+    Consume pages on a background thread, buffering at most depth of them.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        # Block while the buffer is full, unless the caller stopped iterating
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def worker() -> None:
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(_END_OF_PAGES)
+
+    threading.Thread(target=worker, daemon=True).start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END_OF_PAGES:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def paginate_date_range(
+    endpoint: str,
+    key: str,
+    start_ts: int,
+    end_ts: int,
+    filters: dict = None,
+    shards: int = 8,
+    workers: int = 8,
+    page_size: int = 1000,
+    timestamp_field: str = "timestamp",
+) -> Iterator[dict]:
+    """
+    Yield every `node` in [start_ts, end_ts) in timestamp order, fetching
+    time shards of the window concurrently.
+
+    The window (nanoseconds past epoch) is split into equal sub-ranges, each
+    cursor-paged oldest first with its own dateRange on a pool of workers.
+    Nodes are kept only if start <= node[timestamp_field] < end for their own
+    shard, so records on a shard edge are returned exactly once. Shards are
+    yielded in order as they complete, so finished shards are held in memory
+    until the caller reaches them.
+    """
+    shards = max(1, min(shards, end_ts - start_ts))
+    step = (end_ts - start_ts) // shards
+    bounds = [start_ts + i * step for i in range(shards)] + [end_ts]
+
+    def fetch_shard(shard_start: int, shard_end: int) -> list:
+        params = dict(filters or {})
+        params["dateRange.startTimestamp"] = shard_start
+        params["dateRange.endTimestamp"] = shard_end
+        params["pagination.newestFirst"] = "false"
+        nodes = []
+        for page in _fetch_pages(endpoint, key, params, page_size, False):
+            for edge in page:
+                ts = int(edge["node"][timestamp_field])
+                if shard_start <= ts < shard_end:
+                    nodes.append(edge["node"])
+        nodes.sort(key=lambda node: int(node[timestamp_field]))
+        return nodes
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(fetch_shard, bounds[i], bounds[i + 1]) for i in range(shards)
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+class SlidingWindowLimiter:
+    """
+    Thread-safe rate limiter allowing at most `limit` acquisitions in any
+    `window` seconds.
+
+    Unlike a token bucket there is no refill during a burst, each slot only
+    frees up `window` seconds after it was used, so no interval of `window`
+    seconds ever holds more than limit.
+    """
+
+    def __init__(self, limit: int, window: float):
+        if limit <= 0 or window <= 0:
+            raise Exception(f"Invalid sliding window limit {limit} or window {window}")
+        self.limit = limit
+        self.window = window
+        # Times of the last `limit` acquisitions, including reserved ones
+        self._times = collections.deque(maxlen=limit)
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot if one is free now, without waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if len(self._times) == self.limit and self._times[0] + self.window > now:
+                return False
+            self._times.append(now)
+            return True
+
+    def acquire(self) -> float:
+        """
+        Wait until a slot is free and take it, returning the seconds waited.
+        Waiting callers are served in the order they reserved.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = now
+            if len(self._times) == self.limit:
+                start = max(now, self._times[0] + self.window)
+            # Reserve the slot, the oldest time drops out of the deque
+            self._times.append(start)
+            wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class WalletError(Exception):
+    """
+    An error returned by the Vega wallet for a JSON-RPC request.
+    """
+
+    def __init__(self, method: str, code: int, message: str, data: Any = None):
+        detail = f": {data}" if data else ""
+        super().__init__(f"{method} failed with wallet error {code} {message}{detail}")
+        self.method = method
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class WalletAuthError(WalletError):
+    """
+    The wallet rejected the Authorization token, even after reconnecting.
+    """
+
+
+class WalletRequestError(WalletError):
+    """
+    The wallet could not process the request itself, e.g. invalid params
+    (JSON-RPC error codes -32768 to -32000).
+    """
+
+
+class TransactionError(WalletError):
+    """
+    The wallet or the network rejected a transaction.
+    """
+
+
+SENDING_MODES = ("TYPE_SYNC", "TYPE_ASYNC", "TYPE_BLOCK")
+
+
+class WalletResponse:
+    """
+    The result of a wallet request with its JSON-RPC id and round trip time
+    in seconds.
+    """
+
+    def __init__(self, id: str, result: Any, latency: float):
+        self.id = id
+        self.result = result
+        self.latency = latency
+
+
+class WalletClient:
+    """
+    Client for the Vega wallet JSON-RPC API, e.g. client.send_transaction.
+
+    Requests share a pool of keep-alive connections, sized by
+    WALLET_POOL_SIZE (default 10) unless given, and each gets a unique id.
+    Errors are raised as WalletError subclasses and the round trip time of
+    every call is recorded. submit_transaction() and send_transactions()
+    keep up to pool_size transactions in flight at once.
+
+    The Authorization token comes from a WalletSession (see login.py), if
+    the wallet rejects it the session reconnects once and the call is
+    retried.
+    """
+
+    def __init__(
+        self, session: WalletSession = None, sending_mode: str = "TYPE_SYNC", pool_size: int = 0
+    ):
+        if session is None:
+            session = WalletSession()
+        if sending_mode not in SENDING_MODES:
+            raise Exception(f"Invalid sending mode {sending_mode}, expected one of {SENDING_MODES}")
+        if pool_size <= 0:
+            pool_size = int(os.getenv("WALLET_POOL_SIZE", "10"))
+        self.session = session
+        self.sending_mode = sending_mode
+        self.pool_size = pool_size
+        self.latencies = collections.deque(maxlen=100000)
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._id_prefix = generate_id(8)
+        self._ids = itertools.count(1)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        return f"{self._id_prefix}-{next(self._ids)}"
+
+    def request(self, method: str, params: dict = None) -> WalletResponse:
+        """
+        Send one authorized JSON-RPC request and return its result.
+        """
+        id = self.next_id()
+        payload = {"id": id, "jsonrpc": "2.0", "method": method}
+        if params is not None:
+            payload["params"] = params
+        start = time.perf_counter()
+        token = self.session.token
+        response = self._post(payload, token)
+        if response.status_code == 401:
+            self.session.invalidate(token)
+            response = self._post(payload, self.session.token)
+        latency = time.perf_counter() - start
+        self.latencies.append(latency)
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if "error" in body:
+            error = body["error"]
+            code = error.get("code", response.status_code)
+            if response.status_code == 401:
+                cls = WalletAuthError
+            elif -32768 <= code <= -32000:
+                cls = WalletRequestError
+            elif method == "client.send_transaction":
+                cls = TransactionError
+            else:
+                cls = WalletError
+            raise cls(method, code, error.get("message", ""), error.get("data"))
+        if response.status_code == 401:
+            raise WalletAuthError(method, 401, response.text)
+        if response.status_code != 200 or "result" not in body:
+            raise WalletError(method, response.status_code, response.text)
+        return WalletResponse(id, body["result"], latency)
+
+    def send_transaction(
+        self, pubkey: str, transaction: dict, sending_mode: str = ""
+    ) -> WalletResponse:
+        """
+        Sign and send a transaction with client.send_transaction.
+        """
+        return self.request("client.send_transaction", {
+            "publicKey": pubkey,
+            "sendingMode": sending_mode or self.sending_mode,
+            "transaction": transaction,
+        })
+
+    def submit_transaction(
+        self, pubkey: str, transaction: dict, sending_mode: str = ""
+    ) -> concurrent.futures.Future:
+        """
+        Send a transaction in the background and return a future for its
+        WalletResponse.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.pool_size)
+        return self._executor.submit(self.send_transaction, pubkey, transaction, sending_mode)
+
+    def send_transactions(
+        self, pubkey: str, transactions: list, sending_mode: str = ""
+    ) -> list:
+        """
+        Send many transactions concurrently and return their WalletResponses
+        in order, raising the first error.
+        """
+        futures = [self.submit_transaction(pubkey, tx, sending_mode) for tx in transactions]
+        return [future.result() for future in futures]
+
+    def latency_stats(self) -> dict:
+        """
+        Summarise recorded round trip times in milliseconds.
+        """
+        latencies = sorted(self.latencies)
+        if len(latencies) == 0:
+            return {"count": 0}
+        return {
+            "count": len(latencies),
+            "mean": 1000 * sum(latencies) / len(latencies),
+            "p50": 1000 * latencies[len(latencies) // 2],
+            "p99": 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+            "max": 1000 * latencies[-1],
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._http.close()
+
+    def _post(self, payload: dict, token: str) -> requests.Response:
+        headers = {**WALLET_HEADERS, "Authorization": token}
+        return self._http.post(self.session.wallet_url, headers=headers, json=payload)
+
+
 def generate_id(n :int) -> str:
     """
     Generate a semi-random identifier string of length n
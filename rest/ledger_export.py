@@ -0,0 +1,135 @@
+import concurrent.futures
+import heapq
+import json
+import os
+import tempfile
+import threading
+import helpers
+
+DIRECTIONS = ("accountFromFilter", "accountToFilter")
+
+
+class LedgerExporter:
+    """
+    Every ledger entry sent or received by any of many parties, as one
+    stream ordered by time.
+
+    /ledgerentry/history filters on the sending or the receiving account,
+    not either, so each chunk of chunk_size parties is paged twice, once per
+    direction, oldest first and concurrently on `workers` threads. Each query
+    returns its entries in time order, and the queries are merged into one
+    stream. Entries seen in both directions, transfers between two of the
+    parties, are returned once.
+
+    Fetched entries are held in memory up to max_memory bytes of JSON, then
+    written to temporary files in spill_dir (the system temporary directory
+    by default) and read back during the merge, so any number of parties
+    can be exported in one pass.
+
+        exporter = LedgerExporter(party_ids)
+        for entry in exporter.entries():
+            ...
+
+    Filters on the accounts, e.g. {"assetId": asset_id}, are applied to both
+    directions with account_filter. Other query parameters, e.g. a dateRange
+    or filter.transferTypes, are passed with filters.
+    """
+
+    def __init__(
+        self,
+        party_ids: list,
+        account_filter: dict = None,
+        filters: dict = None,
+        chunk_size: int = 100,
+        workers: int = 8,
+        page_size: int = 1000,
+        max_memory: int = 256 * 1024 * 1024,
+        spill_dir: str = None,
+    ):
+        self.party_ids = list(dict.fromkeys(party_ids))
+        self.account_filter = account_filter or {}
+        self.filters = filters or {}
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.page_size = page_size
+        self.max_memory = max_memory
+        self.spill_dir = spill_dir
+        self.fetched = 0
+        self.duplicates = 0
+        self.spilled = 0
+        self._buffered = 0
+        self._lock = threading.Lock()
+
+    def queries(self) -> list:
+        """
+        Return the query parameters of each /ledgerentry/history run.
+        """
+        queries = []
+        for i in range(0, len(self.party_ids), self.chunk_size):
+            chunk = self.party_ids[i:i + self.chunk_size]
+            for direction in DIRECTIONS:
+                params = dict(self.filters)
+                params[f"filter.{direction}.partyIds"] = chunk
+                for name, value in self.account_filter.items():
+                    params[f"filter.{direction}.{name}"] = value
+                params["pagination.newestFirst"] = "false"
+                queries.append(params)
+        return queries
+
+    def entries(self):
+        """
+        Fetch every run, then yield their entries merged in timestamp order.
+        """
+        with tempfile.TemporaryDirectory(dir=self.spill_dir) as tmp:
+            queries = self.queries()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+                runs = list(pool.map(self._fetch, queries, [tmp] * len(queries)))
+            last_ts, seen = None, set()
+            for ts, line in heapq.merge(*[self._read(run) for run in runs]):
+                if ts != last_ts:
+                    last_ts, seen = ts, set()
+                if line in seen:
+                    self.duplicates += 1
+                    continue
+                seen.add(line)
+                yield json.loads(line)
+
+    def _fetch(self, params: dict, tmp: str) -> dict:
+        # One run: its entries in memory and, once spilled, in a file
+        run = {"path": None, "lines": [], "size": 0}
+        pages = helpers.paginate_pages("/ledgerentry/history", "ledgerEntries", params, self.page_size)
+        for edges in pages:
+            size = 0
+            for edge in edges:
+                line = json.dumps(edge["node"], sort_keys=True)
+                run["lines"].append((int(edge["node"]["timestamp"]), line))
+                size += len(line)
+            run["size"] += size
+            with self._lock:
+                self.fetched += len(edges)
+                self._buffered += size
+                spill = self._buffered > self.max_memory
+                if spill:
+                    self._buffered -= run["size"]
+                    self.spilled += run["size"]
+            if spill:
+                self._spill(run, tmp)
+        return run
+
+    def _spill(self, run: dict, tmp: str) -> None:
+        if run["path"] is None:
+            fd, run["path"] = tempfile.mkstemp(dir=tmp, suffix=".jsonl")
+            os.close(fd)
+        with open(run["path"], "a") as f:
+            f.writelines(f"{ts} {line}\n" for ts, line in run["lines"])
+        run["lines"] = []
+        run["size"] = 0
+
+    def _read(self, run: dict):
+        # A run's spilled entries come before those still in memory
+        if run["path"] is not None:
+            with open(run["path"]) as f:
+                for row in f:
+                    ts, line = row.rstrip("\n").split(" ", 1)
+                    yield int(ts), line
+        yield from run["lines"]
@@ -1,11 +1,10 @@
 #!/usr/bin/python3
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
-from login import token, pubkey
+from login import wallet, pubkey
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -62,31 +61,9 @@ print("Liquidity commitment amendment:\n{}".format(
 
 # __sign_tx_liquidity_amend:
 # Sign the transaction with an order submission command
-url = "http://localhost:1789/api/v2/requests"
+sent = wallet.send_transaction(pubkey, submission)
 
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": submission
-    }
-}
-
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
-
-response = requests.request("POST", url, headers=headers, data=payload)
-
-print(response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 # :sign_tx_liquidity_amend__
 
 print("Signed liquidity commitment amendment and sent to Vega")
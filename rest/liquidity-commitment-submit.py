@@ -2,11 +2,10 @@
 
 import json
 import time
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
-from login import token, pubkey
+from login import wallet, pubkey
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -84,34 +83,12 @@ print("Liquidity commitment submission:\n{}".format(
 # __sign_tx_liquidity_submit:
 # Sign the transaction with an liquidity commitment command
 # Hint: Setting propagate to true will also submit to a Vega node
-url = "http://localhost:1789/api/v2/requests"
+sent = wallet.send_transaction(pubkey, submission)
 
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": submission
-    }
-}
-
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
-
-response = requests.request("POST", url, headers=headers, data=payload)
-
-print(response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 # :sign_tx_liquidity_submit__
 
-print(json.dumps(response.json(), indent=4, sort_keys=True))
+print(json.dumps(sent.result, indent=4, sort_keys=True))
 print()
 
 print("Signed liquidity commitment and sent to Vega")
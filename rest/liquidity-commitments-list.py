@@ -1,7 +1,6 @@
 #!/usr/bin/python3
 
 import json
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
@@ -10,6 +9,10 @@ from login import token, pubkey
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega wallet server URL, set in same way as above
 wallet_server_url = helpers.get_from_env("WALLET_SERVER_URL")
 
@@ -27,7 +30,7 @@ market_id = "e503cadb437861037cddfd7263d25b69102098a97573db23f8e5fc320cea1ce9"
 # Request liquidity provisions for a party on a Vega network
 url = f"{data_node_url_rest}/liquidity/provisions?partyId={pubkey}"
 headers = {"Authorization": f"Bearer {token}"}
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Liquidity Provisions for party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -1,50 +1,35 @@
-import json
+import os
 import requests
+import helpers
+from wallet_session import WalletSession
 
-url = "http://localhost:1789/api/v2/requests"
-connect_payload = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.connect_wallet"
-}
-connect_headers = {
-    'Content-Type': 'application/json-rpc',
-    'Accept': 'application/json-rpc',
-    'Origin': 'application/json-rpc'
-}
+# The wallet session is saved between runs (see wallet_session.py), so the
+# wallet is only asked to connect, and prompts, when there is no valid session.
+# `token` and `pubkey` are resolved on first use by `from login import ...`
+session = WalletSession()
 
-try:
-    connectionResponse = requests.post(url, headers=connect_headers, json=connect_payload)
-    connectionResponse.raise_for_status()  # Raise an exception for unsuccessful responses
-except requests.exceptions.RequestException as e:
-    print("Error connecting to the API - Make sure you have a wallet connection open and have imported the right vega-config:", str(e))
-    exit(1)
+# Pooled wallet client for sending transactions, see helpers.WalletClient
+wallet = helpers.WalletClient(session, sending_mode=os.getenv("WALLET_SENDING_MODE", "TYPE_SYNC"))
 
-authorize_payload = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.list_keys"
-}
-authorize_headers = {
-    'Content-Type': 'application/json-rpc',
-    'Accept': 'application/json-rpc',
-    'Origin': 'application/json-rpc',
-    "Authorization": connectionResponse.headers["Authorization"]
-}
 
-try:
-    authorizationResponse = requests.post(url, headers=authorize_headers, json=authorize_payload)
-    authorizationResponse.raise_for_status()
-except requests.exceptions.RequestException as e:
-    print("Error authorizing request:", str(e))
-    exit(1)
+def __getattr__(name):
+    if name not in ("token", "pubkey"):
+        raise AttributeError(f"module 'login' has no attribute '{name}'")
+    try:
+        session.token
+    except requests.exceptions.RequestException as e:
+        print("Error connecting to the API - Make sure you have a wallet connection open and have imported the right vega-config:", str(e))
+        exit(1)
+    try:
+        return session.token if name == "token" else session.pubkey
+    except requests.exceptions.RequestException as e:
+        print("Error authorizing request:", str(e))
+        exit(1)
+    except (KeyError, IndexError, ValueError) as e:
+        print("Error parsing authorization response:", str(e))
+        exit(1)
 
-try:
-    token = connectionResponse.headers["Authorization"]
-    authContent = json.loads(authorizationResponse.content)
-    pubkey = authContent['result']['keys'][0]['publicKey']
-except (KeyError, IndexError, json.JSONDecodeError) as e:
-    print("Error parsing authorization response:", str(e))
-    exit(1)
 
-# Rest of your code...
+if __name__ == "__main__":
+    pubkey = __getattr__("pubkey")
+    print("Connected to wallet, using public key:", pubkey)
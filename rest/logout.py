@@ -1,13 +1,5 @@
-import requests
-from login import token
+from login import session
 
-url = "http://localhost:1789/api/v2/requests"
-connect_payload = "{\n        \"id\": \"1\",\n        \"jsonrpc\": \"2.0\",\n        \"method\": \"client.disconnect_wallet\"\n    }"
-connect_headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc', 
-  'Origin': 'application/json-rpc', 
-  'Authorization': token
-}
-connectionResponse = requests.request("POST", url, headers=connect_headers, data=connect_payload)
-print(connectionResponse.text)
\ No newline at end of file
+# Disconnect from the wallet and remove the saved wallet session
+connectionResponse = session.disconnect()
+print(connectionResponse.text)
@@ -0,0 +1,191 @@
+import os
+import time
+import numpy as np
+
+# Enum values stored as their index in these tuples, -1 if not listed
+TRADING_MODES = (
+    "TRADING_MODE_UNSPECIFIED",
+    "TRADING_MODE_CONTINUOUS",
+    "TRADING_MODE_BATCH_AUCTION",
+    "TRADING_MODE_OPENING_AUCTION",
+    "TRADING_MODE_MONITORING_AUCTION",
+    "TRADING_MODE_NO_TRADING",
+    "TRADING_MODE_SUSPENDED_VIA_GOVERNANCE",
+)
+AUCTION_TRIGGERS = (
+    "AUCTION_TRIGGER_UNSPECIFIED",
+    "AUCTION_TRIGGER_BATCH",
+    "AUCTION_TRIGGER_OPENING",
+    "AUCTION_TRIGGER_PRICE",
+    "AUCTION_TRIGGER_LIQUIDITY",
+    "AUCTION_TRIGGER_LIQUIDITY_TARGET_NOT_MET",
+    "AUCTION_TRIGGER_UNABLE_TO_DEPLOY_LP_ORDERS",
+    "AUCTION_TRIGGER_GOVERNANCE_SUSPENSION",
+)
+
+# One market data update, stored as is in the tick files. Prices are in
+# market decimals, volumes in position decimals and times in nanoseconds
+# past epoch.
+RECORD = np.dtype([
+    ("timestamp", "<i8"),
+    ("mark_price", "<i8"),
+    ("best_bid_price", "<i8"),
+    ("best_bid_volume", "<i8"),
+    ("best_offer_price", "<i8"),
+    ("best_offer_volume", "<i8"),
+    ("mid_price", "<i8"),
+    ("open_interest", "<i8"),
+    ("indicative_price", "<i8"),
+    ("indicative_volume", "<i8"),
+    ("auction_start", "<i8"),
+    ("auction_end", "<i8"),
+    ("trading_mode", "<i1"),
+    ("trigger", "<i1"),
+])
+
+# Market data field for each RECORD field before trading_mode, in order
+_FIELDS = (
+    "timestamp",
+    "markPrice",
+    "bestBidPrice",
+    "bestBidVolume",
+    "bestOfferPrice",
+    "bestOfferVolume",
+    "midPrice",
+    "openInterest",
+    "indicativePrice",
+    "indicativeVolume",
+    "auctionStart",
+    "auctionEnd",
+)
+
+
+def tick_file(directory: str, market_id: str) -> str:
+    return os.path.join(directory, f"{market_id}.ticks")
+
+
+def load_ticks(directory: str, market_id: str, start_ts: int = 0, end_ts: int = 0) -> np.ndarray:
+    """
+    Memory-map the recorded ticks of a market, optionally only those in
+    [start_ts, end_ts), as a read-only array of RECORD. An incomplete last
+    record, e.g. from a recorder that was killed mid write, is left out.
+    """
+    path = tick_file(directory, market_id)
+    count = os.path.getsize(path) // RECORD.itemsize if os.path.exists(path) else 0
+    if count == 0:
+        return np.empty(0, dtype=RECORD)
+    ticks = np.memmap(path, dtype=RECORD, mode="r", shape=(count,))
+    return _between(ticks, start_ts, end_ts)
+
+
+def _between(ticks: np.ndarray, start_ts: int, end_ts: int) -> np.ndarray:
+    # Ticks are appended in stream order, so timestamps are sorted
+    first = np.searchsorted(ticks["timestamp"], start_ts, side="left") if start_ts > 0 else 0
+    last = np.searchsorted(ticks["timestamp"], end_ts, side="left") if end_ts > 0 else len(ticks)
+    return ticks[first:last]
+
+
+class MarketDataRecorder:
+    """
+    Record stream/markets/data updates as fixed-width ticks, one file of
+    RECORD structs per market, that can be memory-mapped and sliced with
+    NumPy without parsing, e.g. with load_ticks() from another process.
+
+    Each market's updates are collected in a fixed buffer of `capacity`
+    records and appended to its file in one write when the buffer is full,
+    every flush_interval seconds, or on flush() and close().
+
+        recorder = MarketDataRecorder("ticks")
+        manager.subscribe("/stream/markets/data", {"marketIds": market_ids}, recorder.on_message)
+        ...
+        ticks = recorder.ticks(market_id, start_ts)
+        ticks["mark_price"]
+    """
+
+    def __init__(self, directory: str, capacity: int = 4096, flush_interval: float = 5.0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self._buffers = {}
+        self._counts = {}
+        self._files = {}
+        self._last_flush = time.monotonic()
+
+    def on_message(self, topic: str, obj: dict) -> None:
+        """
+        StreamManager handler for stream/markets/data messages.
+        """
+        for data in obj["result"].get("marketData", []):
+            self.record(data)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def record(self, data: dict) -> None:
+        """
+        Add one marketData update to the buffer of its market.
+        """
+        market_id = data["market"]
+        buffer = self._buffers.get(market_id)
+        if buffer is None:
+            buffer = np.zeros(self.capacity, dtype=RECORD)
+            self._buffers[market_id] = buffer
+            self._counts[market_id] = 0
+        i = self._counts[market_id]
+        buffer[i] = tuple(int(data.get(key) or 0) for key in _FIELDS) + (
+            _index(TRADING_MODES, data.get("marketTradingMode")),
+            _index(AUCTION_TRIGGERS, data.get("trigger")),
+        )
+        self._counts[market_id] = i + 1
+        self.recorded += 1
+        if i + 1 == self.capacity:
+            self._flush_market(market_id)
+
+    def flush(self) -> None:
+        """
+        Append the buffered ticks of every market to their files.
+        """
+        for market_id in self._buffers:
+            self._flush_market(market_id)
+        self._last_flush = time.monotonic()
+
+    def _flush_market(self, market_id: str) -> None:
+        count = self._counts[market_id]
+        if count == 0:
+            return
+        f = self._files.get(market_id)
+        if f is None:
+            f = open(tick_file(self.directory, market_id), "ab")
+            # Drop an incomplete record left by an earlier run
+            f.truncate(f.tell() - f.tell() % RECORD.itemsize)
+            f.seek(0, os.SEEK_END)
+            self._files[market_id] = f
+        f.write(self._buffers[market_id][:count].tobytes())
+        f.flush()
+        self._counts[market_id] = 0
+
+    def close(self) -> None:
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def markets(self) -> list:
+        return list(self._buffers)
+
+    def ticks(self, market_id: str, start_ts: int = 0, end_ts: int = 0) -> np.ndarray:
+        """
+        Flush, then return the recorded ticks of a market, optionally only
+        those in [start_ts, end_ts), memory-mapped from its file.
+        """
+        if market_id in self._buffers:
+            self._flush_market(market_id)
+        return load_ticks(self.directory, market_id, start_ts, end_ts)
+
+
+def _index(values: tuple, value: str) -> int:
+    try:
+        return values.index(value)
+    except ValueError:
+        return -1
@@ -1,16 +1,19 @@
 #!/usr/bin/python3
 
-import requests
-import time
 import helpers
 import json
+from order_watcher import OrderWatcher
 
 # Vega wallet interaction helper, see login.py for detail
-from login import token, pubkey
+from login import wallet, pubkey
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega wallet server URL, set in same way as above
 wallet_server_url = helpers.get_from_env("WALLET_SERVER_URL")
 
@@ -21,12 +24,18 @@ assert market_id != ""
 # Set market id in ENV or uncomment the line below to override market id directly
 market_id = "e503cadb437861037cddfd7263d25b69102098a97573db23f8e5fc320cea1ce9"
 
-# Grab order reference from original order submission
-order_ref = "" 
-url = f"{data_node_url_rest}/orders?partyId={pubkey}&reference={order_ref}"
-response = requests.get(url)
+# Confirm transactions from the orders stream of the party rather than by
+# polling /orders, see order_watcher.py
+watcher = OrderWatcher(pubkey, market_id)
+watcher.start()
 
-found_order = helpers.get_nested_response(response, "orders")[0]["node"]
+# Grab order reference from original order submission, the order is found
+# in the live orders streamed on connecting, with no REST request
+order_ref = "" 
+found_order = watcher.find(order_ref)
+if found_order is None:
+    print(f"No live order found with reference {order_ref}")
+    exit(1)  # Halt processing at this stage
 
 orderID = found_order["id"]
 orderStatus = found_order["status"]
@@ -38,7 +47,7 @@ createVersion = found_order["version"]
 
 # __get_expiry_time:
 # Request the current blockchain time, calculate an expiry time
-response = requests.get(f"{data_node_url_rest}/vega/time")
+response = session.get(f"{data_node_url_rest}/vega/time")
 helpers.check_response(response)
 blockchain_time = int(response.json()["timestamp"])
 expiresAt = str(int(blockchain_time + 120 * 1e9))  # expire in 2 minutes
@@ -91,46 +100,26 @@ print()
 print("Order cancellation: ", json.dumps(cancellation, indent=2, sort_keys=True))
 print()
 
+# Register the expected order update before sending the transaction
+confirmed = watcher.expect(order_id=orderID, statuses=("STATUS_CANCELLED",))
+
 # __sign_tx_cancel:
 # Sign the transaction for cancellation
-url = "http://localhost:1789/api/v2/requests"
-
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": cancellation
-    }
-}
+sent = wallet.send_transaction(pubkey, cancellation)
 
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
-
-response = requests.request("POST", url, headers=headers, data=payload)
-
-print(response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 # :sign_tx_cancel__
 
 print("Signed cancellation and sent to Vega")
 print()
 
-# Wait for cancellation to be included in a block
+# Wait for cancellation to be included in a block, it is confirmed
+# by the first matching update on the orders stream
 print("Waiting for blockchain...")
-time.sleep(3)
-
-url = f"{data_node_url_rest}/orders?partyId={pubkey}&reference={order_ref}"
-response = requests.get(url)
-
-found_order = helpers.get_nested_response(response, "orders")[0]["node"]
+found_order = watcher.wait(confirmed)
+if found_order is None:
+    print("\nNo matching order update was streamed, check the wallet response above")
+    exit(1)  # Halt processing at this stage
 
 orderID = found_order["id"]
 orderStatus = found_order["status"]
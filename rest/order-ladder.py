@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                          O R D E R   L A D D E R                            #
+###############################################################################
+
+#  How to submit a ladder of orders as fast as spam protection allows:
+#  ----------------------------------------------------------------------
+#  build_ladder() (see order_ladder.py) turns a grid of prices and sizes into
+#  order submissions. LadderSubmitter sends them concurrently through the
+#  wallet, at most spam.pow.numberOfTxPerBlock (a network parameter) in any
+#  block time, so no transaction is rejected for going over the limit of a
+#  key per block.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import time
+import helpers
+from order_ladder import LadderSubmitter, build_ladder, grid
+
+# Vega wallet interaction helper, see login.py for detail
+from login import wallet, pubkey
+
+# Load Vega market id
+market_id = helpers.env_market_id()
+assert market_id != ""
+
+# __order_ladder:
+# Replace the orders of the key on the market with 20 bids and 20 asks
+submitter = LadderSubmitter(wallet, pubkey)
+bids = build_ladder(market_id, "SIDE_BUY", grid(100, -1, 20), 10, reference_prefix=f"{pubkey}-")
+asks = build_ladder(market_id, "SIDE_SELL", grid(110, 1, 20), 10, reference_prefix=f"{pubkey}-")
+start = time.perf_counter()
+results = submitter.replace(market_id, bids + asks)
+elapsed = time.perf_counter() - start
+# :order_ladder__
+
+for order, result in results:
+    if isinstance(result, helpers.WalletError):
+        print(f"{order['side']} {order['size']} @ {order['price']} failed: {result}")
+
+print(f"Sent {submitter.sent} transaction(s) in {elapsed:.2f}s, {submitter.failed} failed, "
+      f"{submitter.waited:.2f}s waiting for the rate limit of "
+      f"{submitter.tx_per_block} per block")
@@ -0,0 +1,222 @@
+import asyncio
+import bisect
+import helpers
+
+
+class BookSide:
+    """
+    Price levels for one side of the book in a sorted array.
+
+    Prices are stored as integer keys ordered from worst to best, asks are
+    negated so the best level is always the last element for both sides.
+    Lookups use binary search and the best level is O(1).
+
+    Volumes are also kept in a Fenwick tree in the same order as keys, so
+    changing the volume of a level and querying cumulative volume are both
+    O(log n). Adding or removing a level shifts the keys, like the insertion
+    into the sorted array itself that is O(n), and the tree is rebuilt in
+    O(n) on the next query.
+    """
+
+    def __init__(self, is_buy: bool):
+        self.sign = 1 if is_buy else -1
+        self.keys = []
+        self.levels = {}
+        self._tree = None
+
+    def clear(self) -> None:
+        del self.keys[:]
+        self.levels.clear()
+        self._tree = None
+
+    def set_level(self, price: int, volume: int, orders: int) -> None:
+        """
+        Set the volume at a price, a volume of zero removes the level.
+        """
+        key = self.sign * price
+        if volume == 0:
+            if self.levels.pop(key, None) is not None:
+                del self.keys[bisect.bisect_left(self.keys, key)]
+                self._tree = None
+            return
+        level = self.levels.get(key)
+        self.levels[key] = (volume, orders)
+        if level is None:
+            bisect.insort(self.keys, key)
+            self._tree = None
+        elif self._tree is not None and volume != level[0]:
+            self._add(bisect.bisect_left(self.keys, key) + 1, volume - level[0])
+
+    def _add(self, i: int, delta: int) -> None:
+        # Add to the volume of the level at 1-based position i in keys
+        tree = self._tree
+        n = len(tree)
+        while i < n:
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i: int) -> int:
+        # Total volume of the first i levels in keys, from the worst
+        if self._tree is None:
+            tree = [0]
+            tree.extend(self.levels[key][0] for key in self.keys)
+            n = len(tree)
+            for j in range(1, n):
+                parent = j + (j & -j)
+                if parent < n:
+                    tree[parent] += tree[j]
+            self._tree = tree
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def best(self) -> tuple:
+        """
+        Return (price, volume, orders) of the best level, or None if empty.
+        """
+        if len(self.keys) == 0:
+            return None
+        key = self.keys[-1]
+        return (self.sign * key,) + self.levels[key]
+
+    def top(self, n: int) -> list:
+        """
+        Return up to n (price, volume, orders) levels, best first.
+        """
+        keys = self.keys[-n:] if n > 0 else []
+        return [(self.sign * key,) + self.levels[key] for key in reversed(keys)]
+
+    def cumulative_volume(self, price: int) -> int:
+        """
+        Return the total volume at this price or better.
+        """
+        i = bisect.bisect_left(self.keys, self.sign * price)
+        return self._prefix(len(self.keys)) - self._prefix(i)
+
+
+class OrderBook:
+    """
+    Local L2 order book for one market, seeded from the latest market depth
+    and kept current by applying stream/markets/depth/updates.
+
+    Each update must follow on from the last one applied, by its
+    previousSequenceNumber. Stale updates are ignored and a gap triggers a
+    resync from /market/depth/{id}/latest.
+
+    As a StreamManager handler, on_message() fetches the resync snapshot in a
+    worker thread so the event loop keeps running. Updates received while it
+    is in flight are buffered and applied on top of the snapshot.
+    """
+
+    def __init__(self, market_id: str, data_node_url_rest: str = ""):
+        if data_node_url_rest == "":
+            data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+        self.market_id = market_id
+        self.url = f"{data_node_url_rest}/market/depth/{market_id}/latest"
+        self.buy = BookSide(is_buy=True)
+        self.sell = BookSide(is_buy=False)
+        self.sequence = 0
+        self.updates = 0
+        self.gaps = 0
+        self.resyncs = 0
+        self._buffered = None
+        self._resync_task = None
+
+    def fetch(self) -> dict:
+        """
+        Return the latest market depth from the data node.
+        """
+        response = helpers.get_session().get(self.url)
+        helpers.check_response(response)
+        return response.json()
+
+    def resync(self) -> None:
+        """
+        Replace the book with the latest market depth from the data node.
+        """
+        self.load(self.fetch())
+        self.resyncs += 1
+
+    def load(self, depth: dict) -> None:
+        """
+        Replace the book with a full market depth snapshot.
+        """
+        for side, levels in ((self.buy, depth.get("buy")), (self.sell, depth.get("sell"))):
+            side.clear()
+            for level in levels or []:
+                side.set_level(int(level["price"]), int(level["volume"]), int(level["numberOfOrders"]))
+        self.sequence = int(depth["sequenceNumber"])
+
+    def apply(self, update: dict) -> bool:
+        """
+        Apply one market depth update, returning False if it was not applied.
+        A gap resyncs the book first and blocks until the snapshot arrives.
+        """
+        sequence = int(update["sequenceNumber"])
+        if sequence <= self.sequence:
+            return False
+        if int(update["previousSequenceNumber"]) != self.sequence:
+            self.gaps += 1
+            self.resync()
+            if sequence <= self.sequence or int(update["previousSequenceNumber"]) != self.sequence:
+                return False
+
+        for side, levels in ((self.buy, update.get("buy")), (self.sell, update.get("sell"))):
+            for level in levels or []:
+                side.set_level(int(level["price"]), int(level["volume"]), int(level["numberOfOrders"]))
+        self.sequence = sequence
+        self.updates += 1
+        return True
+
+    async def on_message(self, topic: str, obj: dict) -> None:
+        """
+        StreamManager handler for stream/markets/depth/updates messages.
+        """
+        for update in obj["result"].get("update", []):
+            if update["marketId"] == self.market_id:
+                self._receive(update)
+
+    def _receive(self, update: dict) -> None:
+        if self._buffered is not None:
+            self._buffered.append(update)
+            return
+        sequence = int(update["sequenceNumber"])
+        if sequence > self.sequence and int(update["previousSequenceNumber"]) != self.sequence:
+            self.gaps += 1
+            self._buffered = [update]
+            self._resync_task = asyncio.create_task(self._resync_buffered())
+            return
+        self.apply(update)
+
+    async def _resync_buffered(self) -> None:
+        try:
+            depth = await asyncio.get_running_loop().run_in_executor(None, self.fetch)
+        except Exception as e:
+            # The buffered updates are dropped, the next update finds the same
+            # gap and tries again
+            print(f"Order book {self.market_id} resync error: {e!r}")
+            self._buffered = None
+            return
+        self.load(depth)
+        self.resyncs += 1
+        buffered, self._buffered = self._buffered, None
+        for update in buffered:
+            self._receive(update)
+
+    def best_bid(self) -> tuple:
+        return self.buy.best()
+
+    def best_ask(self) -> tuple:
+        return self.sell.best()
+
+    def top(self, n: int) -> dict:
+        """
+        Return the best n levels of each side as (price, volume, orders).
+        """
+        return {"buy": self.buy.top(n), "sell": self.sell.top(n)}
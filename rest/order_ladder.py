@@ -0,0 +1,135 @@
+import concurrent.futures
+import helpers
+
+# Network parameter for the transactions a key may send per block without
+# being rejected, when spam.pow.increaseDifficulty is off
+TX_PER_BLOCK_PARAMETER = "spam.pow.numberOfTxPerBlock"
+
+# Seconds per block assumed when pacing transactions. The network does not
+# publish a block time, this is an upper estimate for Vega networks and must
+# not be below the real one: if blocks take longer than this, more than
+# tx_per_block transactions of a key can land in the same block.
+DEFAULT_BLOCK_TIME = 1.0
+
+
+def grid(start: int, step: int, levels: int) -> list:
+    """
+    Return `levels` integers from start, step apart, e.g. ladder prices
+    grid(1000, -5, 20) for bids below 1000.
+    """
+    return [start + i * step for i in range(levels)]
+
+
+def build_ladder(
+    market_id: str,
+    side: str,
+    prices: list,
+    sizes,
+    time_in_force: str = "TIME_IN_FORCE_GTC",
+    expires_at: str = "",
+    reference_prefix: str = "",
+) -> list:
+    """
+    Build limit orderSubmissions for each price of a ladder.
+
+    sizes is a list matching prices or one size for every level. Each order
+    gets a unique reference, starting with reference_prefix if given, to
+    find it again e.g. with OrderWatcher.
+    """
+    if isinstance(sizes, (int, str)):
+        sizes = [sizes] * len(prices)
+    if len(sizes) != len(prices):
+        raise Exception(f"Ladder has {len(prices)} prices but {len(sizes)} sizes")
+    orders = []
+    for price, size in zip(prices, sizes):
+        order = {
+            "marketId": market_id,
+            "price": str(price),
+            "size": str(size),
+            "side": side,
+            "timeInForce": time_in_force,
+            "type": "TYPE_LIMIT",
+            "reference": f"{reference_prefix}{helpers.generate_id(30)}",
+        }
+        if expires_at != "":
+            order["expiresAt"] = expires_at
+        orders.append(order)
+    return orders
+
+
+class LadderSubmitter:
+    """
+    Submit ladders of orders concurrently through the wallet, paced so a key
+    stays within the spam protection limits.
+
+    At most spam.pow.numberOfTxPerBlock transactions are sent in any
+    block_time seconds (helpers.SlidingWindowLimiter), so one block's worth
+    goes out at once and the next only once a block has passed. block_time
+    defaults to DEFAULT_BLOCK_TIME, pass the block time of the network if it
+    is longer. Each order is its own transaction, sent as soon as the
+    limiter allows while earlier ones are still in flight.
+
+        submitter = LadderSubmitter(wallet, pubkey)
+        bids = build_ladder(market_id, "SIDE_BUY", grid(1000, -5, 50), 10)
+        asks = build_ladder(market_id, "SIDE_SELL", grid(1010, 5, 50), 10)
+        results = submitter.submit(bids + asks)
+    """
+
+    def __init__(
+        self,
+        wallet: helpers.WalletClient,
+        pubkey: str,
+        tx_per_block: int = 0,
+        block_time: float = DEFAULT_BLOCK_TIME,
+    ):
+        if tx_per_block <= 0:
+            tx_per_block = int(helpers.get_network_parameter(TX_PER_BLOCK_PARAMETER))
+        self.wallet = wallet
+        self.pubkey = pubkey
+        self.tx_per_block = tx_per_block
+        self.block_time = block_time
+        self.limiter = helpers.SlidingWindowLimiter(tx_per_block, block_time)
+        self.sent = 0
+        self.failed = 0
+        self.waited = 0.0
+
+    def send(self, transaction: dict) -> concurrent.futures.Future:
+        """
+        Wait for the rate limiter, then send a transaction in the background.
+        """
+        self.waited += self.limiter.acquire()
+        return self.wallet.submit_transaction(self.pubkey, {
+            **transaction, "pubKey": self.pubkey, "propagate": True
+        })
+
+    def submit(self, orders: list) -> list:
+        """
+        Submit orderSubmissions, returning (order, WalletResponse or the
+        error) for each in order once they have all been sent.
+        """
+        futures = [self.send({"orderSubmission": order}) for order in orders]
+        return [(order, self._result(future)) for order, future in zip(orders, futures)]
+
+    def cancel(self, market_id: str) -> helpers.WalletResponse:
+        """
+        Cancel all orders of the key on a market.
+        """
+        return self._result(self.send({"orderCancellation": {"marketId": market_id}}))
+
+    def replace(self, market_id: str, orders: list) -> list:
+        """
+        Cancel all orders of the key on a market, then submit a new ladder.
+        """
+        result = self.cancel(market_id)
+        if isinstance(result, Exception):
+            raise result
+        return self.submit(orders)
+
+    def _result(self, future: concurrent.futures.Future):
+        try:
+            result = future.result()
+            self.sent += 1
+        except helpers.WalletError as e:
+            result = e
+            self.failed += 1
+        return result
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+
+# Order statuses that can still trade or be amended
+LIVE_STATUSES = ("STATUS_ACTIVE", "STATUS_PARKED")
+
+
+class OrderStore:
+    """
+    Latest state of a party's orders, indexed by Vega order id and by client
+    reference, kept current from stream/orders snapshots and updates.
+
+    Orders are stored as the dicts the stream delivered, so lookups return
+    the id, version, remaining size, status and every other field in O(1)
+    without a REST read. Updates with an older version than the one stored
+    are ignored. The store can be saved to and loaded from a snapshot file,
+    e.g. to resolve references of orders placed by an earlier run.
+
+    Once a stream snapshot is complete, live orders in the store that were
+    not in it, e.g. loaded from a file but filled or cancelled since, are
+    listed in `stale` until they are updated again.
+
+        store = OrderStore()
+        manager.subscribe("/stream/orders", {"partyId": pubkey}, store.on_message)
+        order = store.by_reference(order_ref)
+    """
+
+    def __init__(self):
+        self.orders = {}
+        self.references = {}
+        self.stale = set()
+        self.updates = 0
+        self.snapshot_complete = threading.Event()
+        self._snapshot_ids = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def get(self, order_id: str) -> dict:
+        return self.orders.get(order_id)
+
+    def by_reference(self, reference: str) -> dict:
+        order_id = self.references.get(reference)
+        return None if order_id is None else self.orders.get(order_id)
+
+    def order_id(self, reference: str) -> str:
+        return self.references.get(reference)
+
+    def live(self, market_id: str = "") -> list:
+        """
+        Return the orders that are active or parked, optionally on one market.
+        """
+        return [
+            order for order in list(self.orders.values())
+            if order["status"] in LIVE_STATUSES
+            and (market_id == "" or order["marketId"] == market_id)
+        ]
+
+    def update(self, order: dict) -> bool:
+        """
+        Store an order update, returning False if it was older than the
+        version already stored.
+        """
+        with self._lock:
+            return self._update(order)
+
+    def _update(self, order: dict) -> bool:
+        order_id = order["id"]
+        stored = self.orders.get(order_id)
+        if stored is not None and int(order.get("version", 0)) < int(stored.get("version", 0)):
+            return False
+        self.orders[order_id] = order
+        reference = order.get("reference", "")
+        if reference != "":
+            self.references[reference] = order_id
+        self.stale.discard(order_id)
+        self.updates += 1
+        return True
+
+    def apply(self, result: dict) -> list:
+        """
+        Apply the result of one stream/orders message, returning the orders
+        that were stored.
+        """
+        stored = []
+        with self._lock:
+            if "snapshot" in result:
+                snapshot = result["snapshot"]
+                for order in snapshot.get("orders", []):
+                    self._snapshot_ids.add(order["id"])
+                    if self._update(order):
+                        stored.append(order)
+                if snapshot.get("lastPage", True):
+                    self._end_snapshot()
+            if "updates" in result:
+                for order in result["updates"].get("orders", []):
+                    if self._update(order):
+                        stored.append(order)
+        return stored
+
+    def _end_snapshot(self) -> None:
+        self.stale = {
+            order_id for order_id, order in self.orders.items()
+            if order["status"] in LIVE_STATUSES and order_id not in self._snapshot_ids
+        }
+        self._snapshot_ids = set()
+        self.snapshot_complete.set()
+
+    def on_message(self, topic: str, obj: dict) -> None:
+        """
+        StreamManager handler for stream/orders messages.
+        """
+        self.apply(obj.get("result", {}))
+
+    def prune(self) -> int:
+        """
+        Drop orders that are no longer live, returning how many were dropped.
+        """
+        with self._lock:
+            done = [i for i, order in self.orders.items() if order["status"] not in LIVE_STATUSES]
+            for order_id in done:
+                reference = self.orders.pop(order_id).get("reference", "")
+                if self.references.get(reference) == order_id:
+                    del self.references[reference]
+            return len(done)
+
+    def save(self, path: str) -> None:
+        """
+        Write every stored order to a snapshot file, readable by this user only.
+        """
+        with self._lock:
+            orders = list(self.orders.values())
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"orders": orders}, f)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> int:
+        """
+        Add the orders from a snapshot file, returning how many were stored.
+        A missing file loads nothing.
+        """
+        try:
+            with open(path) as f:
+                orders = json.load(f)["orders"]
+        except FileNotFoundError:
+            return 0
+        with self._lock:
+            return sum(self._update(order) for order in orders)
@@ -0,0 +1,138 @@
+import concurrent.futures
+import threading
+import urllib.parse
+import websocket
+import helpers
+from order_store import OrderStore
+from stream_decoder import StreamDecoder
+
+
+class OrderWatcher:
+    """
+    Confirm order submissions, amendments and cancellations from the
+    stream/orders feed of a party instead of polling /orders.
+
+    Start the watcher, register what you expect with expect() before sending
+    the transaction, then wait() for the order. The future resolves as soon
+    as the data node streams an order update that matches, or an order that
+    was rejected. Orders already streamed are remembered, so an expectation
+    registered after its update arrived resolves immediately. Streamed
+    orders are kept in an OrderStore, `store`, so amend and cancel paths can
+    look orders up by reference without a REST read.
+
+        watcher = OrderWatcher(pubkey, market_id)
+        watcher.start()
+        confirmed = watcher.expect(reference=order_ref)
+        ... send the order submission ...
+        order = watcher.wait(confirmed)
+    """
+
+    def __init__(self, party_id: str, market_id: str = "", data_node_url_rest: str = ""):
+        if data_node_url_rest == "":
+            data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+        params = {"partyId": party_id}
+        if market_id != "":
+            params["marketId"] = market_id
+        self.url = (
+            data_node_url_rest.replace("https://", "wss://").replace("http://", "ws://")
+            + "/stream/orders?" + urllib.parse.urlencode(params)
+        )
+        self.store = OrderStore()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._open = threading.Event()
+        self._decoder = StreamDecoder()
+        self._ws = None
+        self._thread = None
+
+    def start(self, timeout: float = 10.0) -> None:
+        """
+        Open the orders stream in a background thread and wait until it is
+        connected, so that no update sent after this returns is missed.
+        """
+        self._ws = websocket.WebSocketApp(
+            self.url,
+            on_open=lambda wsa: self._open.set(),
+            on_message=self._on_message,
+            on_error=lambda wsa, error: print(f"Orders stream error: {error}"),
+        )
+        self._thread = threading.Thread(target=self._ws.run_forever, daemon=True)
+        self._thread.start()
+        if not self._open.wait(timeout):
+            self.stop()
+            raise Exception(f"Orders stream did not open within {timeout}s: {self.url}")
+
+    def stop(self) -> None:
+        if self._ws is not None:
+            self._ws.close()
+        with self._lock:
+            for _, future in self._pending:
+                future.cancel()
+            self._pending = []
+
+    def expect(
+        self, reference: str = "", order_id: str = "", version: int = 0, statuses: tuple = ()
+    ) -> concurrent.futures.Future:
+        """
+        Return a future resolved with the first order that matches.
+
+        An order matches when it has the given reference and/or id, and
+        either was rejected, or has at least the given version and one of
+        the given statuses (each check only applies if set).
+        """
+        expected = (reference, order_id, int(version), tuple(statuses))
+        future = concurrent.futures.Future()
+        with self._lock:
+            if order_id != "":
+                order = self.store.get(order_id)
+            else:
+                order = self.store.by_reference(reference)
+            if order is not None and _matches(order, *expected):
+                future.set_result(order)
+                return future
+            self._pending.append((expected, future))
+        return future
+
+    def wait(self, future: concurrent.futures.Future, timeout: float = 30.0) -> dict:
+        """
+        Return the order a future resolved with, or None after timeout seconds.
+        """
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            return None
+
+    def _on_message(self, wsa, line: str) -> None:
+        for obj in self._decoder.feed(line):
+            with self._lock:
+                for order in self.store.apply(obj.get("result", {})):
+                    self._resolve(order)
+
+    def _resolve(self, order: dict) -> None:
+        pending = []
+        for expected, future in self._pending:
+            if _matches(order, *expected):
+                future.set_result(order)
+            else:
+                pending.append((expected, future))
+        self._pending = pending
+
+    def find(self, reference: str, timeout: float = 10.0) -> dict:
+        """
+        Return the latest state of an order by reference, once the stream
+        snapshot of the party's live orders has arrived, or None.
+        """
+        self.store.snapshot_complete.wait(timeout)
+        return self.store.by_reference(reference)
+
+
+def _matches(order: dict, reference: str, order_id: str, version: int, statuses: tuple) -> bool:
+    if reference != "" and order.get("reference") != reference:
+        return False
+    if order_id != "" and order["id"] != order_id:
+        return False
+    if order["status"] == "STATUS_REJECTED":
+        return True
+    if version > 0 and int(order.get("version", 0)) < version:
+        return False
+    return len(statuses) == 0 or order["status"] in statuses
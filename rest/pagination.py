@@ -59,13 +59,15 @@
 #  For full details see the REST Reference API docs at https://docs.vega.xyz
 
 import json
-import requests
 import helpers
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 ###############################################################################
 #                    A S C E N D I N G   P A G I N A T I O N                  #
 ###############################################################################
@@ -78,7 +80,7 @@ page_size = 50
 # Request a list of the first trades for a market, limit page size to `50` results (default is 1000)
 url = f"{data_node_url_rest}/trades?marketId={market_id}" \
       f"&pagination.first={page_size}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Trades filtered by market (first 50 asc):\n{}".format(
@@ -107,7 +109,7 @@ url = f"{data_node_url_rest}/trades?marketId={market_id}" \
       f"&pagination.first={page_size}" \
       f"&pagination.after={endCursor}" \
 
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Trades filtered by market (next page, asc):\n{}".format(
@@ -124,7 +126,7 @@ page_size = 25
 # Request a list of the last trades for a market, limit page size to `25` results (default is 1000)
 url = f"{data_node_url_rest}/trades?marketId={market_id}" \
       f"&pagination.last={page_size}"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Trades filtered by market (last 25, desc):\n{}".format(
@@ -150,10 +152,47 @@ url = f"{data_node_url_rest}/trades?marketId={market_id}" \
       f"&pagination.last={page_size}" \
       f"&pagination.before={endCursor}" \
 
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Trades filtered by market (next page, desc):\n{}".format(
     json.dumps(response_json, indent=2, sort_keys=True)
 ))
 # :get_trades_by_market_basic_pagination_desc_next_page__
+
+###############################################################################
+#                  P A G I N A T I O N   I T E R A T O R                      #
+###############################################################################
+
+# For large result sets helpers.paginate() walks every page lazily, yielding
+# one node at a time and holding only a single page in memory. It works with
+# any list endpoint, pass the endpoint, the connection key and any filters.
+
+# __get_trades_by_market_paginate:
+# Iterate all trades for a market, 500 results per request
+total = 0
+for trade in helpers.paginate("/trades", "trades", {"marketId": market_id}, page_size=500):
+    total += 1
+print(f"Trades iterated for market {market_id}: {total}")
+
+# Iterate backwards (pagination.last/before) over a party's ledger entries
+party_id = helpers.env_party_id()
+for entry in helpers.paginate(
+    "/ledgerentry/history",
+    "ledgerEntries",
+    {"filter.accountFromFilter.partyIds": [party_id]},
+    page_size=100,
+    backward=True,
+):
+    print(entry)
+    break
+# :get_trades_by_market_paginate__
+
+# __get_trades_by_market_paginate_prefetch:
+# Export full trade history with up to 4 pages read ahead on a background thread,
+# so the next request is already in flight while the current page is processed
+total = 0
+for trade in helpers.paginate("/trades", "trades", {"marketId": market_id}, prefetch=4):
+    total += 1
+print(f"Trades exported for market {market_id}: {total}")
+# :get_trades_by_market_paginate_prefetch__
@@ -0,0 +1,138 @@
+import concurrent.futures
+import os
+import threading
+import urllib.parse
+import helpers
+
+# Room left in each URL for the pagination parameters added per page
+_PAGINATION_RESERVE = 256
+
+
+def chunk_parties(
+    url: str, party_param: str, party_ids: list, params: dict = None, max_url_length: int = 8000
+) -> list:
+    """
+    Split party ids into chunks that each fit in one request to url, with
+    the ids as repeated party_param values next to params, in at most
+    max_url_length characters.
+    """
+    base = len(url) + 1 + len(urllib.parse.urlencode(params or {}, doseq=True))
+    room = max_url_length - _PAGINATION_RESERVE - base
+    chunks = []
+    chunk, length = [], 0
+    for party_id in party_ids:
+        size = len(urllib.parse.urlencode({party_param: party_id})) + 1
+        if size > room:
+            raise Exception(f"URL too long for party id {party_id}: {url}")
+        if chunk and length + size > room:
+            chunks.append(chunk)
+            chunk, length = [], 0
+        chunk.append(party_id)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class PartyBatcher:
+    """
+    Accounts, positions and margin levels of many parties in as few
+    requests as possible, returned per party.
+
+    /accounts and /positions accept repeated filter.partyIds, so party ids
+    are packed into as many per request as fit in max_url_length, and the
+    chunks are paged concurrently on `workers` threads. /margin/levels only
+    accepts one partyId, so when markets are given it is read once per
+    market for every party instead, and filtered to the parties asked for.
+
+        batcher = PartyBatcher()
+        accounts = batcher.accounts(party_ids)
+        accounts[party_id]  # list of account nodes, empty if it has none
+
+    `requests` counts the pages requested.
+    """
+
+    def __init__(self, workers: int = 0, max_url_length: int = 0):
+        if workers <= 0:
+            workers = int(os.getenv("DATA_NODE_POOL_SIZE", "10"))
+        if max_url_length <= 0:
+            max_url_length = int(os.getenv("DATA_NODE_MAX_URL_LENGTH", "8000"))
+        self.workers = workers
+        self.max_url_length = max_url_length
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def accounts(self, party_ids: list, filters: dict = None) -> dict:
+        """
+        Return the accounts of each party, e.g. with filters
+        {"filter.accountTypes": ["ACCOUNT_TYPE_GENERAL"]}.
+        """
+        return self.fetch("/accounts", "accounts", party_ids, "filter.partyIds", "owner", filters)
+
+    def positions(self, party_ids: list, market_ids: list = None) -> dict:
+        """
+        Return the positions of each party, optionally only on some markets.
+        """
+        filters = {"filter.marketIds": market_ids} if market_ids else None
+        return self.fetch("/positions", "positions", party_ids, "filter.partyIds", "partyId", filters)
+
+    def margin_levels(self, party_ids: list, market_ids: list = None) -> dict:
+        """
+        Return the margin levels of each party. With market_ids, one query per
+        market is made for all parties, otherwise one query per party.
+        """
+        if not market_ids:
+            return self.fetch(
+                "/margin/levels", "marginLevels", party_ids, "partyId", "partyId", max_per_request=1
+            )
+        wanted = set(party_ids)
+        queries = [{"marketId": market_id} for market_id in market_ids]
+        out = {party_id: [] for party_id in party_ids}
+        for nodes in self._map("/margin/levels", "marginLevels", queries):
+            for node in nodes:
+                if node["partyId"] in wanted:
+                    out[node["partyId"]].append(node)
+        return out
+
+    def fetch(
+        self,
+        endpoint: str,
+        key: str,
+        party_ids: list,
+        party_param: str,
+        party_field: str,
+        filters: dict = None,
+        max_per_request: int = 0,
+    ) -> dict:
+        """
+        Page a list endpoint for many parties, packing party ids as repeated
+        party_param values, and return its nodes grouped by their
+        party_field. Every party asked for is in the result.
+        """
+        party_ids = list(dict.fromkeys(party_ids))
+        url = helpers.get_from_env("DATA_NODE_URL_REST") + endpoint
+        if max_per_request > 0:
+            chunks = [party_ids[i:i + max_per_request] for i in range(0, len(party_ids), max_per_request)]
+        else:
+            chunks = chunk_parties(url, party_param, party_ids, filters, self.max_url_length)
+        queries = [{**(filters or {}), party_param: chunk} for chunk in chunks]
+        out = {party_id: [] for party_id in party_ids}
+        for nodes in self._map(endpoint, key, queries):
+            for node in nodes:
+                party_id = node.get(party_field)
+                if party_id in out:
+                    out[party_id].append(node)
+        return out
+
+    def _map(self, endpoint: str, key: str, queries: list):
+        # Yield the nodes of each query, paged concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(lambda params: self._nodes(endpoint, key, params), queries)
+
+    def _nodes(self, endpoint: str, key: str, params: dict) -> list:
+        nodes = []
+        for edges in helpers.paginate_pages(endpoint, key, params):
+            with self._lock:
+                self.requests += 1
+            nodes.extend(edge["node"] for edge in edges)
+        return nodes
@@ -0,0 +1,233 @@
+import threading
+import numpy as np
+import helpers
+
+SNAPSHOT_FIELDS = ("open_volume", "average_entry", "realised", "unrealised", "exposure", "notional")
+
+
+class PnlEngine:
+    """
+    Realised and unrealised PnL, average entry price and exposure of a set
+    of parties on every market they trade, kept current from streams.
+
+    Handlers for stream/positions, stream/trades and stream/markets/data
+    update one slot per (party, market) in NumPy arrays: positions set the
+    open volume, average entry price and realised PnL reported by the data
+    node, each fill of a party moves them on straight away, and market data
+    sets the mark price. snapshot() marks every slot to market in one
+    vectorised step. PnL, exposure and notional are in asset decimals.
+
+    A fill with a timestamp no later than the last position update of its
+    slot is already included in that update and is skipped. Fills newer
+    than a position update are replayed on top of it, so the streams may
+    arrive in any order.
+
+    Only markets added with add_markets(), or given in scales, are tracked
+    and updates for other markets are ignored, so the handlers never wait
+    on the data node. subscribe() adds its markets before the streams start.
+
+        engine = PnlEngine(party_ids)
+        engine.subscribe(manager, market_ids)
+        asyncio.run(manager.run())
+        ...
+        totals = engine.by_party()  # from another thread
+    """
+
+    def __init__(self, party_ids: list, scales: dict = None, capacity: int = 1024):
+        self.parties = {party_id: i for i, party_id in enumerate(dict.fromkeys(party_ids))}
+        self.markets = {}
+        self.slots = {}
+        self.fills = 0
+        self.skipped = 0
+        # Per slot: fills applied since its last position update
+        self._fills = {}
+        self._lock = threading.Lock()
+        # Per slot
+        self.party = np.zeros(capacity, dtype=np.int32)
+        self.market = np.zeros(capacity, dtype=np.int32)
+        self.volume = np.zeros(capacity, dtype=np.int64)
+        self.entry = np.zeros(capacity, dtype=np.float64)
+        self.realised = np.zeros(capacity, dtype=np.float64)
+        self.synced_at = np.zeros(capacity, dtype=np.int64)
+        # Per market
+        self.mark = np.full(16, np.nan)
+        self.scale = np.ones(16)
+        for market_id, scale in (scales or {}).items():
+            self._add_market(market_id, scale)
+
+    def add_markets(self, market_ids: list) -> None:
+        """
+        Track markets, looking up the notional scale of each new one from the
+        data node. Call before the streams start, it blocks on requests.
+        """
+        for market_id in market_ids:
+            if market_id not in self.markets:
+                scale = notional_scale(market_id)
+                with self._lock:
+                    self._add_market(market_id, scale)
+
+    def subscribe(self, manager, market_ids: list) -> None:
+        """
+        Add the markets, then subscribe the handlers on a StreamManager:
+        trades of all the parties and market data of all the markets on one
+        stream each, and the positions of each party on every market. The
+        number of streams grows with the parties, not the markets.
+        """
+        self.add_markets(market_ids)
+        manager.subscribe("/stream/trades", {"partyIds": list(self.parties)}, self.on_trades)
+        manager.subscribe("/stream/markets/data", {"marketIds": market_ids}, self.on_market_data)
+        for party_id in self.parties:
+            manager.subscribe(
+                "/stream/positions", {"partyId": party_id}, self.on_positions,
+                topic=f"/stream/positions/{party_id}",
+            )
+
+    def on_positions(self, topic: str, obj: dict) -> None:
+        """
+        StreamManager handler for stream/positions messages.
+        """
+        result = obj["result"]
+        positions = (
+            result.get("snapshot", {}).get("positions", [])
+            + result.get("updates", {}).get("positions", [])
+        )
+        with self._lock:
+            for position in positions:
+                if position["partyId"] not in self.parties or position["marketId"] not in self.markets:
+                    continue
+                i = self._slot(position["partyId"], position["marketId"])
+                self.volume[i] = int(position["openVolume"])
+                self.entry[i] = float(position["averageEntryPrice"])
+                self.realised[i] = float(position["realisedPnl"])
+                self.synced_at[i] = int(position.get("updatedAt") or 0)
+                for fill in self._fills.pop(i, []):
+                    self._fill(i, *fill, replay=True)
+
+    def on_trades(self, topic: str, obj: dict) -> None:
+        """
+        StreamManager handler for stream/trades messages.
+        """
+        with self._lock:
+            for trade in obj["result"].get("trades", []):
+                if trade["marketId"] not in self.markets:
+                    continue
+                price = int(trade["price"])
+                size = int(trade["size"])
+                ts = int(trade["timestamp"])
+                for party_id, signed in ((trade["buyer"], size), (trade["seller"], -size)):
+                    if party_id in self.parties:
+                        self._fill(self._slot(party_id, trade["marketId"]), price, signed, ts)
+
+    def on_market_data(self, topic: str, obj: dict) -> None:
+        """
+        StreamManager handler for stream/markets/data messages.
+        """
+        with self._lock:
+            for data in obj["result"].get("marketData", []):
+                m = self.markets.get(data["market"])
+                if m is not None and data.get("markPrice"):
+                    self.mark[m] = float(data["markPrice"])
+
+    def _fill(self, i: int, price: int, signed: int, ts: int, replay: bool = False) -> None:
+        if ts <= self.synced_at[i]:
+            self.skipped += 1
+            return
+        if not replay:
+            self.fills += 1
+        self._fills.setdefault(i, []).append((price, signed, ts))
+        volume = int(self.volume[i])
+        if volume == 0 or (volume > 0) == (signed > 0):
+            # Opening or adding: volume weighted average entry
+            self.entry[i] = (self.entry[i] * abs(volume) + price * abs(signed)) / abs(volume + signed)
+        else:
+            closed = min(abs(signed), abs(volume))
+            direction = 1 if volume > 0 else -1
+            self.realised[i] += (price - self.entry[i]) * closed * direction * self.scale[self.market[i]]
+            if abs(signed) > abs(volume):
+                self.entry[i] = price
+            elif volume + signed == 0:
+                self.entry[i] = 0.0
+        self.volume[i] = volume + signed
+
+    def _slot(self, party_id: str, market_id: str) -> int:
+        i = self.slots.get((party_id, market_id))
+        if i is None:
+            i = len(self.slots)
+            if i == len(self.volume):
+                for name in ("party", "market", "volume", "entry", "realised", "synced_at"):
+                    array = getattr(self, name)
+                    setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+            self.slots[(party_id, market_id)] = i
+            self.party[i] = self.parties[party_id]
+            self.market[i] = self.markets[market_id]
+        return i
+
+    def _add_market(self, market_id: str, scale: float) -> None:
+        m = len(self.markets)
+        if m == len(self.mark):
+            self.mark = np.concatenate((self.mark, np.full(m, np.nan)))
+            self.scale = np.concatenate((self.scale, np.ones(m)))
+        self.markets[market_id] = m
+        self.scale[m] = scale
+
+    def snapshot(self) -> dict:
+        """
+        Mark every slot to market, returning arrays for each field in
+        SNAPSHOT_FIELDS plus "party_id", "market_id" and "party", the index
+        of the party in `parties`, one entry per slot.
+        Slots of markets without a mark price yet have NaN unrealised PnL.
+        """
+        with self._lock:
+            n = len(self.slots)
+            volume = self.volume[:n].astype(np.float64)
+            entry = self.entry[:n].copy()
+            realised = self.realised[:n].copy()
+            market = self.market[:n].copy()
+            party = self.party[:n].copy()
+            mark = self.mark[market]
+            scale = self.scale[market]
+            keys = list(self.slots)
+        notional = volume * mark * scale
+        return {
+            "party_id": np.array([party_id for party_id, _ in keys], dtype=object),
+            "market_id": np.array([market_id for _, market_id in keys], dtype=object),
+            "party": party,
+            "open_volume": volume,
+            "average_entry": entry,
+            "realised": realised,
+            "unrealised": (mark - entry) * volume * scale,
+            "exposure": np.abs(notional),
+            "notional": notional,
+        }
+
+    def by_party(self) -> dict:
+        """
+        Return the realised and unrealised PnL, gross exposure and net
+        notional of each party summed over its markets.
+        """
+        snapshot = self.snapshot()
+        party = snapshot["party"]
+        totals = {
+            field: np.bincount(party, np.nan_to_num(snapshot[field]), minlength=len(self.parties))
+            for field in ("realised", "unrealised", "exposure", "notional")
+        }
+        return {
+            party_id: {field: float(values[i]) for field, values in totals.items()}
+            for party_id, i in self.parties.items()
+        }
+
+
+def notional_scale(market_id: str) -> float:
+    """
+    Return the factor from price x size, in market and position decimals, to
+    an amount in the market's settlement asset decimals.
+    """
+    data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+    market = helpers.get_cached(f"{data_node_url_rest}/market/{market_id}")["market"]
+    asset_id = helpers.settlement_asset(market)
+    asset = helpers.get_cached(f"{data_node_url_rest}/asset/{asset_id}")["asset"]
+    return 10.0 ** (
+        int(asset["details"]["decimals"])
+        - int(market["decimalPlaces"])
+        - int(market.get("positionDecimalPlaces", 0))
+    )
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                     P O R T F O L I O   S N A P S H O T                     #
+###############################################################################
+
+#  How to get accounts, positions and margin levels for many parties:
+#  ----------------------------------------------------------------------
+#  PartyBatcher (see party_batch.py) packs as many party ids as fit in a
+#  URL into each /accounts and /positions request, with repeated
+#  filter.partyIds, and pages the chunks concurrently. Margin levels are
+#  read once per market for all parties. Results are returned per party.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import itertools
+import time
+import helpers
+from party_batch import PartyBatcher
+
+# Load Vega market id
+market_id = helpers.env_market_id()
+assert market_id != ""
+
+# Snapshot the first 5000 parties known to the data node
+party_ids = [
+    party["id"] for party in itertools.islice(helpers.paginate("/parties", "parties"), 5000)
+]
+print(f"Parties: {len(party_ids)}")
+
+###############################################################################
+#                  S N A P S H O T   M A N Y   P A R T I E S                  #
+###############################################################################
+
+# __portfolio_snapshot:
+# Request accounts, positions and margin levels of every party in chunks
+batcher = PartyBatcher()
+start = time.perf_counter()
+accounts = batcher.accounts(party_ids)
+positions = batcher.positions(party_ids)
+margin_levels = batcher.margin_levels(party_ids, [market_id])
+elapsed = time.perf_counter() - start
+print(f"Snapshot of {len(party_ids)} parties in {batcher.requests} requests, {elapsed:.2f}s")
+for party_id in party_ids[:5]:
+    print(
+        f"{party_id}: {len(accounts[party_id])} account(s), "
+        f"{len(positions[party_id])} position(s), {len(margin_levels[party_id])} margin level(s)"
+    )
+# :portfolio_snapshot__
@@ -2,15 +2,18 @@
 
 import json
 import time
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
-from login import token, pubkey
+from login import wallet, pubkey
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega wallet server URL, set in same way as above
 wallet_server_url = helpers.get_from_env("WALLET_SERVER_URL")
 
@@ -23,15 +26,14 @@ WAIT_FOR_MARKET_AFTER_VOTE = True
 
 # __get_assets:
 # Request a list of assets available and select the first one
+# The asset list rarely changes, so it is read through the response cache
 url = f"{data_node_url_rest}/assets"
-response = requests.get(url)
-helpers.check_response(response)
+assets = helpers.get_cached(url)["assets"]["edges"]
 # :get_assets__
 
 # __find_asset:
 # Find settlement asset with name tDAI
 found_asset_id = None
-assets = response.json()["assets"]["edges"]
 for asset in assets:
     if asset["node"]["details"]["symbol"] == "tDAI":
         print("Found an asset with symbol tDAI")
@@ -63,7 +65,7 @@ if vote_asset_id is None:
 
 # Request governance stake/voting balance
 url = f"{data_node_url_rest}/parties/{pubkey}/stake"
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 voting_balance = response.json()["currentStakeAvailable"]
 if voting_balance == 0:
@@ -79,7 +81,7 @@ print(voting_balance)
 
 # __get_time:
 # Request the current blockchain time, and convert to time in seconds
-response = requests.get(f"{data_node_url_rest}/vega/time")
+response = session.get(f"{data_node_url_rest}/vega/time")
 helpers.check_response(response)
 blockchain_time = int(response.json()["timestamp"])
 blockchain_time_seconds = int(blockchain_time / 1e9)  # Seconds precision
@@ -241,34 +243,12 @@ new_market = {
 
 # __sign_tx_proposal:
 # Sign the transaction with a proposal submission command
-url = "http://localhost:1789/api/v2/requests"
-
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": new_market
-    }
-}
-
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
+sent = wallet.send_transaction(pubkey, new_market)
 
-response = requests.request("POST", url, headers=headers, data=payload)
-
-print(response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 # :sign_tx_proposal__
 
-print(json.dumps(response.json(), indent=4, sort_keys=True))
+print(json.dumps(sent.result, indent=4, sort_keys=True))
 print()
 print("Signed new market proposal and sent to Vega")
 
@@ -277,11 +257,11 @@ print("Waiting for blockchain...", end="", flush=True)
 proposal_id = None
 
 url = f"{data_node_url_rest}/governances?proposerPartyId={pubkey}&proposalReference={proposal_ref}"
-response = requests.get(url)
+response = session.get(url)
 while helpers.check_nested_response(response, "connection") is not True:
     time.sleep(0.5)
     print(".", end="", flush=True)
-    response = requests.get(url)
+    response = session.get(url)
     continue
 
 found_proposal = helpers.get_nested_response(response, "connection")[0]["node"]["proposal"]
@@ -319,34 +299,12 @@ vote = {
 
 # __sign_tx_vote:
 # Sign the vote command
-url = "http://localhost:1789/api/v2/requests"
-
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": vote
-    }
-}
-
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
-
-response = requests.request("POST", url, headers=headers, data=payload)
+sent = wallet.send_transaction(pubkey, vote)
 
-print(response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 # :sign_tx_vote__
 
-print(json.dumps(response.json(), indent=4, sort_keys=True))
+print(json.dumps(sent.result, indent=4, sort_keys=True))
 
 print()
 print("Signed vote on proposal and sent to Vega")
@@ -356,7 +314,7 @@ while True:
     time.sleep(0.5)
     print(".", end="", flush=True)
     url = f"{data_node_url_rest}/governances?proposerPartyId={pubkey}&proposalReference={proposal_ref}"
-    response = requests.get(url)
+    response = session.get(url)
 
     found_proposal = helpers.get_nested_response(response, "connection")[0]["node"]["proposal"]
     proposal_id = found_proposal["id"]
@@ -391,7 +349,7 @@ while True:
     time.sleep(0.5)
     print(".", end="", flush=True)
     url = f"{data_node_url_rest}/markets"
-    response = requests.get(url)
+    response = session.get(url)
     if response.status_code != 200:
         continue
 
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                     R E C O R D   M A R K E T   D A T A                     #
+###############################################################################
+
+#  How to record market data of every market for later analysis:
+#  ----------------------------------------------------------------------
+#  MarketDataRecorder (see market_data_recorder.py) keeps the numeric
+#  fields of each stream/markets/data update as a fixed-width record and
+#  appends them to one file per market. Recorded ticks are memory-mapped
+#  as NumPy arrays, so they can be sliced by time with no parsing, also
+#  while the recorder is still running.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import asyncio
+import os
+import time
+import helpers
+from market_data_recorder import MarketDataRecorder, TRADING_MODES, load_ticks
+from stream_manager import StreamManager
+
+# Directory for the tick files, kept between runs
+ticks_dir = os.getenv("MARKET_DATA_DIR", "market-data")
+
+# Record every market on the network
+market_ids = [market["id"] for market in helpers.paginate("/markets", "markets")]
+print(f"Markets: {len(market_ids)}")
+
+###############################################################################
+#                      R E C O R D   T H E   S T R E A M                      #
+###############################################################################
+
+# __record_market_data:
+# Record market data of all markets for 60 seconds on one stream
+recorder = MarketDataRecorder(ticks_dir)
+manager = StreamManager()
+manager.subscribe("/stream/markets/data", {"marketIds": market_ids}, recorder.on_message)
+asyncio.run(manager.run(timeout=60))
+recorder.close()
+print(f"Recorded {recorder.recorded} tick(s)")
+# :record_market_data__
+
+###############################################################################
+#                    Q U E R Y   T H E   R E C O R D I N G                    #
+###############################################################################
+
+# __query_market_data:
+# Memory-map each market's ticks and summarise the last hour
+end_ts = time.time_ns()
+for market_id in market_ids:
+    ticks = load_ticks(ticks_dir, market_id, end_ts - 3600 * 1000000000, end_ts)
+    if len(ticks) == 0:
+        continue
+    mark = ticks["mark_price"]
+    spread = ticks["best_offer_price"] - ticks["best_bid_price"]
+    mode = TRADING_MODES[ticks["trading_mode"][-1]] if ticks["trading_mode"][-1] >= 0 else "unknown"
+    print(
+        f"{market_id}: {len(ticks)} tick(s), mark {mark.min()} - {mark.max()}, "
+        f"mean spread {spread.mean():.1f}, now {mode}"
+    )
+# :query_market_data__
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                  S T R E A M   C A N D L E S   ( L O C A L )                #
+###############################################################################
+
+#  How to build candles for many markets and intervals from trades:
+#  ----------------------------------------------------------------------
+#  CandleBuilder (see candle_builder.py) aggregates trades into OHLCV
+#  candles for any intervals, e.g. 1s, 1m, 5m or a number of seconds, with
+#  no /candle/intervals lookup or candle subscription per interval. It is
+#  backfilled from /trades over a date range and then kept current from a
+#  single stream/trades subscription per market.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import asyncio
+import datetime
+import helpers
+from candle_builder import CandleBuilder
+from stream_manager import StreamManager
+
+# Load Vega market id
+market_id = helpers.env_market_id()
+assert market_id != ""
+
+intervals = ["1s", "1m", "5m", 900]
+
+# __build_candles_local:
+# Backfill the last hour of trades, then stream new trades for 30 seconds
+builder = CandleBuilder(intervals)
+now = datetime.datetime.now(datetime.timezone.utc)
+end_ts = int(now.timestamp() * 1e9)
+start_ts = int((now - datetime.timedelta(hours=1)).timestamp() * 1e9)
+backfilled = builder.backfill(market_id, start_ts, end_ts)
+print(f"Backfilled {backfilled} trade(s)")
+
+manager = StreamManager()
+manager.subscribe("/stream/trades", {"marketId": market_id}, builder.on_message)
+asyncio.run(manager.run(timeout=30))
+# :build_candles_local__
+
+for interval in intervals:
+    candles = builder.candles(market_id, interval)
+    print(f"{interval}: {len(candles['start'])} candle(s), latest {builder.latest(market_id, interval)}")
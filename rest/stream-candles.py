@@ -16,8 +16,8 @@
 import websocket
 import threading
 import json
-import requests
 import helpers
+from stream_decoder import StreamDecoder
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -33,15 +33,15 @@ assert market_id != ""
 
 # __get_candle_intervals:
 # Request a list of candle intervals available for a market and select a candle id
+# The intervals of a market rarely change, so they are read through the response cache
 url = f"{data_node_url_rest}/candle/intervals?marketId={market_id}"
-response = requests.get(url)
-helpers.check_response(response)
+intervals = helpers.get_cached(url)
 print("Candle intervals for market:\n{}".format(
-    json.dumps(response.json(), indent=2, sort_keys=True)))
+    json.dumps(intervals, indent=2, sort_keys=True)))
 # :get_candle_intervals__
 
 # Find the first candle id in the list e.g. trades_candle_5_minutes_<market_id> etc
-candle_id = response.json()["intervalToCandleId"][0]["candleId"]
+candle_id = intervals["intervalToCandleId"][0]["candleId"]
 assert candle_id != ""
 print(f"Candle found: {candle_id}")
 
@@ -49,27 +49,20 @@ print(f"Candle found: {candle_id}")
 #  Hint: to include/filter data from a party add the param `partyId`
 #  e.g. ?marketIds=xxx&partyId=yyy
 url = f"{data_node_url_rest}/stream/candle/data?candleId={candle_id}".replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 # __stream_candles_by_market:
 # Request a stream of candle updates for a market id and time bucket (e.g. candle id) on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "candle" in obj["result"]:
             # When a new candle update arrives print the changes
             print(f"Candle data found:")
             print(obj["result"]["candle"])
-    else:
-        res.append(line)
 
 
 def on_error(wsa, error):
@@ -16,8 +16,8 @@
 
 import websocket
 import threading
-import json
 import helpers
+from stream_decoder import StreamDecoder
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -25,26 +25,19 @@ data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
 
 # Connect to the data node with a WSS based endpoint, this is not a HTTPS:// url
 url = f"{data_node_url_rest}/stream/governance".replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 # __stream_governance:
 # Request a stream of governance data on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "governance" in obj["result"]:
             print(f"Governance data found:")
             print(obj["result"]["governance"])
-    else:
-        res.append(line)
 
     print(line)
 
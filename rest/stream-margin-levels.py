@@ -17,8 +17,8 @@
 
 import websocket
 import threading
-import json
 import helpers
+from stream_decoder import StreamDecoder
 
 # Vega wallet interaction helper, see login.py for detail
 from login import pubkey
@@ -35,27 +35,20 @@ assert market_id != ""
 #  e.g. ?marketId=xxx&partyId=yyy
 url = f"{data_node_url_rest}/stream/margin/levels?partyId={pubkey}&marketId={market_id}"\
     .replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 # __stream_margin_levels:
 # Request a stream of margin level updates for a party and market id on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "marginLevels" in obj["result"]:
             # Result contains margin level update for party on a market
             print(f"Margin level data found:")
             print(obj["result"]["marginLevels"])
-    else:
-        res.append(line)
 
 
 def on_error(wsa, error):
@@ -15,8 +15,8 @@
 
 import websocket
 import threading
-import json
 import helpers
+from stream_decoder import StreamDecoder
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -30,28 +30,21 @@ assert market_id != ""
 #  Hint: to include data from multiple markets repeat the param `marketIds`
 #  e.g. marketIds=xxx&marketIds=yyy&marketIds=zzz
 url = f"{data_node_url_rest}/stream/markets/data?marketIds={market_id}".replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 # __stream_market_data_by_markets:
 # Request a stream of live market data for one or more market ids on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "marketData" in obj["result"]:
             # Result contains each market-data update (may be multiple)
             found_market = obj["result"]["marketData"][0]["market"]
             print(f"Market data found for {found_market}:")
             print(obj["result"]["marketData"])
-    else:
-        res.append(line)
 
 def on_error(wsa, error):
     print(error)
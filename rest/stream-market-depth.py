@@ -19,8 +19,8 @@
 
 import websocket
 import threading
-import json
 import helpers
+from stream_decoder import StreamDecoder
 
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
@@ -35,7 +35,7 @@ assert market_id != ""
 #  Hint: to include data from multiple markets repeat the param `marketIds`
 #  e.g. marketIds=xxx&marketIds=yyy&marketIds=zzz
 url = f"{data_node_url_rest}/stream/markets/depth?marketIds={market_id}".replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 print(url)
@@ -44,21 +44,14 @@ print(url)
 # Request a stream of live market depth data for one or more market ids on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "marketDepth" in obj["result"]:
             # Result contains each market-depth update (may be multiple)
             found_market = obj["result"]["marketDepth"][0]["marketId"]
             print(f"Market depth data found for {found_market}:")
             print(obj["result"]["marketDepth"][0])
-    else:
-        res.append(line)
 
 
 def on_error(wsa, error):
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                 S T R E A M   M U L T I P L E   F E E D S                   #
+###############################################################################
+
+#  How to stream many feeds from a Data Node in a single process and thread:
+#  ----------------------------------------------------------------------
+#  StreamManager (see stream_manager.py) runs every subscription on one
+#  asyncio event loop and routes each decoded message to the handler of its
+#  topic. Add as many subscriptions as needed, each one is a websocket
+#  connection rather than a thread and a WebSocketApp.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import asyncio
+import helpers
+from stream_manager import StreamManager
+
+# Load Vega market id
+market_id = helpers.env_market_id()
+assert market_id != ""
+
+
+def on_trades(topic, obj):
+    if "trades" in obj["result"]:
+        print(f"[{topic}] {len(obj['result']['trades'])} trade(s)")
+
+
+def on_orders(topic, obj):
+    if "snapshot" in obj["result"]:
+        print(f"[{topic}] snapshot of {len(obj['result']['snapshot']['orders'])} order(s)")
+    if "updates" in obj["result"]:
+        print(f"[{topic}] {len(obj['result']['updates']['orders'])} order update(s)")
+
+
+def on_depth_update(topic, obj):
+    if "update" in obj["result"]:
+        update = obj["result"]["update"][0]
+        print(f"[{topic}] sequence {update['sequenceNumber']}, "
+              f"{len(update.get('buy', []))} buy and {len(update.get('sell', []))} sell level(s)")
+
+
+def on_market_data(topic, obj):
+    if "marketData" in obj["result"]:
+        print(f"[{topic}] mark price {obj['result']['marketData'][0]['markPrice']}")
+
+
+# __stream_multiple:
+# Subscribe to several feeds for a market and run them all for 30 seconds
+manager = StreamManager()
+manager.subscribe("/stream/trades", {"marketId": market_id}, on_trades)
+manager.subscribe("/stream/orders", {"marketId": market_id}, on_orders)
+manager.subscribe("/stream/markets/depth/updates", {"marketIds": market_id}, on_depth_update)
+manager.subscribe("/stream/markets/data", {"marketIds": market_id}, on_market_data)
+asyncio.run(manager.run(timeout=30))
+# :stream_multiple__
+
+for subscription in manager.subscriptions.values():
+    print(f"{subscription.topic}: {subscription.messages} message(s), "
+          f"{subscription.connects} connection(s)")
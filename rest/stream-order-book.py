@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                     S T R E A M   O R D E R   B O O K                       #
+###############################################################################
+
+#  How to maintain a local order book from a Data Node stream:
+#  ----------------------------------------------------------------------
+#  OrderBook (see order_book.py) is seeded from /market/depth/{id}/latest
+#  and applies each stream/markets/depth/updates message in sequence. If an
+#  update is missed the gap is detected from its previousSequenceNumber and
+#  the book is resynced from the latest market depth.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import asyncio
+import helpers
+from order_book import OrderBook
+from stream_manager import StreamManager
+
+# Load Vega market id
+market_id = helpers.env_market_id()
+assert market_id != ""
+
+# __stream_order_book:
+# Seed the book, then apply depth updates for 30 seconds
+book = OrderBook(market_id)
+book.resync()
+
+
+async def on_depth_update(topic, obj):
+    await book.on_message(topic, obj)
+    print(f"Sequence {book.sequence}: best bid {book.best_bid()}, best ask {book.best_ask()}")
+
+
+manager = StreamManager()
+manager.subscribe("/stream/markets/depth/updates", {"marketIds": market_id}, on_depth_update)
+asyncio.run(manager.run(timeout=30))
+# :stream_order_book__
+
+print("Top 5 levels (price, volume, orders):")
+print(book.top(5))
+print(f"Updates applied: {book.updates}, gaps: {book.gaps}, resyncs: {book.resyncs}")
@@ -18,8 +18,8 @@
 
 import websocket
 import threading
-import json
 import helpers
+from stream_decoder import StreamDecoder
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -33,21 +33,16 @@ assert market_id != ""
 #  Hint: to include/filter data from a party add the param `partyId`
 #  e.g. ?marketIds=xxx&partyId=yyy
 url = f"{data_node_url_rest}/stream/orders?marketId={market_id}".replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 # __stream_orders_by_market:
 # Request a stream of live orders and updates for a market id on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "snapshot" in obj["result"]:
             # An 'initial image' snapshot containing current live orders (may be multiple pages)
             print("Snapshot found:")
@@ -56,8 +51,6 @@ def on_message(wsa, line):
             # A list of order updates typically from the last block
             print("Updates found:")
             print(obj["result"]["updates"])
-    else:
-        res.append(line)
 
 
 def on_error(wsa, error):
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                             S T R E A M   P N L                             #
+###############################################################################
+
+#  How to follow PnL and exposure of many parties live:
+#  ----------------------------------------------------------------------
+#  PnlEngine (see pnl_engine.py) keeps open volume, average entry price and
+#  realised PnL per party and market from stream/positions, applies each
+#  fill from stream/trades as soon as it is streamed, and marks every
+#  position to market against stream/markets/data in one NumPy step.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import asyncio
+import os
+import helpers
+from pnl_engine import PnlEngine
+from stream_manager import StreamManager
+
+# Parties to follow, a comma separated list in PARTY_IDS or the configured party
+party_ids = [p for p in os.getenv("PARTY_IDS", "").split(",") if p != ""]
+if len(party_ids) == 0:
+    party_ids = [helpers.env_party_id()]
+assert party_ids[0] != ""
+
+# Follow every market that can still trade, settled and closed markets have
+# no open positions left to mark
+TRADING_STATES = ("STATE_ACTIVE", "STATE_SUSPENDED", "STATE_SUSPENDED_VIA_GOVERNANCE")
+market_ids = [
+    market["id"] for market in helpers.paginate("/markets", "markets")
+    if market["state"] in TRADING_STATES
+]
+
+###############################################################################
+#                      L I V E   P N L   B Y   P A R T Y                      #
+###############################################################################
+
+# __stream_pnl:
+# Subscribe the engine and print the totals of each party every second
+engine = PnlEngine(party_ids)
+manager = StreamManager()
+engine.subscribe(manager, market_ids)
+
+
+async def report(seconds: int) -> None:
+    for _ in range(seconds):
+        await asyncio.sleep(1)
+        for party_id, totals in engine.by_party().items():
+            print(
+                f"{party_id}: realised {totals['realised']:.0f}, "
+                f"unrealised {totals['unrealised']:.0f}, exposure {totals['exposure']:.0f}"
+            )
+
+
+async def main() -> None:
+    await asyncio.gather(manager.run(timeout=30), report(30))
+
+asyncio.run(main())
+print(f"Fills applied: {engine.fills}, already in a position update: {engine.skipped}")
+# :stream_pnl__
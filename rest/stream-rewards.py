@@ -17,8 +17,8 @@
 
 import websocket
 import threading
-import json
 import helpers
+from stream_decoder import StreamDecoder
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -36,27 +36,20 @@ assert party_id != ""
 #  Hint: to include/filter data from a party add the param `partyId`
 #  e.g. ?assetId=xxx&partyId=yyy
 url = f"{data_node_url_rest}/stream/rewards?partyId={party_id}".replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 # __stream_rewards:
 # Request a stream of rewards on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "reward" in obj["result"]:
             # Result contains reward data for party
             print(f"Reward data found:")
             print(obj["result"]["reward"])
-    else:
-        res.append(line)
 
 
 def on_error(wsa, error):
@@ -17,8 +17,8 @@
 
 import websocket
 import threading
-import json
 import helpers
+from stream_decoder import StreamDecoder
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
@@ -32,27 +32,20 @@ assert party_id != ""
 #  Hint: to include/filter data from a proposal id add the param `proposalId`
 #  e.g. ?partyId=xxx&proposalId=yyy
 url = f"{data_node_url_rest}/stream/votes?partyId={party_id}".replace("https://", "wss://")
-res = []
+decoder = StreamDecoder()
 event = threading.Event()
 
 # __stream_votes_by_party:
 # Request a stream of votes for a party id on a Vega network
 
 def on_message(wsa, line):
-    # Vega data-node v2 returns the json line by line so we need to wait
-    # for a full structure before we can parse to valid JSON in python
-    if line == "{":
-        del res[:]
-        res.append(line)
-    elif line == "}":
-        res.append(line)
-        obj = json.loads(''.join(res))
+    # Vega data-node v2 returns the json line by line, the decoder buffers
+    # lines until a full structure has arrived and then parses it once
+    for obj in decoder.feed(line):
         if "vote" in obj["result"]:
             # Result contains reward data for party
             print(f"Vote data found:")
             print(obj["result"]["vote"])
-    else:
-        res.append(line)
 
 
 def on_error(wsa, error):
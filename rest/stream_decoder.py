@@ -0,0 +1,217 @@
+import json
+import re
+
+# Whole strings, brackets, or the opening quote of a string cut off by the end
+# of the text. Strings are matched whole so brackets inside them are skipped.
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"')
+
+# The rest of a string continued from earlier text, up to its closing quote
+_STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"')
+
+# A closing bracket followed by an opening one, outside of strings this only
+# happens between documents sent back to back
+_BACK_TO_BACK = re.compile(r'[}\]]\s*[{\[]')
+
+_WHITESPACE = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+class StreamDecoder:
+    """
+    Incrementally decode JSON objects from a stream of websocket frames.
+
+    The data node may send each document whole, split over many frames (for
+    example one line per frame) or several documents back to back. Frames are
+    buffered as they arrive and only scanned when one ends in a closing
+    bracket and enough of them have arrived for a document to be complete.
+    Nesting is tracked across scans, ignoring brackets inside strings, and
+    each document is decoded exactly once. The buffer is reused between
+    documents.
+
+    A frame that starts a document and ends in a newline is decoded one line
+    at a time, as whole documents, and only goes to the scanner if a line
+    fails to decode. Once a document has arrived one line per frame, starting
+    and ending on a frame holding only a bracket, indented frames are
+    buffered without being looked at and the buffer is decoded on a closing
+    bracket at the root level, as the stream scripts used to. Any other
+    frame goes back to scanning on every closing bracket.
+
+    A malformed document raises ValueError and resets the decoder, dropping
+    anything else buffered, so the documents that follow still decode.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._scanned = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._lines = False
+
+    def reset(self) -> None:
+        """
+        Drop any partially received document, e.g. after a reconnect.
+        """
+        del self._pending[:]
+        self._scanned = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, data: str) -> list:
+        """
+        Add a frame and return the documents it completed, in order.
+        """
+        try:
+            if self._lines:
+                if data[:1] == " " and self._pending:
+                    self._pending.append(data)
+                    return []
+                if not self._pending:
+                    if data.strip() in ("{", "["):
+                        self._pending.append(data)
+                        return []
+                elif data == "}" or data == "]":
+                    self._pending.append(data)
+                    return self._decode_lines()
+                # Not an indented document sent one line per frame
+                self._lines = False
+            elif not self._pending and data[-1:] == "\n":
+                decoded = self._decode_newline_delimited(data)
+                if decoded is not None:
+                    return decoded
+            self._pending.append(data)
+            last = data[-1:]
+            if last.isspace():
+                last = data.rstrip()[-1:]
+            if last != "}" and last != "]":
+                return []
+            return self._scan()
+        except ValueError:
+            self.reset()
+            self._lines = False
+            raise
+
+    def _decode_newline_delimited(self, data: str):
+        # A frame ending in a newline usually holds whole documents, one per
+        # line. Anything else (one that fails to decode) goes to the scanner.
+        try:
+            return [json.loads(line) for line in data.splitlines()
+                    if line and not line.isspace()]
+        except ValueError:
+            return None
+
+    def _scan(self) -> list:
+        chunk = "".join(self._pending[self._scanned:])
+        # The depth can only reach zero once at least as many closing brackets
+        # as the depth at the last scan have arrived
+        if chunk.count("}") + chunk.count("]") < self._depth:
+            return []
+        if not self._in_string and "\\" not in chunk:
+            # Without escapes every other quote starts a string, so the
+            # brackets outside of strings can be counted directly
+            parts = chunk.split('"')
+            if len(parts) % 2:
+                bare = "".join(parts[::2])
+                closes = bare.count("}") + bare.count("]")
+                depth = self._depth + bare.count("{") + bare.count("[") - closes
+                if closes < self._depth:
+                    self._depth = depth
+                    self._scanned = len(self._pending)
+                    return []
+                if _BACK_TO_BACK.search(bare) is not None:
+                    # A document ends before the end of the chunk, several
+                    # were sent back to back
+                    return self._decode_many("".join(self._pending))
+                # Otherwise the depth can only reach zero at the very end
+                if depth > 0:
+                    self._depth = depth
+                    self._scanned = len(self._pending)
+                    return []
+                if depth == 0:
+                    decoded = [json.loads("".join(self._pending))]
+                    self._lines = (self._pending[0].strip() in ("{", "[")
+                                   and self._pending[-1] in ("}", "]"))
+                    self.reset()
+                    return decoded
+
+        text = "".join(self._pending)
+        return self._scan_tokens(text, len(text) - len(chunk))
+
+    def _decode_lines(self) -> list:
+        # Inside an indented document only the closing bracket of the root is
+        # not indented, so the buffer holds exactly one document
+        try:
+            decoded = [json.loads("".join(self._pending))]
+        except ValueError:
+            # Not a document sent one line per frame after all
+            self._lines = False
+            return self._scan()
+        self.reset()
+        return decoded
+
+    def _decode_many(self, text: str) -> list:
+        # The buffer always starts at the beginning of a document, so whole
+        # documents can be decoded back to back until one is incomplete
+        decoded = []
+        pos = 0
+        end = len(text)
+        while True:
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos == end or text[pos] not in "{[":
+                break
+            try:
+                document, pos = _DECODER.raw_decode(text, pos)
+            except ValueError:
+                break
+            decoded.append(document)
+
+        self.reset()
+        if pos < end:
+            decoded.extend(self._scan_tokens(text[pos:], 0))
+        return decoded
+
+    def _scan_tokens(self, text: str, pos: int) -> list:
+        decoded = []
+        start = 0
+        if self._in_string:
+            if self._escaped:
+                # The previous scan ended on a backslash inside a string
+                self._escaped = False
+                pos += 1
+            match = _STRING_END.match(text, pos)
+            if match is None:
+                self._end_in_string(text, pos)
+                pos = len(text)
+            else:
+                self._in_string = False
+                pos = match.end()
+
+        if not self._in_string:
+            for match in _TOKEN.finditer(text, pos):
+                token = match.group()
+                if token == "{" or token == "[":
+                    self._depth += 1
+                elif token == "}" or token == "]":
+                    if self._depth > 0:
+                        self._depth -= 1
+                        if self._depth == 0:
+                            end = match.end()
+                            decoded.append(json.loads(text[start:end]))
+                            start = end
+                elif token == '"':
+                    self._end_in_string(text, match.end())
+                    break
+
+        del self._pending[:]
+        if (self._depth > 0 or self._in_string) and start < len(text):
+            self._pending.append(text[start:])
+        self._scanned = len(self._pending)
+        return decoded
+
+    def _end_in_string(self, text: str, pos: int) -> None:
+        # The text ends inside a string, if it ends on an odd number of
+        # backslashes the next character received is escaped
+        tail = text[pos:]
+        self._in_string = True
+        self._escaped = (len(tail) - len(tail.rstrip("\\"))) % 2 == 1
@@ -0,0 +1,125 @@
+import asyncio
+import inspect
+import aiohttp
+import helpers
+from async_client import encode_params
+from stream_decoder import StreamDecoder
+from typing import Any, Callable
+
+
+class Subscription:
+    """
+    One data node stream, the handler is called with each decoded message.
+    """
+
+    def __init__(self, topic: str, path: str, params: dict, handler: Callable):
+        self.topic = topic
+        self.path = path
+        self.params = params
+        self.handler = handler
+        self.messages = 0
+        self.connects = 0
+
+
+class StreamManager:
+    """
+    Run many data node websocket subscriptions concurrently on a single
+    asyncio event loop and route their decoded messages to per-topic handlers.
+
+    Each subscription has its own connection and StreamDecoder but they share
+    one aiohttp session, one loop and one thread. Dropped connections are
+    reopened after reconnect_delay seconds until stop() is called.
+
+        manager = StreamManager()
+        manager.subscribe("/stream/trades", {"marketId": market_id}, on_trades)
+        manager.subscribe("/stream/orders", {"marketId": market_id}, on_orders)
+        asyncio.run(manager.run(timeout=30))
+    """
+
+    def __init__(self, data_node_url_rest: str = "", reconnect_delay: float = 1.0):
+        if data_node_url_rest == "":
+            data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+        self.ws_url = data_node_url_rest.replace("https://", "wss://").replace("http://", "ws://")
+        self.reconnect_delay = reconnect_delay
+        self.subscriptions = {}
+        self._stopped = None
+
+    def subscribe(
+        self, path: str, params: dict, handler: Callable, topic: str = ""
+    ) -> str:
+        """
+        Register a stream, e.g. "/stream/orders", with its query parameters.
+
+        The handler is called as handler(topic, message) for every decoded
+        message and may be a coroutine function. The topic defaults to the
+        path and must be unique. Returns the topic.
+        """
+        if topic == "":
+            topic = path
+        if topic in self.subscriptions:
+            raise Exception(f"Stream topic {topic} is already subscribed")
+        self.subscriptions[topic] = Subscription(topic, path, params, handler)
+        return topic
+
+    def stop(self) -> None:
+        """
+        Close all streams, run() returns once they are closed.
+        """
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def run(self, timeout: float = None) -> None:
+        """
+        Run every subscription until stop() is called or timeout seconds pass.
+        """
+        self._stopped = asyncio.Event()
+        # Every subscription holds a connection for as long as it runs, so the
+        # session must not cap them at aiohttp's default of 100
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [
+                asyncio.create_task(self._run_subscription(session, subscription))
+                for subscription in self.subscriptions.values()
+            ]
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_subscription(
+        self, session: aiohttp.ClientSession, subscription: Subscription
+    ) -> None:
+        url = self.ws_url + subscription.path
+        decoder = StreamDecoder()
+        while not self._stopped.is_set():
+            try:
+                async with session.ws_connect(
+                    url, params=encode_params(subscription.params)
+                ) as ws:
+                    subscription.connects += 1
+                    async for message in ws:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        for obj in decoder.feed(message.data):
+                            subscription.messages += 1
+                            await self._dispatch(subscription, obj)
+            except Exception as e:
+                # Connection failures, but also malformed messages or anything
+                # else that breaks the stream, reconnect instead of giving up
+                print(f"Stream {subscription.topic} error: {e!r}")
+            decoder.reset()
+            if not self._stopped.is_set():
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _dispatch(self, subscription: Subscription, message: Any) -> None:
+        try:
+            result = subscription.handler(subscription.topic, message)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            # A failing handler must not take down the other streams
+            print(f"Stream {subscription.topic} handler error: {e!r}")
@@ -2,15 +2,18 @@
 
 import json
 import time
-import requests
 import helpers
 
 # Vega wallet interaction helper, see login.py for detail
-from login import token, pubkey
+from login import wallet, pubkey
 
 # Load Vega node API v2 URL, this is set using 'source vega-config'
 # located in the root folder of the sample-api-scripts repository
 data_node_url_rest = helpers.get_from_env("DATA_NODE_URL_REST")
+
+# Shared keep-alive HTTP session for data node requests, see helpers.py
+session = helpers.get_session()
+
 # Load Vega wallet server URL, set in same way as above
 wallet_server_url = helpers.get_from_env("WALLET_SERVER_URL")
 
@@ -83,35 +86,13 @@ print("Liquidity commitment submission:\n{}".format(
 
 
 # Send liqudity commitment
-url = "http://localhost:1789/api/v2/requests"
-
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": submission
-    }
-}
+sent = wallet.send_transaction(pubkey, submission)
 
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
-
-send_response = requests.request("POST", url, headers=headers, data=payload)
-
-print(send_response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 
 # :sign_tx_liquidity_submit__
 
-print(json.dumps(send_response.json(), indent=4, sort_keys=True))
+print(json.dumps(sent.result, indent=4, sort_keys=True))
 print()
 
 print("Signed liquidity commitment and sent to Vega")
@@ -128,8 +109,7 @@ time.sleep(3)
 #__get_liquidity_provisions:
 # Request liquidity provisions for a party on a Vega network
 url = f"{data_node_url_rest}/liquidity/provisions?partyId={pubkey}"
-headers = {"Authorization": f"Bearer {token}"}
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Liquidity Provisions for party:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)
@@ -170,31 +150,9 @@ submission = {
 # :amend_liquidity_commitment__
 
 # First sign liquidity commitment
-url = "http://localhost:1789/api/v2/requests"
-
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": submission
-    }
-}
+sent = wallet.send_transaction(pubkey, submission)
 
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
-
-send_response = requests.request("POST", url, headers=headers, data=payload)
-
-print(send_response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 
 
 print("Liquidity commitment amendment:\n{}".format(
@@ -230,31 +188,9 @@ print("Liquidity commitment cancellation:\n{}".format(
 
 # __sign_tx_liquidity_cancel:
 # First sign liquidity commitment
-url = "http://localhost:1789/api/v2/requests"
-
-payload1 = {
-    "id": "1",
-    "jsonrpc": "2.0",
-    "method": "client.send_transaction",
-    "params": {
-        "publicKey": pubkey,
-        "sendingMode": "TYPE_SYNC",
-        "transaction": submission
-    }
-}
-
-payload = json.dumps(payload1)
-
-headers = {
-  'Content-Type': 'application/json-rpc',
-  'Accept': 'application/json-rpc',
-  'Origin': 'application/json-rpc', 
-  'Authorization': f'{token}'
-}
-
-send_response = requests.request("POST", url, headers=headers, data=payload)
+sent = wallet.send_transaction(pubkey, submission)
 
-print(send_response.text)
+print(f"Sent in {sent.latency * 1000:.0f} ms: {json.dumps(sent.result)}")
 
 # :sign_tx_liquidity_cancel__
 
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+
+###############################################################################
+#                           S Y N C   H I S T O R Y                           #
+###############################################################################
+
+#  How to keep a local copy of Data Node history up to date:
+#  ----------------------------------------------------------------------
+#  HistorySync (see history_sync.py) stores records in a local SQLite file
+#  with a checkpoint per endpoint and filters. The first run downloads the
+#  full history, every later run only the records added since, and a run
+#  that is interrupted resumes from the last page it stored.
+#  ----------------------------------------------------------------------
+#  For full details see the REST Reference API docs at https://docs.vega.xyz
+
+import os
+import helpers
+from columnar_export import DATASETS, write_nodes
+from history_sync import HistorySync
+
+# Load Vega market id and party id
+market_id = helpers.env_market_id()
+assert market_id != ""
+party_id = helpers.env_party_id()
+assert party_id != ""
+
+# Local store, kept between runs
+history_db = os.getenv("HISTORY_DB", "history.db")
+
+###############################################################################
+#                       I N C R E M E N T A L   S Y N C                       #
+###############################################################################
+
+# __sync_history:
+# Fetch trades of the market and ledger entries of the party added since the
+# last run. Ledger entries are resumed from their latest timestamp rather
+# than a cursor, the other kind of checkpoint.
+with HistorySync(history_db) as sync:
+    added = sync.sync("/trades", "trades", {"marketId": market_id})
+    print(f"Trades: {added} new, {sync.count('/trades')} stored")
+    print(f"Checkpoint: {sync.checkpoint('/trades', {'marketId': market_id})}")
+
+    ledger_filters = {"filter.accountFromFilter.partyIds": party_id}
+    added = sync.sync(
+        "/ledgerentry/history", "ledgerEntries", ledger_filters, timestamp_field="timestamp"
+    )
+    print(f"Ledger entries: {added} new, {sync.count('/ledgerentry/history')} stored")
+# :sync_history__
+
+###############################################################################
+#                 E X P O R T   T H E   L O C A L   S T O R E                 #
+###############################################################################
+
+# __export_synced_history:
+# Write the stored trades to Parquet without requesting them again
+with HistorySync(history_db) as sync:
+    rows = write_nodes(sync.nodes("/trades"), DATASETS["trades"]["columns"], "trades.parquet")
+    print(f"Exported {rows} trade(s) to trades.parquet")
+# :export_synced_history__
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import requests
+
+DEFAULT_WALLET_URL = "http://localhost:1789/api/v2/requests"
+DEFAULT_SESSION_FILE = os.path.join("~", ".vega-sample-api-scripts", "wallet-session.json")
+
+HEADERS = {
+    "Content-Type": "application/json-rpc",
+    "Accept": "application/json-rpc",
+    "Origin": "application/json-rpc",
+}
+
+
+class WalletSession:
+    """
+    Vega wallet connection shared between script runs.
+
+    The Authorization token from client.connect_wallet and the key list from
+    client.list_keys are kept in a session file only readable by the current
+    user, so the wallet is only asked to connect (and prompts) when there is
+    no session yet or the wallet rejects the saved token. A saved token is
+    checked once per process with client.list_keys, which does not prompt.
+
+    The wallet URL is read from WALLET_URL and the session file from
+    WALLET_SESSION_FILE, set WALLET_SESSION_FILE="" to keep the session in
+    memory only.
+    """
+
+    def __init__(self, wallet_url: str = "", session_file: str = None):
+        if wallet_url == "":
+            wallet_url = os.getenv("WALLET_URL", DEFAULT_WALLET_URL)
+        if session_file is None:
+            session_file = os.getenv("WALLET_SESSION_FILE", DEFAULT_SESSION_FILE)
+        self.wallet_url = wallet_url
+        self.session_file = os.path.expanduser(session_file)
+        self.connects = 0
+        self._token = None
+        self._keys = None
+        self._checked = False
+        self._lock = threading.RLock()
+        self._http = requests.Session()
+        self._load()
+
+    @property
+    def token(self) -> str:
+        """
+        The Authorization token, connecting to the wallet if there is no
+        valid saved session.
+        """
+        with self._lock:
+            if self._token is not None and not self._checked:
+                self.check()
+            if self._token is None:
+                self.connect()
+            return self._token
+
+    @property
+    def keys(self) -> list:
+        """
+        Keys the wallet has given access to, as returned by client.list_keys.
+        """
+        with self._lock:
+            token = self.token
+            if self._keys is None:
+                response = self._post("client.list_keys", token)
+                response.raise_for_status()
+                self._keys = response.json()["result"]["keys"]
+                self._save()
+            return self._keys
+
+    @property
+    def pubkey(self) -> str:
+        """
+        The first public key of the wallet.
+        """
+        return self.keys[0]["publicKey"]
+
+    def check(self) -> bool:
+        """
+        Check the saved token with client.list_keys, forgetting the session
+        if the wallet no longer accepts it.
+        """
+        with self._lock:
+            self._checked = True
+            if self._token is None:
+                return False
+            response = self._post("client.list_keys", self._token)
+            if response.status_code == 401:
+                self._forget()
+                return False
+            response.raise_for_status()
+            keys = response.json()["result"]["keys"]
+            if keys != self._keys:
+                self._keys = keys
+                self._save()
+            return True
+
+    def connect(self) -> None:
+        """
+        Connect to the wallet with client.connect_wallet and save the session.
+        """
+        with self._lock:
+            response = self._post("client.connect_wallet")
+            response.raise_for_status()
+            self._token = response.headers["Authorization"]
+            self._keys = None
+            self._checked = True
+            self.connects += 1
+            self._save()
+
+    def request(self, method: str, params: dict = None, id: str = "1") -> requests.Response:
+        """
+        Send an authorized JSON-RPC request to the wallet, reconnecting once
+        if the wallet rejects the token.
+        """
+        token = self.token
+        response = self._post(method, token, params, id)
+        if response.status_code == 401:
+            self.invalidate(token)
+            response = self._post(method, self.token, params, id)
+        return response
+
+    def invalidate(self, token: str) -> None:
+        """
+        Forget the session after the wallet rejected this token, unless
+        another request already replaced it. The next use reconnects.
+        """
+        with self._lock:
+            if self._token == token:
+                self._forget()
+
+    def disconnect(self) -> requests.Response:
+        """
+        Disconnect from the wallet with client.disconnect_wallet and remove
+        the saved session.
+        """
+        with self._lock:
+            response = self._post("client.disconnect_wallet", self._token)
+            self._forget()
+            return response
+
+    def _post(
+        self, method: str, token: str = None, params: dict = None, id: str = "1"
+    ) -> requests.Response:
+        payload = {"id": id, "jsonrpc": "2.0", "method": method}
+        if params is not None:
+            payload["params"] = params
+        headers = HEADERS if token is None else {**HEADERS, "Authorization": token}
+        return self._http.post(self.wallet_url, headers=headers, json=payload)
+
+    def _forget(self) -> None:
+        self._token = None
+        self._keys = None
+        if self.session_file != "":
+            try:
+                os.remove(self.session_file)
+            except FileNotFoundError:
+                pass
+
+    def _load(self) -> None:
+        if self.session_file == "":
+            return
+        try:
+            with open(self.session_file) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get("walletUrl") == self.wallet_url:
+            self._token = stored.get("token")
+            self._keys = stored.get("keys")
+
+    def _save(self) -> None:
+        if self.session_file == "":
+            return
+        directory = os.path.dirname(self.session_file)
+        if directory != "":
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Create the file readable by this user only and rename it into place,
+        # so the token is never exposed or read half written
+        tmp = f"{self.session_file}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"walletUrl": self.wallet_url, "token": self._token, "keys": self._keys}, f)
+        os.replace(tmp, self.session_file)